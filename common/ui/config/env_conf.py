@@ -24,3 +24,141 @@ class EnvironmentConfig:
     PAGE_LOAD_TIMEOUT_SECONDS = float(os.getenv('PAGE_LOAD_TIMEOUT_SECONDS', 90))
     SELENIUM_TIMEOUT_SECONDS = float(os.getenv('SELENIUM_TIMEOUT_SECONDS', 30))
     WAIT_TIMEOUT_SECONDS = float(os.getenv('SELENIUM_TIMEOUT_SECONDS', 30))
+
+    # Driver pool: reuse one browser per capability tuple within a worker
+    DRIVER_POOL = DataHelper.str_to_bool(os.getenv('DRIVER_POOL', 'True'))
+    DRIVER_MAX_USES = int(os.getenv('DRIVER_MAX_USES', 50))
+
+    # Driver binary resolution: resolved once per run/machine and shared through a manifest
+    DRIVER_MANIFEST_PATH = os.getenv('DRIVER_MANIFEST_PATH',
+                                     os.path.join(os.path.expanduser('~'), '.wdm', 'resolved_drivers.json'))
+    DRIVER_MANIFEST_TTL_HOURS = float(os.getenv('DRIVER_MANIFEST_TTL_HOURS', 24))
+    DRIVER_OFFLINE = DataHelper.str_to_bool(os.getenv('DRIVER_OFFLINE', 'False'))
+
+    # Input clearing strategy: native (value setter + input event), select_all, clear or backspace
+    CLEAR_TEXT_STRATEGY = os.getenv('CLEAR_TEXT_STRATEGY', 'native')
+
+    # Cache resolved element handles per page object until the DOM mutates or the page navigates
+    ELEMENT_CACHE = DataHelper.str_to_bool(os.getenv('ELEMENT_CACHE', 'True'))
+
+    # Wait engine: 'event' resolves waits in the page through a MutationObserver, 'poll' uses WebDriverWait polling
+    WAIT_ENGINE = os.getenv('WAIT_ENGINE', 'event')
+    WAIT_POLL_SECONDS = float(os.getenv('WAIT_POLL_SECONDS', 0.5))
+    WAIT_IN_PAGE_POLL_MS = int(os.getenv('WAIT_IN_PAGE_POLL_MS', 100))
+
+    # Run click/type helpers as one in-page script (wait, scroll, act, verify) instead of separate commands
+    IN_PAGE_ACTIONS = DataHelper.str_to_bool(os.getenv('IN_PAGE_ACTIONS', 'False'))
+
+    # WebDriver command tracing: per test JSON lines + Allure attachment, slowest page object methods at the end
+    TRACE_COMMANDS = DataHelper.str_to_bool(os.getenv('TRACE_COMMANDS', 'False'))
+    TRACE_DIR = os.getenv('TRACE_DIR', 'trace_results')
+    TRACE_SUMMARY_TOP = int(os.getenv('TRACE_SUMMARY_TOP', 10))
+
+    # Benchmarks against the local copy of the app in tests/benchmarks
+    BENCHMARK_DIR = os.getenv('BENCHMARK_DIR', 'benchmark_results')
+    BENCHMARK_ROUNDS = int(os.getenv('BENCHMARK_ROUNDS', 10))
+    BENCHMARK_REGRESSION_THRESHOLD = float(os.getenv('BENCHMARK_REGRESSION_THRESHOLD', 0.2))
+    BENCHMARK_SAVE_BASELINE = DataHelper.str_to_bool(os.getenv('BENCHMARK_SAVE_BASELINE', 'False'))
+
+    # Driver backend: 'browser' picks chrome, firefox, edge, grid or sauce per driver from BROWSER, GRID and SAUCE_LABS;
+    # a backend name (chrome, firefox, edge, grid, sauce, fake) uses that backend for every driver
+    DRIVER_BACKEND = os.getenv('DRIVER_BACKEND', 'browser')
+
+    # Resource policy for local Chrome: blocked resource types/URL patterns (comma separated), network throttling
+    # (none, fast3g, slow3g, offline) and per test allowed/blocked byte counts read from the performance log
+    RESOURCE_PROFILE = os.getenv('RESOURCE_PROFILE', 'none')
+    RESOURCE_BLOCK_TYPES = DataHelper.str_to_list(os.getenv('RESOURCE_BLOCK_TYPES', ''))
+    RESOURCE_BLOCK_PATTERNS = DataHelper.str_to_list(os.getenv('RESOURCE_BLOCK_PATTERNS', ''))
+    NETWORK_THROTTLING = os.getenv('NETWORK_THROTTLING', 'none')
+    RESOURCE_USAGE = DataHelper.str_to_bool(os.getenv('RESOURCE_USAGE', 'False'))
+    RESOURCE_DIR = os.getenv('RESOURCE_DIR', 'resource_results')
+
+    # xdist scheduling: longest tests first, grouped by capability tuple, from the durations of earlier runs
+    DURATION_SCHEDULING = DataHelper.str_to_bool(os.getenv('DURATION_SCHEDULING', 'True'))
+    DURATION_STORE_PATH = os.getenv('DURATION_STORE_PATH', '.test_durations.json')
+
+    # Failure artifacts (screenshot, DOM, URL, console) written by a bounded background pool
+    ARTIFACT_DIR = os.getenv('ARTIFACT_DIR', 'failure_artifacts')
+    ARTIFACT_WORKERS = int(os.getenv('ARTIFACT_WORKERS', 2))
+    ARTIFACT_MAX_PENDING = int(os.getenv('ARTIFACT_MAX_PENDING', 8))
+
+    # Threads shared by all page objects for reads issued together through BasePage.submit()/gather()
+    CONCURRENT_READ_WORKERS = int(os.getenv('CONCURRENT_READ_WORKERS', 4))
+
+    # Chrome profile template: a user-data-dir with a warm HTTP cache and service workers for BASE_URL,
+    # built once per PROFILE_TEMPLATE_TTL_HOURS and cloned for every local Chrome
+    PROFILE_TEMPLATE = DataHelper.str_to_bool(os.getenv('PROFILE_TEMPLATE', 'False'))
+    PROFILE_TEMPLATE_DIR = os.getenv('PROFILE_TEMPLATE_DIR',
+                                     os.path.join(os.path.expanduser('~'), '.cache', 'unitlists', 'chrome-profile'))
+    PROFILE_TEMPLATE_TTL_HOURS = float(os.getenv('PROFILE_TEMPLATE_TTL_HOURS', 12))
+    PROFILE_SW_WAIT_MS = int(os.getenv('PROFILE_SW_WAIT_MS', 5000))
+
+    # Browser state snapshots (cookies, storage, URL) restored instead of repeating UI setup flows.
+    # APP_VERSION overrides the version read from the bundles of BASE_URL that invalidates them.
+    STATE_SNAPSHOTS = DataHelper.str_to_bool(os.getenv('STATE_SNAPSHOTS', 'True'))
+    STATE_SNAPSHOT_DIR = os.getenv('STATE_SNAPSHOT_DIR', '.state_snapshots')
+    STATE_SEED_PATH = os.getenv('STATE_SEED_PATH', '/favicon.ico')
+    APP_VERSION = os.getenv('APP_VERSION', '')
+
+    # Page readiness: 'idle' waits for the load event, no fetch/XHR in flight for READY_NETWORK_IDLE_MS and no DOM
+    # mutation for READY_DOM_IDLE_MS; 'load' only waits for document.readyState
+    READINESS_ENGINE = os.getenv('READINESS_ENGINE', 'idle')
+    READY_NETWORK_IDLE_MS = int(os.getenv('READY_NETWORK_IDLE_MS', 200))
+    READY_DOM_IDLE_MS = int(os.getenv('READY_DOM_IDLE_MS', 100))
+    READY_TIMEOUT_SECONDS = float(os.getenv('READY_TIMEOUT_SECONDS', 5))
+
+    # Adaptive timeouts: waits using the default timeout get percentile * margin of their recorded durations,
+    # between the floor and the ceiling, once they have ADAPTIVE_TIMEOUT_MIN_SAMPLES samples
+    ADAPTIVE_TIMEOUTS = DataHelper.str_to_bool(os.getenv('ADAPTIVE_TIMEOUTS', 'True'))
+    WAIT_TIMINGS_PATH = os.getenv('WAIT_TIMINGS_PATH', '.wait_timings.json')
+    ADAPTIVE_TIMEOUT_PERCENTILE = float(os.getenv('ADAPTIVE_TIMEOUT_PERCENTILE', 99))
+    ADAPTIVE_TIMEOUT_MARGIN = float(os.getenv('ADAPTIVE_TIMEOUT_MARGIN', 2.0))
+    ADAPTIVE_TIMEOUT_FLOOR_SECONDS = float(os.getenv('ADAPTIVE_TIMEOUT_FLOOR_SECONDS', 3))
+    ADAPTIVE_TIMEOUT_CEILING_SECONDS = float(os.getenv('ADAPTIVE_TIMEOUT_CEILING_SECONDS', SELENIUM_TIMEOUT_SECONDS))
+    ADAPTIVE_TIMEOUT_MIN_SAMPLES = int(os.getenv('ADAPTIVE_TIMEOUT_MIN_SAMPLES', 5))
+
+    # Visual checks: baselines per name in VISUAL_BASELINE_DIR compared in VISUAL_TILE_SIZE tiles; a check fails when
+    # more than VISUAL_MAX_DIFF_RATIO of the pixels differ by more than VISUAL_PIXEL_TOLERANCE in a channel
+    VISUAL_BASELINE_DIR = os.getenv('VISUAL_BASELINE_DIR', 'visual_baselines')
+    VISUAL_DIFF_DIR = os.getenv('VISUAL_DIFF_DIR', 'visual_results')
+    VISUAL_TILE_SIZE = int(os.getenv('VISUAL_TILE_SIZE', 64))
+    VISUAL_PIXEL_TOLERANCE = int(os.getenv('VISUAL_PIXEL_TOLERANCE', 16))
+    VISUAL_MAX_DIFF_RATIO = float(os.getenv('VISUAL_MAX_DIFF_RATIO', 0.001))
+    VISUAL_UPDATE_BASELINES = DataHelper.str_to_bool(os.getenv('VISUAL_UPDATE_BASELINES', 'False'))
+
+    # Streamed list reads: entries per chunk, wait for lazily rendered rows after each scroll, and the number of
+    # scrolls in a row that may render nothing new before the stream ends
+    STREAM_CHUNK_SIZE = int(os.getenv('STREAM_CHUNK_SIZE', 50))
+    STREAM_SETTLE_MS = int(os.getenv('STREAM_SETTLE_MS', 300))
+    STREAM_MAX_EMPTY_ROUNDS = int(os.getenv('STREAM_MAX_EMPTY_ROUNDS', 3))
+
+    # Batch unit selection: units whose names start with the same UNIT_SEARCH_PREFIX_LENGTH characters share a search,
+    # whose result set is complete once it has not changed for SEARCH_RESULTS_SETTLE_MS
+    UNIT_SEARCH_PREFIX_LENGTH = int(os.getenv('UNIT_SEARCH_PREFIX_LENGTH', 3))
+    SEARCH_RESULTS_SETTLE_MS = int(os.getenv('SEARCH_RESULTS_SETTLE_MS', 300))
+
+    # Web vitals of every page a test visits, stored in SQLite. The performance_budget fixture fails a test whose pages
+    # exceed the limits of PERFORMANCE_BUDGETS_PATH ({page: {metric: limit}}, '*' for every page) or its marker, and
+    # reports pages that regress by more than PERFORMANCE_REGRESSION_THRESHOLD from the median of the last
+    # PERFORMANCE_HISTORY_SIZE values; PERFORMANCE_FAIL_ON_REGRESSION fails the test on those too
+    WEB_VITALS = DataHelper.str_to_bool(os.getenv('WEB_VITALS', 'True'))
+    WEB_VITALS_DB_PATH = os.getenv('WEB_VITALS_DB_PATH', os.path.join('performance_results', 'web_vitals.sqlite'))
+    PERFORMANCE_BUDGETS_PATH = os.getenv('PERFORMANCE_BUDGETS_PATH', 'performance_budgets.json')
+    PERFORMANCE_REGRESSION_THRESHOLD = float(os.getenv('PERFORMANCE_REGRESSION_THRESHOLD', 0.5))
+    PERFORMANCE_HISTORY_SIZE = int(os.getenv('PERFORMANCE_HISTORY_SIZE', 20))
+    PERFORMANCE_MIN_HISTORY = int(os.getenv('PERFORMANCE_MIN_HISTORY', 5))
+    PERFORMANCE_FAIL_ON_REGRESSION = DataHelper.str_to_bool(os.getenv('PERFORMANCE_FAIL_ON_REGRESSION', 'False'))
+
+    # Rendering speed mode: CSS transitions, animations and smooth scrolling end at once in every document; with
+    # FAST_TIMERS the page's setTimeout delays up to FAST_TIMER_MAX_MS run at FAST_TIMER_FACTOR of their length
+    FREEZE_ANIMATIONS = DataHelper.str_to_bool(os.getenv('FREEZE_ANIMATIONS', 'False'))
+    FAST_TIMERS = DataHelper.str_to_bool(os.getenv('FAST_TIMERS', 'False'))
+    FAST_TIMER_FACTOR = float(os.getenv('FAST_TIMER_FACTOR', 0.1))
+    FAST_TIMER_MAX_MS = int(os.getenv('FAST_TIMER_MAX_MS', 1000))
+
+    # Remote command transport for the grid and Sauce Labs: keep-alive connections pooled per process (REMOTE_POOL_SIZE
+    # kept open per host), gzip responses with REMOTE_COMPRESSION and per command latency counters at the end of the run
+    REMOTE_KEEP_ALIVE = DataHelper.str_to_bool(os.getenv('REMOTE_KEEP_ALIVE', 'True'))
+    REMOTE_POOL_SIZE = int(os.getenv('REMOTE_POOL_SIZE', 8))
+    REMOTE_COMPRESSION = DataHelper.str_to_bool(os.getenv('REMOTE_COMPRESSION', 'True'))
+    REMOTE_CONNECT_TIMEOUT_SECONDS = float(os.getenv('REMOTE_CONNECT_TIMEOUT_SECONDS', 10))
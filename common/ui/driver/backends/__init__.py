@@ -0,0 +1,68 @@
+import importlib
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.driver.driver_binary import DriverBinaryResolver
+
+
+class DriverBackends:
+    """
+    Driver backends by name. A backend module is imported the first time a driver of that backend is needed,
+    so a run only loads the driver libraries (Appium, webdriver_manager, lxml, ...) of what it actually starts.
+    DRIVER_BACKEND selects one backend for every driver; 'browser' picks local Chrome/Firefox/Edge, the remote
+    grid or Sauce Labs per driver from BROWSER, GRID and SAUCE_LABS, like create_driver always did.
+    """
+
+    BROWSER = 'browser'
+    REGISTRY = {
+        'chrome': 'common.ui.driver.backends.local_chrome.LocalChromeBackend',
+        'firefox': 'common.ui.driver.backends.local_firefox.LocalFirefoxBackend',
+        'edge': 'common.ui.driver.backends.local_edge.LocalEdgeBackend',
+        'grid': 'common.ui.driver.backends.remote_grid.RemoteGridBackend',
+        'sauce': 'common.ui.driver.backends.sauce_appium.SauceAppiumBackend',
+        'fake': 'common.ui.driver.backends.fake.FakeBackend',
+    }
+
+    def __init__(self, selection=EnvConf.DRIVER_BACKEND):
+        self.selection = selection
+        self.binaries = DriverBinaryResolver()
+        self._backends = {}
+
+    @classmethod
+    def register(cls, name, class_path):
+        """
+        Add a backend, e.g. a local stand-in: DriverBackends.register('stand_in', 'package.module.StandInBackend')
+        """
+        cls.REGISTRY[name] = class_path
+
+    def get(self, name):
+        backend = self._backends.get(name)
+        if backend is None:
+            if name not in DriverBackends.REGISTRY:
+                raise KeyError("Unknown driver backend: {}".format(name))
+            module_name, class_name = DriverBackends.REGISTRY[name].rsplit('.', 1)
+            backend = getattr(importlib.import_module(module_name), class_name)(self.binaries)
+            self._backends[name] = backend
+        return backend
+
+    def name_for(self, is_mobile, browser_name):
+        if self.selection != DriverBackends.BROWSER:
+            return self.selection
+        if EnvConf.GRID and is_mobile:
+            return 'sauce' if EnvConf.SAUCE_LABS else 'grid'
+        if browser_name.lower() == 'chrome' or EnvConf.MOBILE_EMULATION:
+            return 'chrome'
+        if browser_name.lower() in ('firefox', 'edge'):
+            return browser_name.lower()
+        raise KeyError("The inputted browser is not supported")
+
+    def backend_for(self, is_mobile, browser_name):
+        return self.get(self.name_for(is_mobile, browser_name))
+
+    def default(self):
+        """
+        Backend of a desktop driver with the configured BROWSER, the one the session prepares for
+        """
+        return self.backend_for(False, EnvConf.BROWSER_NAME)
+
+    def loaded(self):
+        return list(self._backends.values())
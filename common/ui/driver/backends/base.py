@@ -0,0 +1,41 @@
+class DriverBackend:
+    """
+    How one kind of driver is started. Subclasses build their capabilities/options in start() and prepare shared
+    state (driver binaries, profile template) lazily there, so a run never prepares a backend it does not start;
+    the session hooks default to doing nothing.
+    """
+
+    name = None
+    # Drivers of this backend may be shared between tests through the DriverPool
+    poolable = True
+    # Waits of this backend's drivers feed the adaptive timeouts learned for the real app
+    records_wait_timings = True
+
+    def __init__(self, binaries):
+        """
+        :param binaries: DriverBinaryResolver shared by the local backends
+        """
+        self.binaries = binaries
+
+    @staticmethod
+    def of(browser):
+        return getattr(browser, 'driver_backend', None)
+
+    def start(self, is_mobile, platform, browser_name, device_name, test_name=None):
+        raise NotImplementedError
+
+    def report_result(self, browser, failed):
+        """
+        Tell the remote service how the test ended
+        """
+
+    def command_latency(self):
+        """
+        CommandLatency of the remote commands sent by this backend's drivers, None for local drivers
+        """
+        return None
+
+    def session_finish(self):
+        """
+        Clean up what the backend created for the session
+        """
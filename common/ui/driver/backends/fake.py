@@ -0,0 +1,16 @@
+from common.ui.driver.backends.base import DriverBackend
+from common.ui.driver.fake_webdriver import FakeWebDriver
+
+
+class FakeBackend(DriverBackend):
+    """
+    In-process FakeWebDriver, for pages reachable without a browser (file://, a local server or preloaded documents)
+    """
+
+    name = 'fake'
+    # Waits against static documents say nothing about the real app
+    records_wait_timings = False
+
+    def start(self, is_mobile, platform, browser_name, device_name, test_name=None):
+        return FakeWebDriver(desired_capabilities={'browserName': browser_name, 'deviceName': device_name,
+                                                   'isMobile': is_mobile})
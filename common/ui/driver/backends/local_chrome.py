@@ -0,0 +1,77 @@
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+from common.ui.config.desired_caps import SAUCE_LABS_RDC_CHROME_EMULATION_MAPPING
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.driver.backends.base import DriverBackend
+from common.ui.driver.profile_template import ProfileTemplate
+from common.ui.driver.resource_policy import ResourcePolicy
+from common.ui.page_objects.page_readiness import PageReadiness
+from common.ui.page_objects.rendering_speed import RenderingSpeed
+
+
+class LocalChromeBackend(DriverBackend):
+    """
+    Local Chrome, also used for the mobile emulation of mobile capabilities
+    """
+
+    name = 'chrome'
+
+    def __init__(self, binaries):
+        super().__init__(binaries)
+        self.resource_policy = ResourcePolicy()
+        self.profile_template = ProfileTemplate()
+
+    def options(self, is_mobile, device_name):
+        chrome_options = ChromeOptions()
+        if is_mobile and EnvConf.MOBILE_EMULATION:
+            # Device name should be "Pixel 2", "Nexus 5", "iPhoneX", "iPad Mini" ...
+            device_name_emulation = SAUCE_LABS_RDC_CHROME_EMULATION_MAPPING[device_name]
+            chrome_options.add_experimental_option("mobileEmulation", {"deviceName": device_name_emulation})
+        if EnvConf.HEADLESS:
+            chrome_options.add_argument("--headless")
+            chrome_options.add_argument("user-agent=Zenfolio Automation Testing Head-less Chrome Instance")
+            if not is_mobile:
+                chrome_options.add_argument("--window-size=1920x1080")
+        self.resource_policy.configure_options(chrome_options)
+        return chrome_options
+
+    def start_chrome(self, chrome_options):
+        return webdriver.Chrome(executable_path=self.binaries.resolve('chrome'), options=chrome_options)
+
+    def start(self, is_mobile, platform, browser_name, device_name, test_name=None):
+        chrome_options = self.options(is_mobile, device_name)
+        clone_dir = None
+        if EnvConf.PROFILE_TEMPLATE:
+            # Every driver gets its own copy of the warm profile, so first paint comes from the HTTP cache
+            self.profile_template.ensure(self.start_chrome)
+            clone_dir = self.profile_template.clone()
+            chrome_options.add_argument('--user-data-dir=' + clone_dir)
+        try:
+            browser = self.start_chrome(chrome_options)
+        except WebDriverException:
+            if clone_dir:
+                self.profile_template.remove_clone(clone_dir)
+            raise
+        if clone_dir:
+            self.remove_clone_on_quit(browser, clone_dir)
+        self.resource_policy.apply(browser)
+        # Track the app's requests from the first document on, not only from the first page object
+        PageReadiness(browser, None).install_tracker()
+        RenderingSpeed(browser).install()
+        return browser
+
+    def remove_clone_on_quit(self, browser, clone_dir):
+        quit_browser = browser.quit
+
+        def quit_and_remove_clone():
+            try:
+                quit_browser()
+            finally:
+                self.profile_template.remove_clone(clone_dir)
+
+        browser.quit = quit_and_remove_clone
+
+    def session_finish(self):
+        self.profile_template.remove_clones()
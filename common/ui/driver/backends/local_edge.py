@@ -0,0 +1,11 @@
+from selenium import webdriver
+
+from common.ui.driver.backends.base import DriverBackend
+
+
+class LocalEdgeBackend(DriverBackend):
+
+    name = 'edge'
+
+    def start(self, is_mobile, platform, browser_name, device_name, test_name=None):
+        return webdriver.Edge()
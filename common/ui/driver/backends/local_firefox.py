@@ -0,0 +1,16 @@
+from selenium import webdriver
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.driver.backends.base import DriverBackend
+
+
+class LocalFirefoxBackend(DriverBackend):
+
+    name = 'firefox'
+
+    def start(self, is_mobile, platform, browser_name, device_name, test_name=None):
+        firefox_options = FirefoxOptions()
+        if EnvConf.HEADLESS:
+            firefox_options.headless = True
+        return webdriver.Firefox(executable_path=self.binaries.resolve('firefox'), options=firefox_options)
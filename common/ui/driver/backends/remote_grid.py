@@ -0,0 +1,46 @@
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.driver.backends.base import DriverBackend
+from common.ui.driver.remote_transport import RemoteTransport
+
+
+class RemoteGridBackend(DriverBackend):
+    """
+    Selenium grid at GRID_HOST:GRID_PORT
+    """
+
+    name = 'grid'
+
+    def __init__(self, binaries):
+        super().__init__(binaries)
+        # Shared by every driver of the backend, so connections outlive the sessions
+        self.transport = RemoteTransport()
+
+    def url(self):
+        return 'http://{host}:{port}/wd/hub'.format(host=EnvConf.GRID_HOST, port=EnvConf.GRID_PORT)
+
+    def capabilities(self, is_mobile, platform, browser_name, device_name, test_name=None):
+        return {
+            'platform': platform,
+            'browserName': browser_name
+        }
+
+    def connect(self, url, caps):
+        command_executor = self.transport.command_executor(url) if EnvConf.REMOTE_KEEP_ALIVE else url
+        return webdriver.Remote(command_executor, desired_capabilities=caps)
+
+    def command_latency(self):
+        return self.transport.latency
+
+    def start(self, is_mobile, platform, browser_name, device_name, test_name=None):
+        browser = self.connect(self.url(), self.capabilities(is_mobile, platform, browser_name, device_name,
+                                                             test_name))
+        # This is specifically for SauceLabs plugin. In case test fails after selenium session creation
+        # having this here will help track it down. creates one file per test non ideal but xdist is awful
+        if browser:
+            print("SauceOnDemandSessionID={} job-name={}\n".format(browser.session_id, test_name))
+        else:
+            raise WebDriverException("Never created!")
+        return browser
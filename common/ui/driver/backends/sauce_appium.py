@@ -0,0 +1,36 @@
+from appium import webdriver as appium_webdriver
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.driver.backends.remote_grid import RemoteGridBackend
+
+
+class SauceAppiumBackend(RemoteGridBackend):
+    """
+    Real devices on Sauce Labs through Appium
+    """
+
+    name = 'sauce'
+    # Sauce Labs sessions carry the test name and a per-job result, so they are never shared
+    poolable = False
+
+    def url(self):
+        return "https://{}:{}@ondemand.us-west-1.saucelabs.com:443/wd/hub".format(
+            EnvConf.SAUCE_LABS_RDC_USER, EnvConf.SAUCE_LABS_RDC_KEY)
+
+    def capabilities(self, is_mobile, platform, browser_name, device_name, test_name=None):
+        return {'browserName': browser_name, 'platformName': platform, 'deviceName': device_name,
+                'deviceOrientation': 'portrait', 'phoneOnly': False, 'tabletOnly': False,
+                'privateDevicesOnly': False, 'name': test_name, 'build': EnvConf.BUILD_TAG
+                }
+
+    def connect(self, url, caps):
+        browser = appium_webdriver.Remote(url, desired_capabilities=caps)
+        if EnvConf.REMOTE_KEEP_ALIVE:
+            # appium's Remote builds its AppiumConnection itself, so the pool takes over after the new session
+            self.transport.connect(browser.command_executor)
+        return browser
+
+    def report_result(self, browser, failed):
+        # use the test result to send the pass/fail status to Sauce Labs
+        sauce_result = "failed" if failed else "passed"
+        browser.execute_script("sauce:job-result={}".format(sauce_result))
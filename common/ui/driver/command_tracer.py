@@ -0,0 +1,178 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+
+
+class CommandTracer:
+    """
+    Record every WebDriver command sent by one driver: name, locator, duration, outcome and the page object
+    method that caused it. Element commands go through the driver's execute too, so they are recorded as well.
+    Records stay in memory until drain() is called at the end of each test.
+    """
+
+    DIRECT_CALL = '(direct driver call)'
+    DRIVER_STARTUP = '(driver startup)'
+
+    def __init__(self):
+        self.records = []
+        # Per thread, so reads issued concurrently through BasePage.gather() are flagged correctly
+        self._waits = threading.local()
+
+    @staticmethod
+    def of(driver):
+        return getattr(driver, 'command_tracer', None)
+
+    def attach(self, driver):
+        execute = driver.execute
+
+        def traced_execute(driver_command, params=None):
+            start = time.time()
+            outcome = 'ok'
+            try:
+                return execute(driver_command, params)
+            except Exception as e:
+                outcome = type(e).__name__
+                raise
+            finally:
+                self._record(driver_command, params, start, time.time() - start, outcome)
+
+        driver.execute = traced_execute
+        driver.command_tracer = self
+        return driver
+
+    @staticmethod
+    def detach(driver):
+        # Drop the instance attributes so the class' execute is used again
+        del driver.execute
+        del driver.command_tracer
+
+    def record_startup(self, duration):
+        self.records.append(self._build_record('newSession', None, time.time() - duration, duration, 'ok',
+                                               CommandTracer.DRIVER_STARTUP, None))
+
+    @contextmanager
+    def wait_span(self, condition, tuple_selector):
+        """
+        Time a whole wait, including the time between polls. Commands issued inside it are flagged in_wait
+        so they are not counted twice.
+        """
+        start = time.time()
+        outcome = 'ok'
+        page_method, helper = self.find_callers()
+        self._waits.depth = self._wait_depth() + 1
+        try:
+            yield
+        except Exception as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            self._waits.depth -= 1
+            record = self._build_record('wait:' + condition, None, start, time.time() - start, outcome, page_method,
+                                        helper)
+            record['locator'] = list(tuple_selector)
+            record['wait'] = True
+            self.records.append(record)
+
+    def drain(self):
+        records, self.records = self.records, []
+        return records
+
+    @staticmethod
+    def find_callers():
+        """
+        :return: (outermost page object method, innermost page object method) on the call stack
+        """
+        from common.ui.page_objects.base_page import BasePage
+        outermost = innermost = None
+        frame = sys._getframe(2)
+        while frame is not None:
+            owner = frame.f_locals.get('self')
+            if isinstance(owner, BasePage):
+                name = '{}.{}'.format(type(owner).__name__, frame.f_code.co_name)
+                outermost = name
+                if innermost is None:
+                    innermost = name
+            frame = frame.f_back
+        return outermost or CommandTracer.DIRECT_CALL, innermost
+
+    # ---- internals ------------
+    def _wait_depth(self):
+        return getattr(self._waits, 'depth', 0)
+
+    def _record(self, driver_command, params, start, duration, outcome):
+        page_method, helper = self.find_callers()
+        self.records.append(self._build_record(driver_command, params, start, duration, outcome, page_method, helper))
+
+    def _build_record(self, driver_command, params, start, duration, outcome, page_method, helper):
+        locator = None
+        if params and 'using' in params and 'value' in params:
+            locator = [params['using'], params['value']]
+        return {
+            'command': driver_command,
+            'locator': locator,
+            'start': start,
+            'duration_ms': duration * 1000,
+            'outcome': outcome,
+            'page_method': page_method,
+            'helper': helper,
+            'in_wait': self._wait_depth() > 0,
+            'wait': False,
+        }
+
+
+class TraceSummary:
+    """
+    Aggregate command records per page object method across tests, and across xdist workers via merge()
+    """
+
+    def __init__(self, methods=None, total_wait_ms=0.0, total_commands=0):
+        self.methods = methods or {}
+        self.total_wait_ms = total_wait_ms
+        self.total_commands = total_commands
+
+    def add(self, records):
+        for record in records:
+            stats = self.methods.setdefault(record['page_method'],
+                                            {'commands': 0, 'command_ms': 0.0, 'wait_ms': 0.0, 'total_ms': 0.0})
+            if record['wait']:
+                stats['wait_ms'] += record['duration_ms']
+                stats['total_ms'] += record['duration_ms']
+                self.total_wait_ms += record['duration_ms']
+                continue
+            stats['commands'] += 1
+            stats['command_ms'] += record['duration_ms']
+            self.total_commands += 1
+            if not record['in_wait']:
+                stats['total_ms'] += record['duration_ms']
+
+    def merge(self, data):
+        for name, other in data['methods'].items():
+            stats = self.methods.setdefault(name, {'commands': 0, 'command_ms': 0.0, 'wait_ms': 0.0, 'total_ms': 0.0})
+            for key in stats:
+                stats[key] += other[key]
+        self.total_wait_ms += data['total_wait_ms']
+        self.total_commands += data['total_commands']
+
+    def to_dict(self):
+        return {'methods': self.methods, 'total_wait_ms': self.total_wait_ms, 'total_commands': self.total_commands}
+
+    def slowest(self, top=EnvConf.TRACE_SUMMARY_TOP):
+        return sorted(self.methods.items(), key=lambda item: item[1]['total_ms'], reverse=True)[:top]
+
+
+def write_trace_file(records, test_id, trace_dir=EnvConf.TRACE_DIR):
+    """
+    Write the records of one test as JSON lines and return the content
+    """
+    os.makedirs(trace_dir, exist_ok=True)
+    file_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', test_id) + '.jsonl'
+    content = ''.join(json.dumps(record) + '\n' for record in records)
+    with open(os.path.join(trace_dir, file_name), 'w') as trace_file:
+        trace_file.write(content)
+    return content
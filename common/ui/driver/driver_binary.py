@@ -0,0 +1,98 @@
+import json
+import os
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.driver.file_lock import FileLock
+
+
+class DriverBinaryResolver:
+    """
+    Resolve chromedriver/geckodriver once and share the executable path.
+    Binaries are resolved on the first start() of a backend that needs them, in the process starting the driver.
+    Lookup order: the in-process memo, the machine wide manifest and finally webdriver_manager behind a file lock
+    so concurrent workers never probe together.
+    In offline mode webdriver_manager is never called and only the manifest is used.
+    """
+
+    LOCK_POLL_SECONDS = 0.2
+    LOCK_STALE_SECONDS = 300
+
+    def __init__(self, manifest_path=EnvConf.DRIVER_MANIFEST_PATH, ttl_hours=EnvConf.DRIVER_MANIFEST_TTL_HOURS,
+                 offline=EnvConf.DRIVER_OFFLINE):
+        self.manifest_path = manifest_path
+        self.ttl_seconds = ttl_hours * 3600
+        self.offline = offline
+        self._paths = {}
+
+    @staticmethod
+    def binary_key(browser_name):
+        """
+        Map a browser name to the driver binary create_local_driver needs for it
+        :param browser_name:
+        :return: 'chrome', 'firefox' or None when no local binary is needed
+        """
+        if browser_name.lower() == 'chrome' or EnvConf.MOBILE_EMULATION:
+            return 'chrome'
+        if browser_name.lower() == 'firefox':
+            return 'firefox'
+        return None
+
+    def resolve(self, browser_name):
+        key = self.binary_key(browser_name)
+        if key is None:
+            return None
+        if key in self._paths:
+            return self._paths[key]
+        path = self._read_manifest_entry(key)
+        if path is None:
+            if self.offline:
+                raise WebDriverException('No cached {} driver in {} and DRIVER_OFFLINE is set'.format(
+                    key, self.manifest_path))
+            path = self._install_locked(key)
+        self._paths[key] = path
+        return path
+
+    # ---- manifest ------------
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path) as manifest_file:
+                return json.load(manifest_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _read_manifest_entry(self, key):
+        entry = self._read_manifest().get(key)
+        if not entry or not os.path.isfile(entry['path']):
+            return None
+        if not self.offline and time.time() - entry['resolved_at'] > self.ttl_seconds:
+            return None
+        return entry['path']
+
+    def _write_manifest_entry(self, key, path):
+        manifest = self._read_manifest()
+        manifest[key] = {'path': path, 'resolved_at': time.time()}
+        tmp_path = '{}.{}.tmp'.format(self.manifest_path, os.getpid())
+        with open(tmp_path, 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    # ---- install ------------
+    def _install_locked(self, key):
+        with FileLock(self.manifest_path + '.lock', self.LOCK_POLL_SECONDS, self.LOCK_STALE_SECONDS):
+            # Another process may have finished the install while we were waiting for the lock
+            path = self._read_manifest_entry(key)
+            if path is None:
+                path = self._install(key)
+                self._write_manifest_entry(key, path)
+            return path
+
+    @staticmethod
+    def _install(key):
+        if key == 'chrome':
+            from webdriver_manager.chrome import ChromeDriverManager
+            return ChromeDriverManager().install()
+        from webdriver_manager.firefox import GeckoDriverManager
+        return GeckoDriverManager().install()
@@ -0,0 +1,130 @@
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import WebDriverException
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.driver.command_tracer import CommandTracer
+
+
+class DriverPool:
+    """
+    Keep live browsers keyed by capability tuple (is_mobile, platform, browser_name, device_name).
+    Each xdist worker is its own process, so a session scoped pool is one pool per worker.
+    Browsers are reset between tests and only recycled after a failure or after max_uses tests.
+    """
+
+    RESET_STORAGE_SCRIPT = 'try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}'
+    BLANK_PAGE = 'about:blank'
+    # Storage cleared through CDP; the HTTP cache and service workers warmed by a profile template are kept
+    CDP_STORAGE_TYPES = 'local_storage,indexeddb,websql'
+
+    def __init__(self, factory, max_uses=EnvConf.DRIVER_MAX_USES, base_url=EnvConf.BASE_URL):
+        """
+        :param factory: callable(is_mobile, platform, browser_name, device_name) returning a new browser
+        :param max_uses: number of tests a browser serves before it is quit and replaced
+        :param base_url: the app's origin is cleared on every reset, whatever origin the test ended on
+        """
+        self._factory = factory
+        self._max_uses = max_uses
+        self._base_url = base_url
+        self._base_origin = self.origin_of(base_url)
+        self._idle = {}
+        self._checked_out = {}
+
+    @staticmethod
+    def capability_key(is_mobile, platform, browser_name, device_name):
+        return is_mobile, platform, browser_name, device_name
+
+    def acquire(self, is_mobile, platform, browser_name, device_name):
+        key = self.capability_key(is_mobile, platform, browser_name, device_name)
+        idle = self._idle.get(key)
+        if idle:
+            browser, uses = idle.pop()
+        else:
+            browser, uses = self._factory(is_mobile, platform, browser_name, device_name), 0
+        self._checked_out[id(browser)] = (key, uses)
+        return browser
+
+    def owns(self, browser):
+        return id(browser) in self._checked_out
+
+    def release(self, browser, failed=False):
+        """
+        Return a browser to the pool. It is quit instead when the test failed, when it reached
+        max_uses or when the state reset itself fails.
+        :param browser: browser previously handed out by acquire
+        :param failed: whether the test using the browser failed
+        :return:
+        """
+        key, uses = self._checked_out.pop(id(browser))
+        uses += 1
+        if failed or uses >= self._max_uses:
+            self._quit(browser)
+            return
+        try:
+            self.reset(browser)
+        except WebDriverException:
+            self._quit(browser)
+            return
+        tracer = CommandTracer.of(browser)
+        if tracer is not None:
+            # The reset belongs to no test, the next one starts its trace from here
+            tracer.drain()
+        self._idle.setdefault(key, []).append((browser, uses))
+
+    @staticmethod
+    def origin_of(url):
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https'):
+            return None
+        return '{}://{}'.format(parsed.scheme, parsed.netloc)
+
+    def reset(self, browser):
+        """
+        Bring a browser back to a clean state: single window, no cookies, no web storage, blank page.
+        WebDriver only clears the cookies and storage of the loaded origin, so Chrome clears the cookies of every
+        domain and the storage of BASE_URL's origin through CDP; other browsers load BASE_URL to clear it when the
+        test ended on another origin
+        :param browser:
+        :return:
+        """
+        handles = browser.window_handles
+        for handle in handles[1:]:
+            browser.switch_to.window(handle)
+            browser.close()
+        browser.switch_to.window(handles[0])
+        current_origin = self.origin_of(browser.current_url)
+        browser.delete_all_cookies()
+        browser.execute_script(DriverPool.RESET_STORAGE_SCRIPT)
+        if not self._clear_through_cdp(browser, current_origin) and self._base_origin is not None \
+                and current_origin != self._base_origin:
+            browser.get(self._base_url)
+            browser.delete_all_cookies()
+            browser.execute_script(DriverPool.RESET_STORAGE_SCRIPT)
+        browser.get(DriverPool.BLANK_PAGE)
+
+    def _clear_through_cdp(self, browser, current_origin):
+        if not hasattr(browser, 'execute_cdp_cmd'):
+            return False
+        try:
+            browser.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            for origin in {self._base_origin, current_origin} - {None}:
+                browser.execute_cdp_cmd('Storage.clearDataForOrigin',
+                                        {'origin': origin, 'storageTypes': DriverPool.CDP_STORAGE_TYPES})
+        except WebDriverException:
+            return False
+        return True
+
+    def close_all(self):
+        for browsers in self._idle.values():
+            for browser, _ in browsers:
+                self._quit(browser)
+        self._idle.clear()
+        self._checked_out.clear()
+
+    @staticmethod
+    def _quit(browser):
+        try:
+            browser.quit()
+        except WebDriverException:
+            pass
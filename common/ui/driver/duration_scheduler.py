@@ -0,0 +1,131 @@
+import json
+import os
+import re
+
+from xdist.scheduler import LoadScopeScheduling
+
+from common.ui.config import desired_caps
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+
+NO_CAPABILITY = 'default'
+
+
+def capability_id(caps):
+    """
+    Readable test id of a designed_caps dict, e.g. Chrome-LINUX-Ubuntu_18.04_LTS
+    """
+    device_name = re.sub(r'[^A-Za-z0-9.]+', '_', caps['deviceName']).strip('_')
+    return '{}-{}-{}'.format(caps['browserName'], caps['platformName'], device_name)
+
+
+def known_capability_ids():
+    return [capability_id(caps) for caps in vars(desired_caps).values()
+            if isinstance(caps, dict) and 'browserName' in caps and 'deviceName' in caps]
+
+
+class DurationStore:
+    """
+    Historical duration of every test (setup + call + teardown), smoothed over runs and kept in a JSON file
+    """
+
+    SMOOTHING = 0.5
+
+    def __init__(self, path=EnvConf.DURATION_STORE_PATH):
+        self.path = path
+        self.durations = {}
+        self._current = {}
+
+    def load(self):
+        try:
+            with open(self.path) as store_file:
+                self.durations = json.load(store_file)
+        except (IOError, ValueError):
+            # A missing or broken store only means there is no history yet
+            self.durations = {}
+        return self
+
+    def add(self, nodeid, duration):
+        self._current[nodeid] = self._current.get(nodeid, 0.0) + duration
+
+    def save(self):
+        if not self._current:
+            return
+        for nodeid, duration in self._current.items():
+            previous = self.durations.get(nodeid)
+            self.durations[nodeid] = duration if previous is None else \
+                previous + self.SMOOTHING * (duration - previous)
+        self._current = {}
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w') as store_file:
+            json.dump(self.durations, store_file, indent=2, sort_keys=True)
+
+    def estimate(self, nodeids):
+        """
+        Return the expected duration of each node id. Tests without history get the median of the known ones,
+        or 1 second when nothing is known, so a fresh checkout is scheduled by test count.
+        """
+        known = sorted(self.durations[nodeid] for nodeid in nodeids if nodeid in self.durations)
+        fallback = known[len(known) // 2] if known else 1.0
+        return {nodeid: self.durations.get(nodeid, fallback) for nodeid in nodeids}
+
+
+class DurationScheduling(LoadScopeScheduling):
+    """
+    Distribute tests in work units that share one capability tuple (browser, platform, device), so each worker
+    keeps reusing the pooled driver it already has. Units are built and handed out longest-first from the
+    historical durations; a worker asks for a unit of the capability it ran last before taking any other.
+    """
+
+    UNITS_PER_WORKER = 4
+
+    def __init__(self, config, log=None, store=None):
+        super().__init__(config, log)
+        self.store = store or DurationStore().load()
+        self.capability_ids = known_capability_ids()
+        self.unit_of = {}
+        self.unit_capability = {}
+        self.unit_duration = {}
+        self.node_capability = {}
+
+    def capability_of(self, nodeid):
+        params = nodeid.partition('[')[2]
+        for capability in self.capability_ids:
+            if capability in params:
+                return capability
+        return NO_CAPABILITY
+
+    def _build_units(self, nodeids):
+        durations = self.store.estimate(nodeids)
+        by_capability = {}
+        for nodeid in nodeids:
+            by_capability.setdefault(self.capability_of(nodeid), []).append(nodeid)
+        target = sum(durations.values()) / float(max(len(self.nodes), 1) * self.UNITS_PER_WORKER)
+        for capability, capability_nodeids in by_capability.items():
+            index = 0
+            unit_duration = 0.0
+            for nodeid in sorted(capability_nodeids, key=lambda item: -durations[item]):
+                if unit_duration and unit_duration + durations[nodeid] > target:
+                    index += 1
+                    unit_duration = 0.0
+                unit = '{}#{}'.format(capability, index)
+                unit_duration += durations[nodeid]
+                self.unit_of[nodeid] = unit
+                self.unit_capability[unit] = capability
+                self.unit_duration[unit] = unit_duration
+
+    def schedule(self):
+        if self.collection is None and self.registered_collections:
+            self._build_units(list(next(iter(self.registered_collections.values()))))
+        super().schedule()
+
+    def _split_scope(self, nodeid):
+        return self.unit_of.get(nodeid, NO_CAPABILITY + '#0')
+
+    def _assign_work_unit(self, node):
+        preferred = self.node_capability.get(node)
+        units = sorted(self.workqueue, key=lambda item: -self.unit_duration.get(item, 0.0))
+        same_capability = [unit for unit in units if self.unit_capability.get(unit) == preferred]
+        unit = (same_capability or units)[0]
+        self.workqueue.move_to_end(unit, last=False)
+        self.node_capability[node] = self.unit_capability.get(unit)
+        super()._assign_work_unit(node)
@@ -0,0 +1,134 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.common.exceptions import WebDriverException
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+
+
+class FailureArtifacts:
+    """
+    Raw data captured from a driver when a test fails, before anything is compressed or written.
+    The screenshot is PNG bytes, ready to be attached to the report right away.
+    """
+
+    def __init__(self, test_id, screenshot=None, page=None, console=None, errors=None):
+        self.test_id = test_id
+        self.screenshot = screenshot
+        self.page = page or {}
+        self.console = console or []
+        self.errors = errors or []
+
+    def summary(self, artifact_dir):
+        return {'test': self.test_id, 'url': self.page.get('url'), 'title': self.page.get('title'),
+                'console': self.console, 'capture_errors': self.errors, 'artifacts': artifact_dir}
+
+
+class ArtifactCollector:
+    """
+    Capture the screenshot, DOM, URL and console log of a failed test with as few commands as possible, then
+    deduplicate, compress and write them on a bounded background thread pool so the teardown can release the
+    driver right away. Identical screenshots and DOMs are stored once under blobs/, each test gets a manifest.json
+    pointing at them. close() waits for the pending writes; errors lists the writes that failed.
+    """
+
+    CAPTURE_PAGE_SCRIPT = ('return {url: window.location.href, title: document.title, '
+                           'dom: document.documentElement.outerHTML};')
+
+    def __init__(self, artifact_dir=EnvConf.ARTIFACT_DIR, workers=EnvConf.ARTIFACT_WORKERS,
+                 max_pending=EnvConf.ARTIFACT_MAX_PENDING):
+        """
+        :param max_pending: number of captures held in memory; submit() blocks when it is reached
+        """
+        self.artifact_dir = artifact_dir
+        self._workers = workers
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._stored_blobs = set()
+        self.errors = []
+
+    def capture(self, driver, test_id):
+        artifacts = FailureArtifacts(test_id)
+        try:
+            artifacts.screenshot = driver.get_screenshot_as_png()
+        except WebDriverException as e:
+            artifacts.errors.append('screenshot: {}'.format(e.msg))
+        try:
+            artifacts.page = driver.execute_script(ArtifactCollector.CAPTURE_PAGE_SCRIPT) or {}
+        except WebDriverException as e:
+            artifacts.errors.append('page: {}'.format(e.msg))
+        try:
+            # Only Chrome keeps a browser log, other drivers raise
+            artifacts.console = driver.get_log('browser')
+        except (WebDriverException, ValueError):
+            pass
+        return artifacts
+
+    def test_dir(self, test_id):
+        return os.path.join(self.artifact_dir, re.sub(r'[^A-Za-z0-9_.-]+', '_', test_id))
+
+    def submit(self, artifacts):
+        self._slots.acquire()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='failure-artifacts')
+        future = self._executor.submit(self._write, artifacts)
+        future.add_done_callback(lambda done: self._done(done, artifacts.test_id))
+        return self.test_dir(artifacts.test_id)
+
+    def _done(self, future, test_id):
+        self._slots.release()
+        if future.exception() is not None:
+            with self._lock:
+                self.errors.append('{}: {!r}'.format(test_id, future.exception()))
+
+    def _write(self, artifacts):
+        test_dir = self.test_dir(artifacts.test_id)
+        os.makedirs(test_dir, exist_ok=True)
+        manifest = artifacts.summary(test_dir)
+        if artifacts.screenshot:
+            manifest['screenshot'] = self._store_blob(artifacts.screenshot, '.png')
+        if artifacts.page.get('dom'):
+            # A fixed mtime keeps the gzip header, and so the blob name, the same for the same DOM
+            dom = gzip.compress(artifacts.page['dom'].encode('utf-8'), mtime=0)
+            manifest['dom'] = self._store_blob(dom, '.html.gz')
+        with open(os.path.join(test_dir, 'manifest.json'), 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        return manifest
+
+    def _store_blob(self, content, extension):
+        name = hashlib.sha1(content).hexdigest() + extension
+        path = os.path.join(self.artifact_dir, 'blobs', name)
+        with self._lock:
+            if name in self._stored_blobs:
+                return path
+            self._stored_blobs.add(name)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write under a temporary name so a reader never sees half a file; xdist workers may store the same blob
+            # at the same time, each under its own name, and any complete copy will do
+            tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+            with open(tmp_path, 'wb') as blob_file:
+                blob_file.write(content)
+            try:
+                os.replace(tmp_path, path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                if not os.path.exists(path):
+                    raise
+        return path
+
+    def merge_errors(self, errors):
+        with self._lock:
+            self.errors.extend(errors)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
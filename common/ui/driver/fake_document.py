@@ -0,0 +1,232 @@
+import re
+
+import lxml.html
+from selenium.webdriver.common.keys import Keys
+
+BLOCK_TAGS = {'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'fieldset', 'figcaption',
+              'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav',
+              'ol', 'p', 'pre', 'section', 'table', 'td', 'th', 'tr', 'ul'}
+NEVER_RENDERED_TAGS = {'head', 'script', 'style', 'template', 'noscript', 'title', 'meta', 'link'}
+BOOLEAN_ATTRIBUTES = {'checked', 'selected', 'disabled', 'hidden', 'readonly', 'required', 'multiple', 'autofocus'}
+MODIFIER_KEYS = {Keys.SHIFT, Keys.CONTROL, Keys.ALT, Keys.COMMAND}
+
+
+class FakeDocument:
+    """
+    HTML document parsed with lxml that answers the questions a browser would for the fake driver:
+    element lookup, rendered text, visibility, attributes, and the default behaviour of clicks and typing.
+    There is no JavaScript and no stylesheet evaluation; visibility only looks at the hidden attribute,
+    inline display/visibility styles and elements that are never rendered.
+    Every mutation increases generation, the counterpart of the DOM generation MutationObserver counter.
+    """
+
+    def __init__(self, html, url='about:blank'):
+        self.url = url
+        self.root = lxml.html.document_fromstring(html or '<html><head></head><body></body></html>')
+        self.generation = 0
+        self.active_element = None
+        self._selected_all = set()
+
+    @property
+    def title(self):
+        titles = self.root.xpath('//title')
+        return titles[0].text_content().strip() if titles else ''
+
+    def source(self):
+        return lxml.html.tostring(self.root, encoding='unicode')
+
+    def contains(self, element):
+        # A removed lxml element still reports the document's root tree, so walk up to the top ancestor instead
+        while element.getparent() is not None:
+            element = element.getparent()
+        return element is self.root
+
+    # ---- lookup ------------
+    def find(self, by, value, context=None):
+        context = self.root if context is None else context
+        if by == 'css selector':
+            found = context.cssselect(value)
+        elif by == 'xpath':
+            found = context.xpath(value)
+        elif by == 'id':
+            found = context.xpath('.//*[@id=$value]', value=value)
+        elif by == 'name':
+            found = context.xpath('.//*[@name=$value]', value=value)
+        elif by == 'class name':
+            found = context.xpath('.//*[contains(concat(" ", normalize-space(@class), " "), $value)]',
+                                  value=' {} '.format(value))
+        elif by == 'tag name':
+            found = context.xpath('.//' + value)
+        elif by in ('link text', 'partial link text'):
+            found = [link for link in context.xpath('.//a')
+                     if (self.text(link) == value if by == 'link text' else value in self.text(link))]
+        else:
+            raise ValueError('Unsupported locator strategy: {}'.format(by))
+        return [element for element in found if isinstance(element, lxml.html.HtmlElement)]
+
+    # ---- state ------------
+    def is_displayed(self, element):
+        if element.tag == 'input' and element.get('type', '').lower() == 'hidden':
+            return False
+        node = element
+        while node is not None:
+            if node.tag in NEVER_RENDERED_TAGS or node.get('hidden') is not None:
+                return False
+            style = self._inline_style(node)
+            if style.get('display') == 'none' or style.get('visibility') in ('hidden', 'collapse') \
+                    or style.get('opacity') == '0':
+                return False
+            node = node.getparent()
+        return True
+
+    def is_enabled(self, element):
+        return element.get('disabled') is None
+
+    def is_interactable(self, element):
+        # Enabled, not marked aria-disabled, and receiving pointer events (pointer-events is inherited)
+        if not self.is_enabled(element) or element.get('aria-disabled') == 'true':
+            return False
+        node = element
+        while node is not None:
+            pointer_events = self._inline_style(node).get('pointer-events')
+            if pointer_events:
+                return pointer_events != 'none'
+            node = node.getparent()
+        return True
+
+    def is_selected(self, element):
+        return element.get('checked') is not None or element.get('selected') is not None
+
+    def text(self, element):
+        if not self.is_displayed(element):
+            return ''
+        parts = []
+        self._collect_text(element, parts)
+        lines = [re.sub(r'[ \t\r\f\v]+', ' ', line).strip() for line in ''.join(parts).split('\n')]
+        return '\n'.join(line for line in lines if line)
+
+    def attribute(self, element, name):
+        if name == 'value' and element.tag == 'textarea':
+            return element.text or ''
+        if name == 'value' and element.tag == 'input':
+            return element.get('value', '')
+        if name in BOOLEAN_ATTRIBUTES:
+            return 'true' if element.get(name) is not None else None
+        if name in ('innerText', 'textContent'):
+            return self.text(element) if name == 'innerText' else element.text_content()
+        return element.get(name)
+
+    def css_value(self, element, name):
+        return self._inline_style(element).get(name, '')
+
+    # ---- behaviour ------------
+    def click(self, element):
+        """
+        Default action of a click: toggle checkboxes, check radios, forward label clicks, focus the element
+        :return: href of a clicked link, to be navigated by the driver, otherwise None
+        """
+        if not self.is_enabled(element):
+            return None
+        self.active_element = element
+        if element.tag == 'label':
+            target = self._label_target(element)
+            if target is not None:
+                return self.click(target)
+            return None
+        if element.tag == 'input':
+            input_type = element.get('type', 'text').lower()
+            if input_type == 'checkbox':
+                self._set_boolean(element, 'checked', element.get('checked') is None)
+            elif input_type == 'radio':
+                for radio in self.root.xpath('//input[@type="radio"][@name=$name]', name=element.get('name', '')):
+                    self._set_boolean(radio, 'checked', False)
+                self._set_boolean(element, 'checked', True)
+        link = element if element.tag == 'a' else next(element.iterancestors('a'), None)
+        if link is not None and link.get('href') and not link.get('href').startswith(('#', 'javascript:')):
+            return link.get('href')
+        return None
+
+    def type_keys(self, element, keys, modifiers=None):
+        """
+        Apply typed characters and the special keys BACKSPACE/DELETE/select-all to an input or textarea
+        :param keys: iterable of characters as produced by keys_to_typing
+        :param modifiers: set of modifier keys held, updated in place; a new set when None
+        """
+        modifiers = set() if modifiers is None else modifiers
+        self.active_element = element
+        editable = element.tag == 'textarea' or \
+            (element.tag == 'input' and element.get('type', 'text').lower() not in ('checkbox', 'radio', 'button'))
+        for key in keys:
+            if key == Keys.NULL:
+                modifiers.clear()
+            elif key in MODIFIER_KEYS:
+                modifiers.symmetric_difference_update({key})
+            elif not editable:
+                continue
+            elif key.lower() == 'a' and (Keys.CONTROL in modifiers or Keys.COMMAND in modifiers):
+                self._selected_all.add(element)
+            elif key in (Keys.BACKSPACE, Keys.DELETE):
+                value = self.attribute(element, 'value')
+                self.set_value(element, '' if element in self._selected_all else value[:-1])
+            elif len(key) == 1 and not '\ue000' <= key <= '\uf8ff':
+                value = '' if element in self._selected_all else self.attribute(element, 'value')
+                self.set_value(element, value + (key.upper() if Keys.SHIFT in modifiers else key))
+        return modifiers
+
+    def set_value(self, element, value):
+        self._selected_all.discard(element)
+        if element.tag == 'textarea':
+            element.text = value
+        else:
+            element.set('value', value)
+        self.generation += 1
+
+    def set_attribute(self, element, name, value):
+        element.set(name, value)
+        self.generation += 1
+
+    # ---- internals ------------
+    def append_html(self, parent, html):
+        for fragment in lxml.html.fragments_fromstring(html):
+            parent.append(fragment)
+        self.generation += 1
+
+    def remove(self, element):
+        element.getparent().remove(element)
+        self.generation += 1
+
+    def _set_boolean(self, element, name, enabled):
+        if enabled:
+            element.set(name, name)
+        elif name in element.attrib:
+            del element.attrib[name]
+        self.generation += 1
+
+    def _label_target(self, label):
+        if label.get('for'):
+            targets = self.root.xpath('//*[@id=$id]', id=label.get('for'))
+            return targets[0] if targets else None
+        nested = label.xpath('.//input | .//select | .//textarea')
+        return nested[0] if nested else None
+
+    def _collect_text(self, element, parts):
+        if element.tag in BLOCK_TAGS:
+            parts.append('\n')
+        if element.text:
+            parts.append(element.text)
+        for child in element:
+            if isinstance(child, lxml.html.HtmlElement) and self.is_displayed(child):
+                self._collect_text(child, parts)
+            if child.tail:
+                parts.append(child.tail)
+        if element.tag in BLOCK_TAGS:
+            parts.append('\n')
+
+    @staticmethod
+    def _inline_style(element):
+        style = {}
+        for declaration in (element.get('style') or '').split(';'):
+            if ':' in declaration:
+                name, value = declaration.split(':', 1)
+                style[name.strip().lower()] = value.strip().lower()
+        return style
@@ -0,0 +1,426 @@
+import base64
+import itertools
+import os
+from urllib.parse import urljoin, urlparse
+from urllib.request import urlopen
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+from common.ui.driver.driver_pool import DriverPool
+from common.ui.driver.failure_artifacts import ArtifactCollector
+from common.ui.driver.fake_document import MODIFIER_KEYS, FakeDocument
+from common.ui.page_objects import scripts
+
+# 1x1 transparent PNG returned for screenshots
+BLANK_PNG = base64.b64encode(bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000d49444154789c6360606060000000050001a5f645400000000049454e44ae426082')).decode()
+WINDOW_HANDLE = 'fake-window'
+
+
+class FakeCommandExecutor:
+    """
+    In-process replacement for RemoteConnection. It answers WebDriver commands in the JSON wire protocol
+    against a FakeDocument, so the unchanged Selenium client (WebElement, ActionChains, WebDriverWait) and
+    everything wrapping driver.execute work on top of it.
+    Only the subset BasePage uses is implemented; execute_script understands the scripts BasePage sends
+    (see common.ui.page_objects.scripts) plus a few one-liners, anything else is a javascript error.
+    """
+
+    _session_ids = itertools.count(1)
+
+    def __init__(self, documents=None, click_handlers=None):
+        """
+        :param documents: dict url -> html served before falling back to file:// and http(s):// loading
+        :param click_handlers: dict url -> callable(document, element) run after the default action of a click on
+        that page, standing in for the app's own event handlers
+        """
+        self.documents = dict(documents or {})
+        self.click_handlers = dict(click_handlers or {})
+        self.document = FakeDocument('', 'about:blank')
+        self.history = []
+        self.cookies = {}
+        self.timeouts = {}
+        self.window_size = {'width': 1920, 'height': 1080}
+        self.modifiers = set()
+        self.pointer_element = None
+        self.dom_observer_installed = False
+        self.streams = {}
+        self.vitals_document = None
+        self._elements = {}
+        self._element_ids_by_node = {}
+        self._element_ids = itertools.count(1)
+        self.commands = {
+            Command.NEW_SESSION: self._new_session,
+            Command.QUIT: lambda params: None,
+            Command.CLOSE: lambda params: None,
+            Command.GET: lambda params: self.navigate(params['url']),
+            Command.GET_CURRENT_URL: lambda params: self.document.url,
+            Command.GET_TITLE: lambda params: self.document.title,
+            Command.GET_PAGE_SOURCE: lambda params: self.document.source(),
+            Command.REFRESH: lambda params: self.navigate(self.document.url, record_history=False),
+            Command.GO_BACK: lambda params: self.back(),
+            Command.GET_CURRENT_WINDOW_HANDLE: lambda params: WINDOW_HANDLE,
+            Command.GET_WINDOW_HANDLES: lambda params: [WINDOW_HANDLE],
+            Command.SWITCH_TO_WINDOW: lambda params: None,
+            Command.SWITCH_TO_FRAME: lambda params: None,
+            Command.SWITCH_TO_PARENT_FRAME: lambda params: None,
+            Command.MAXIMIZE_WINDOW: lambda params: None,
+            Command.SET_WINDOW_SIZE: lambda params: self.window_size.update(width=params['width'],
+                                                                            height=params['height']),
+            Command.GET_WINDOW_SIZE: lambda params: dict(self.window_size),
+            Command.SET_TIMEOUTS: lambda params: self.timeouts.update({params.get('type'): params.get('ms')}),
+            Command.SET_SCRIPT_TIMEOUT: lambda params: self.timeouts.update(script=params.get('ms')),
+            Command.IMPLICIT_WAIT: lambda params: self.timeouts.update(implicit=params.get('ms')),
+            Command.SCREENSHOT: lambda params: BLANK_PNG,
+            Command.GET_ALL_COOKIES: lambda params: list(self.cookies.values()),
+            Command.ADD_COOKIE: lambda params: self.cookies.update({params['cookie']['name']: params['cookie']}),
+            Command.DELETE_COOKIE: lambda params: self.cookies.pop(params['name'], None),
+            Command.DELETE_ALL_COOKIES: lambda params: self.cookies.clear(),
+            Command.FIND_ELEMENT: lambda params: self._find(params, single=True),
+            Command.FIND_ELEMENTS: lambda params: self._find(params, single=False),
+            Command.FIND_CHILD_ELEMENT: lambda params: self._find(params, single=True, child=True),
+            Command.FIND_CHILD_ELEMENTS: lambda params: self._find(params, single=False, child=True),
+            Command.GET_ACTIVE_ELEMENT: lambda params: self._wrap(self.document.active_element),
+            Command.GET_ELEMENT_TEXT: lambda params: self.document.text(self._element(params)),
+            Command.GET_ELEMENT_TAG_NAME: lambda params: self._element(params).tag,
+            Command.GET_ELEMENT_ATTRIBUTE: lambda params: self.document.attribute(self._element(params),
+                                                                                  params['name']),
+            Command.GET_ELEMENT_PROPERTY: lambda params: self.document.attribute(self._element(params),
+                                                                                 params['name']),
+            Command.GET_ELEMENT_VALUE_OF_CSS_PROPERTY: lambda params: self.document.css_value(
+                self._element(params), params['propertyName']),
+            Command.IS_ELEMENT_DISPLAYED: lambda params: self.document.is_displayed(self._element(params)),
+            Command.IS_ELEMENT_ENABLED: lambda params: self.document.is_enabled(self._element(params)),
+            Command.IS_ELEMENT_SELECTED: lambda params: self.document.is_selected(self._element(params)),
+            Command.GET_ELEMENT_LOCATION: lambda params: {'x': 0, 'y': 0},
+            Command.GET_ELEMENT_LOCATION_ONCE_SCROLLED_INTO_VIEW: lambda params: {'x': 0, 'y': 0},
+            Command.GET_ELEMENT_SIZE: lambda params: {'width': 0, 'height': 0},
+            Command.CLICK_ELEMENT: lambda params: self.click(self._element(params)),
+            Command.CLEAR_ELEMENT: lambda params: self.document.set_value(self._element(params), ''),
+            Command.SEND_KEYS_TO_ELEMENT: lambda params: self.document.type_keys(self._element(params),
+                                                                                 params['value']),
+            Command.SEND_KEYS_TO_ACTIVE_ELEMENT: self._send_keys_to_active_element,
+            Command.MOVE_TO: self._move_to,
+            Command.CLICK: lambda params: self.click(self._pointer_target()),
+            Command.DOUBLE_CLICK: lambda params: self.click(self._pointer_target()),
+            Command.MOUSE_DOWN: lambda params: None,
+            Command.MOUSE_UP: lambda params: None,
+            Command.EXECUTE_SCRIPT: lambda params: self._execute_script(params, self.scripts),
+            Command.EXECUTE_ASYNC_SCRIPT: lambda params: self._execute_script(params, self.async_scripts),
+        }
+        self.scripts = {
+            scripts.LOOKUP_ELEMENT: self._lookup_element,
+            scripts.SNAPSHOT_ELEMENTS_BY_LOCATOR: lambda by, value, attributes, scroll: [
+                self._snapshot(element, attributes) for element in self.document.find(by, value)],
+            scripts.SNAPSHOT_ELEMENTS: lambda elements, attributes, scroll: [
+                self._snapshot(element, attributes) for element in elements],
+            scripts.SET_NATIVE_VALUE: lambda element, value: self.document.set_value(element, value) or value,
+            # Nothing is laid out, so there is nothing to mask on the blank screenshot
+            scripts.ELEMENT_RECTS: lambda locators: {'ratio': 1, 'rects': []},
+            scripts.END_STREAM: self._end_stream,
+            # Nothing is animated in a static document
+            scripts.FREEZE_RENDERING: lambda config: None,
+            'arguments[0].click();': lambda element: self.click(element, check_interactable=False),
+            'arguments[0].scrollIntoView(true);': lambda element: None,
+            DriverPool.RESET_STORAGE_SCRIPT: lambda: None,
+            ArtifactCollector.CAPTURE_PAGE_SCRIPT: lambda: {'url': self.document.url, 'title': self.document.title,
+                                                            'dom': self.document.source()},
+            "return document.readyState == 'complete'": lambda: True,
+            'window.history.back()': self.back,
+            "arguments[0].setAttribute('value',arguments[1])": lambda element, value: self.document.set_attribute(
+                element, 'value', value),
+        }
+        self.async_scripts = {
+            scripts.WAIT_FOR_CONDITION: self._wait_for_condition,
+            scripts.PERFORM_ACTION: self._perform_action,
+            # Documents are static and fully parsed, so they are idle as soon as they are loaded
+            scripts.WAIT_FOR_IDLE: lambda *idle_windows: {'idle': True, 'waitMs': 0, 'inflight': 0},
+            scripts.STREAM_ELEMENTS: self._stream_elements,
+            scripts.SELECT_CHECKBOXES_BY_LABEL: self._select_checkboxes_by_label,
+            scripts.COLLECT_WEB_VITALS: self._collect_web_vitals,
+        }
+
+    def execute(self, command, params):
+        handler = self.commands.get(command)
+        if handler is None:
+            return self._error('unknown command', 'Fake driver does not implement {}'.format(command))
+        try:
+            value = handler(params)
+        except FakeWebDriverError as e:
+            return self._error(e.status, e.message)
+        return {'status': 0, 'value': value}
+
+    # ---- navigation ------------
+    def navigate(self, url, record_history=True):
+        if record_history and self.document.url != 'about:blank':
+            self.history.append(self.document.url)
+        self.document = FakeDocument(self.load(url), url)
+        self.dom_observer_installed = False
+        self.pointer_element = None
+        self._elements.clear()
+        self._element_ids_by_node.clear()
+
+    def back(self):
+        if self.history:
+            self.navigate(self.history.pop(), record_history=False)
+
+    def load(self, url):
+        if url in self.documents:
+            return self.documents[url]
+        parsed = urlparse(url)
+        without_query = parsed._replace(query='', fragment='').geturl()
+        if without_query in self.documents:
+            return self.documents[without_query]
+        if parsed.scheme == 'about':
+            return ''
+        if parsed.scheme == 'file':
+            with open(parsed.path, encoding='utf-8') as html_file:
+                return html_file.read()
+        if parsed.scheme in ('http', 'https'):
+            with urlopen(url) as response:
+                return response.read().decode(response.headers.get_content_charset() or 'utf-8')
+        if os.path.isfile(url):
+            with open(url, encoding='utf-8') as html_file:
+                return html_file.read()
+        raise FakeWebDriverError('unknown error', 'Fake driver cannot load {}'.format(url))
+
+    def click(self, element, check_interactable=True):
+        if element is None:
+            return None
+        if check_interactable and not self.document.is_displayed(element):
+            raise FakeWebDriverError('element not interactable', 'element not interactable')
+        href = self.document.click(element)
+        click_handler = self.click_handlers.get(self.document.url)
+        if click_handler is not None:
+            click_handler(self.document, element)
+        if href is not None:
+            self.navigate(urljoin(self.document.url, href))
+        return None
+
+    # ---- elements ------------
+    def _wrap(self, element):
+        if element is None:
+            return None
+        element_id = self._element_ids_by_node.get(element)
+        if element_id is None:
+            element_id = 'fake-element-{}'.format(next(self._element_ids))
+            self._elements[element_id] = element
+            self._element_ids_by_node[element] = element_id
+        return {'ELEMENT': element_id}
+
+    def _unwrap(self, value):
+        if isinstance(value, dict) and 'ELEMENT' in value:
+            return self._element({'id': value['ELEMENT']})
+        if isinstance(value, list):
+            return [self._unwrap(item) for item in value]
+        return value
+
+    def _wrap_result(self, value):
+        if isinstance(value, list):
+            return [self._wrap_result(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._wrap_result(item) for key, item in value.items()}
+        if hasattr(value, 'tag') and hasattr(value, 'getparent'):
+            return self._wrap(value)
+        return value
+
+    def _element(self, params):
+        element = self._elements.get(params['id'])
+        if element is None or not self.document.contains(element):
+            raise FakeWebDriverError('stale element reference', 'stale element reference: element is not attached')
+        return element
+
+    def _find(self, params, single, child=False):
+        context = self._element(params) if child else None
+        try:
+            found = self.document.find(params['using'], params['value'], context)
+        except Exception as e:
+            raise FakeWebDriverError('invalid selector', 'invalid selector: {}'.format(e))
+        if single:
+            if not found:
+                raise FakeWebDriverError('no such element', 'no such element: Unable to locate element: {}'.format(
+                    {'method': params['using'], 'selector': params['value']}))
+            return self._wrap(found[0])
+        return [self._wrap(element) for element in found]
+
+    # ---- actions ------------
+    def _send_keys_to_active_element(self, params):
+        element = self.document.active_element
+        if element is None:
+            self.modifiers.symmetric_difference_update({key for key in params['value'] if key in MODIFIER_KEYS})
+            return None
+        self.document.type_keys(element, params['value'], self.modifiers)
+        return None
+
+    def _pointer_target(self):
+        return self.document.active_element if self.pointer_element is None else self.pointer_element
+
+    def _move_to(self, params):
+        if params.get('element'):
+            self.pointer_element = self._element({'id': params['element']})
+
+    # ---- scripts ------------
+    def _execute_script(self, params, handlers):
+        handler = handlers.get(params['script'])
+        if handler is None:
+            raise FakeWebDriverError('javascript error', 'Fake driver cannot run script: {}'.format(
+                params['script'].strip()[:80]))
+        return self._wrap_result(handler(*self._unwrap(params.get('args', []))))
+
+    def _dom_generation(self):
+        if not self.dom_observer_installed:
+            self.dom_observer_installed = True
+            self._observed_base = self.document.generation
+            return -1
+        return self.document.generation - self._observed_base
+
+    def _lookup_element(self, by, value, condition, cached_generation):
+        # Mirrors LOOKUP_ELEMENT
+        generation = self._dom_generation()
+        if generation != -1 and generation == cached_generation:
+            return {'generation': generation, 'element': None}
+        return {'generation': generation, 'element': self._check_condition(by, value, condition, None)}
+
+    def _snapshot(self, element, attributes):
+        visible = self.document.is_displayed(element)
+        return {'text': self.document.text(element) if visible else '', 'visible': visible,
+                'attributes': {name: element.get(name) for name in attributes}}
+
+    def _stream_elements(self, by, value, attributes, key_attribute, chunk_size, stream_id, container, next_page,
+                         settle_ms):
+        # Mirrors STREAM_ELEMENTS, every element is rendered already so the stream ends once they are all returned
+        seen = self.streams.setdefault(stream_id, set())
+        entries = []
+        occurrences = {}
+        for element in self.document.find(by, value):
+            if len(entries) >= chunk_size:
+                break
+            if key_attribute:
+                key = element.get(key_attribute)
+            else:
+                text = self.document.text(element)
+                occurrences[text] = occurrences.get(text, 0) + 1
+                key = '{}#{}'.format(text, occurrences[text])
+            if key is None or key in seen:
+                continue
+            seen.add(key)
+            entry = self._snapshot(element, attributes)
+            entry['key'] = key
+            entries.append(entry)
+        return {'entries': entries, 'done': not entries}
+
+    def _select_checkboxes_by_label(self, label_locator, names, settle_ms, timeout_ms):
+        # Mirrors SELECT_CHECKBOXES_BY_LABEL, the result set of a static document is complete right away
+        checkboxes = {}
+        for label in self.document.find(*label_locator):
+            name = self.document.text(label)
+            if name in names and name not in checkboxes and self.document.is_displayed(label):
+                found = self.document.find('id', label.get('for', ''))
+                checkboxes[name] = found[0] if found else None
+        result = {'selected': [], 'alreadySelected': [], 'notFound': []}
+        for name in names:
+            checkbox = checkboxes.get(name)
+            if checkbox is None:
+                result['notFound'].append(name)
+            elif checkbox.get('checked') is not None:
+                result['alreadySelected'].append(name)
+            else:
+                self.click(checkbox, check_interactable=False)
+                result['selected'].append(name)
+        return result
+
+    def _collect_web_vitals(self):
+        # Mirrors COLLECT_WEB_VITALS for a document that is never rendered: no timing, no resources
+        if self.document is self.vitals_document or urlparse(self.document.url).scheme not in ('http', 'https'):
+            return None
+        self.vitals_document = self.document
+        return {'url': self.document.url, 'metrics': {
+            'ttfb_ms': 0, 'dom_content_loaded_ms': 0, 'load_ms': 0, 'fcp_ms': None, 'lcp_ms': None, 'cls': 0,
+            'long_tasks': 0, 'long_task_ms': 0, 'resources': 0, 'transfer_bytes': 0, 'slowest_resource_ms': 0,
+            'js_heap_bytes': None}}
+
+    def _end_stream(self, stream_id):
+        self.streams.pop(stream_id, None)
+
+    def _check_condition(self, by, value, condition, text):
+        # Mirrors checkCondition in scripts.CHECK_CONDITION_FUNCTION
+        found = self.document.find(by, value)
+        element = found[0] if found else None
+        if condition == 'present':
+            return element
+        if condition == 'visible':
+            return element if element is not None and self.document.is_displayed(element) else None
+        if condition == 'invisible':
+            return element is None or not self.document.is_displayed(element)
+        if condition == 'clickable':
+            return element if element is not None and self.document.is_displayed(element) and \
+                self.document.is_interactable(element) else None
+        if condition == 'text':
+            return element is not None and text in self.document.text(element)
+        if condition == 'value':
+            return element is not None and text in (self.document.attribute(element, 'value') or '')
+        raise FakeWebDriverError('javascript error', 'Unsupported wait condition: {}'.format(condition))
+
+    def _wait_for_condition(self, by, value, condition, text, timeout_ms, poll_ms):
+        # Nothing changes a static document while waiting, so one evaluation decides the outcome
+        result = self._check_condition(by, value, condition, text)
+        return None if result is None or result is False else result
+
+    def _perform_action(self, by, value, action, text, post, timeout_ms, poll_ms):
+        result = {'ok': False, 'reason': None, 'waitMs': 0, 'actionMs': 0, 'postMs': 0, 'totalMs': 0}
+        clicks = action in ('click', 'click_and_type')
+        element = self._check_condition(by, value, 'clickable' if clicks else 'visible', None)
+        if element is None:
+            result['reason'] = 'timeout: element not found' if not self.document.find(by, value) else \
+                'timeout: element not {}'.format('clickable' if clicks else 'visible')
+            return result
+        if clicks:
+            self.click(element)
+        if action != 'click' and text is not None:
+            current = '' if action == 'clear_and_type' else self.document.attribute(element, 'value') or ''
+            self.document.set_value(element, current + text)
+        if post and not self._check_condition(post['by'], post['value'], post['condition'], post['text']):
+            result['reason'] = 'timeout: post condition {} not met'.format(post['condition'])
+            return result
+        result['ok'] = True
+        return result
+
+    # ---- session ------------
+    def _new_session(self, params):
+        capabilities = dict(params.get('desiredCapabilities') or {})
+        capabilities.setdefault('browserName', 'fake')
+        capabilities.setdefault('platform', 'ANY')
+        return {'status': 0, 'sessionId': 'fake-session-{}'.format(next(self._session_ids)), 'value': capabilities}
+
+    @staticmethod
+    def _error(status, message):
+        return {'status': status, 'value': {'message': message}}
+
+
+class FakeWebDriverError(Exception):
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class FakeWebDriver(RemoteWebDriver):
+    """
+    WebDriver backed by FakeCommandExecutor: no browser process, no network round trips, millisecond commands.
+    Meant for page object and helper tests against static HTML, e.g. driver.load_html(html) or
+    FakeWebDriver(documents={url: html}) and then driver.get(url).
+    """
+
+    def __init__(self, documents=None, desired_capabilities=None, click_handlers=None):
+        super().__init__(command_executor=FakeCommandExecutor(documents, click_handlers),
+                         desired_capabilities=desired_capabilities or {'browserName': 'fake'})
+        # Typed text is never a file to upload
+        self._is_remote = False
+
+    def load_html(self, html, url='http://fake.local/'):
+        self.command_executor.documents[url] = html
+        self.get(url)
+        return self
@@ -0,0 +1,41 @@
+import os
+import time
+
+
+class FileLock:
+    """
+    Lock shared by processes (xdist workers) through a file created with O_EXCL.
+    A lock file older than stale_seconds is assumed to belong to a crashed process and is taken over.
+    """
+
+    def __init__(self, lock_path, poll_seconds=0.2, stale_seconds=300):
+        self.lock_path = lock_path
+        self.poll_seconds = poll_seconds
+        self.stale_seconds = stale_seconds
+
+    def acquire(self):
+        directory = os.path.dirname(self.lock_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        while True:
+            try:
+                os.close(os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.lock_path) > self.stale_seconds:
+                        os.remove(self.lock_path)
+                        continue
+                except OSError:
+                    continue
+                time.sleep(self.poll_seconds)
+
+    def release(self):
+        os.remove(self.lock_path)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -0,0 +1,135 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.driver.file_lock import FileLock
+
+
+class ProfileTemplate:
+    """
+    A Chrome user-data-dir that has already loaded BASE_URL, so its HTTP cache holds the app's bundles and its
+    service workers are installed. It is built once (and shared by xdist workers through a file lock), then every
+    driver starts from its own clone, removed again when the driver quits. Clones are taken under the same lock, so
+    a worker rebuilding an expired template never replaces it under another worker's copy. Clones are copy-on-write
+    reflinks where the filesystem supports them and plain copies otherwise; hard links are not used because Chrome
+    rewrites cache and index files in place, which would change the template under every other driver.
+    """
+
+    STAMP_FILE = 'template.json'
+    # Files Chrome keeps for the running instance only
+    SKIPPED_FILES = ('SingletonLock', 'SingletonSocket', 'SingletonCookie', 'lockfile', 'DevToolsActivePort')
+    WAIT_FOR_SERVICE_WORKER_SCRIPT = """
+        var waitMs = arguments[0], done = arguments[arguments.length - 1];
+        if (!('serviceWorker' in navigator)) { done(false); return; }
+        Promise.race([
+            navigator.serviceWorker.ready.then(function () { return true; }),
+            new Promise(function (resolve) { setTimeout(function () { resolve(false); }, waitMs); })
+        ]).then(done, function () { done(false); });
+    """
+
+    def __init__(self, template_dir=EnvConf.PROFILE_TEMPLATE_DIR, base_url=EnvConf.BASE_URL,
+                 ttl_hours=EnvConf.PROFILE_TEMPLATE_TTL_HOURS, service_worker_wait_ms=EnvConf.PROFILE_SW_WAIT_MS):
+        self.template_dir = template_dir
+        self.base_url = base_url
+        self.ttl_seconds = ttl_hours * 3600
+        self.service_worker_wait_ms = service_worker_wait_ms
+        self._clones = []
+        self._reflink_supported = True
+
+    def is_fresh(self):
+        try:
+            with open(os.path.join(self.template_dir, ProfileTemplate.STAMP_FILE)) as stamp_file:
+                stamp = json.load(stamp_file)
+        except (OSError, ValueError):
+            return False
+        return stamp['base_url'] == self.base_url and time.time() - stamp['built_at'] < self.ttl_seconds
+
+    def lock(self):
+        return FileLock(self.template_dir.rstrip(os.sep) + '.lock')
+
+    def ensure(self, start_browser):
+        """
+        Build the template unless a fresh one exists
+        :param start_browser: callable(chrome_options) starting Chrome, only called when a build is needed
+        """
+        if self.is_fresh():
+            return self.template_dir
+        with self.lock():
+            # Another worker may have built it while we were waiting for the lock
+            if not self.is_fresh():
+                self._build(start_browser)
+        return self.template_dir
+
+    def _build(self, start_browser):
+        building_dir = self.template_dir.rstrip(os.sep) + '.building'
+        shutil.rmtree(building_dir, ignore_errors=True)
+        chrome_options = ChromeOptions()
+        chrome_options.add_argument('--user-data-dir=' + building_dir)
+        if EnvConf.HEADLESS:
+            chrome_options.add_argument('--headless')
+        browser = start_browser(chrome_options)
+        try:
+            browser.set_page_load_timeout(EnvConf.PAGE_LOAD_TIMEOUT_SECONDS)
+            browser.get(self.base_url)
+            browser.set_script_timeout(self.service_worker_wait_ms / 1000.0 + 5)
+            if browser.execute_async_script(ProfileTemplate.WAIT_FOR_SERVICE_WORKER_SCRIPT,
+                                            self.service_worker_wait_ms):
+                # Load again so the service worker fills its own caches as well
+                browser.refresh()
+        except WebDriverException:
+            browser.quit()
+            shutil.rmtree(building_dir, ignore_errors=True)
+            raise
+        # Quitting flushes the cache index to disk
+        browser.quit()
+        with open(os.path.join(building_dir, ProfileTemplate.STAMP_FILE), 'w') as stamp_file:
+            json.dump({'base_url': self.base_url, 'built_at': time.time()}, stamp_file)
+        shutil.rmtree(self.template_dir, ignore_errors=True)
+        os.replace(building_dir, self.template_dir)
+
+    def clone(self):
+        """
+        Copy the template into a new temporary user-data-dir and return its path
+        """
+        clone_dir = tempfile.mkdtemp(prefix='chrome-profile-')
+        os.rmdir(clone_dir)
+        with self.lock():
+            if not self._reflink_copy(clone_dir):
+                shutil.copytree(self.template_dir, clone_dir,
+                                ignore=shutil.ignore_patterns(*ProfileTemplate.SKIPPED_FILES))
+        for name in ProfileTemplate.SKIPPED_FILES:
+            path = os.path.join(clone_dir, name)
+            if os.path.lexists(path):
+                os.remove(path)
+        self._clones.append(clone_dir)
+        return clone_dir
+
+    def _reflink_copy(self, clone_dir):
+        # GNU cp shares the data blocks on btrfs/xfs and fails elsewhere, after which plain copies are used
+        if not self._reflink_supported:
+            return False
+        try:
+            subprocess.run(['cp', '-R', '--reflink=always', self.template_dir, clone_dir], check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return True
+        except (OSError, subprocess.CalledProcessError):
+            self._reflink_supported = False
+            shutil.rmtree(clone_dir, ignore_errors=True)
+            return False
+
+    def remove_clone(self, clone_dir):
+        shutil.rmtree(clone_dir, ignore_errors=True)
+        if clone_dir in self._clones:
+            self._clones.remove(clone_dir)
+
+    def remove_clones(self):
+        for clone_dir in self._clones:
+            shutil.rmtree(clone_dir, ignore_errors=True)
+        self._clones = []
@@ -0,0 +1,124 @@
+import threading
+import time
+
+import urllib3
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+
+
+class CommandLatency:
+    """
+    Round trip time of every remote WebDriver command and the number of connections opened, for the remote
+    connections of this process. Merged across xdist workers like the trace summary.
+    """
+
+    def __init__(self):
+        self.commands = {}
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def record(self, command, duration, ok=True):
+        with self._lock:
+            stats = self.commands.setdefault(command, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'errors': 0})
+            stats['count'] += 1
+            stats['total_ms'] += duration * 1000.0
+            stats['max_ms'] = max(stats['max_ms'], duration * 1000.0)
+            if not ok:
+                stats['errors'] += 1
+
+    def record_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    @property
+    def total_commands(self):
+        return sum(stats['count'] for stats in self.commands.values())
+
+    @property
+    def total_ms(self):
+        return sum(stats['total_ms'] for stats in self.commands.values())
+
+    def slowest(self, top=EnvConf.TRACE_SUMMARY_TOP):
+        return sorted(self.commands.items(), key=lambda item: item[1]['total_ms'], reverse=True)[:top]
+
+    def to_dict(self):
+        return {'commands': self.commands, 'connections': self.connections}
+
+    def merge(self, data):
+        with self._lock:
+            self.connections += data.get('connections', 0)
+            for command, stats in data.get('commands', {}).items():
+                merged = self.commands.setdefault(command, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'errors': 0})
+                merged['count'] += stats['count']
+                merged['total_ms'] += stats['total_ms']
+                merged['max_ms'] = max(merged['max_ms'], stats['max_ms'])
+                merged['errors'] += stats['errors']
+
+
+class RemoteTransport(urllib3.PoolManager):
+    """
+    HTTP transport for remote WebDriver connections (webdriver.Remote and appium's Remote): one pool of keep-alive
+    connections per host shared by every driver of the process, so commands and new sessions reuse open
+    connections (and TLS sessions) instead of connecting per command. Optionally asks for gzip responses (page
+    sources, screenshots) and counts the round trip time of every command in a CommandLatency.
+    """
+
+    def __init__(self, latency=None, pool_size=EnvConf.REMOTE_POOL_SIZE, compress=EnvConf.REMOTE_COMPRESSION,
+                 connect_timeout=EnvConf.REMOTE_CONNECT_TIMEOUT_SECONDS):
+        """
+        :param pool_size: connections kept open per host; more are opened when needed but not kept
+        :param compress: send Accept-Encoding: gzip, responses are decoded transparently
+        :param connect_timeout: the read timeout stays unlimited, page loads and async scripts block the response
+        """
+        super().__init__(maxsize=pool_size, block=False, timeout=urllib3.Timeout(connect=connect_timeout, read=None))
+        self.latency = latency or CommandLatency()
+        self.compress = compress
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        new_conn = pool._new_conn
+
+        def counted_new_conn():
+            self.latency.record_connection()
+            return new_conn()
+
+        pool._new_conn = counted_new_conn
+        return pool
+
+    def urlopen(self, method, url, redirect=True, **kw):
+        if self.compress:
+            headers = dict(kw.get('headers') or self.headers)
+            headers['Accept-Encoding'] = 'gzip'
+            kw['headers'] = headers
+        return super().urlopen(method, url, redirect=redirect, **kw)
+
+    def connect(self, connection):
+        """
+        Send the commands of a RemoteConnection (or AppiumConnection) through this transport and time them.
+        RemoteConnection only sends through its _conn pool when keep_alive is set.
+        :return: the connection
+        """
+        connection.keep_alive = True
+        connection._conn = self
+        execute = connection.execute
+
+        def timed_execute(command, params):
+            start = time.time()
+            ok = False
+            try:
+                response = execute(command, params)
+                ok = response is None or response.get('status', 0) in (0, None)
+                return response
+            finally:
+                self.latency.record(command, time.time() - start, ok)
+
+        connection.execute = timed_execute
+        return connection
+
+    def command_executor(self, url):
+        """
+        RemoteConnection for webdriver.Remote(command_executor=...). The host name is kept: the pool resolves it
+        once per connection, not per command.
+        """
+        return self.connect(RemoteConnection(url, keep_alive=True, resolve_ip=False))
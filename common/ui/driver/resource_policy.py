@@ -0,0 +1,211 @@
+import fnmatch
+import json
+import os
+
+from selenium.common.exceptions import WebDriverException
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+
+
+class ResourcePolicy:
+    """
+    Block URL patterns and resource types and shape the bandwidth of a local Chrome through the DevTools protocol.
+    Network.setBlockedURLs only accepts URL patterns, so resource types are expanded to the patterns identifying them.
+    """
+
+    RESOURCE_TYPE_PATTERNS = {
+        'image': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico'],
+        'font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot', '*fonts.googleapis.com*', '*fonts.gstatic.com*'],
+        'media': ['*.mp4', '*.webm', '*.ogg', '*.mp3', '*.wav'],
+        'analytics': ['*google-analytics.com*', '*googletagmanager.com*', '*analytics.js*', '*hotjar.com*',
+                      '*matomo*', '*siteimprove*'],
+        'ads': ['*doubleclick.net*', '*googlesyndication.com*', '*adservice.google.*', '*facebook.net*'],
+    }
+
+    # Named sets of resource types for RESOURCE_PROFILE
+    RUN_PROFILES = {
+        'none': [],
+        'lean': ['analytics', 'ads', 'font', 'media'],
+        'minimal': ['analytics', 'ads', 'font', 'media', 'image'],
+    }
+
+    # Latency in ms and throughput in bytes per second, the presets of the DevTools network panel
+    THROTTLING_PROFILES = {
+        'none': None,
+        'fast3g': {'offline': False, 'latency': 562.5, 'downloadThroughput': 180000, 'uploadThroughput': 84375},
+        'slow3g': {'offline': False, 'latency': 2000, 'downloadThroughput': 50000, 'uploadThroughput': 50000},
+        'offline': {'offline': True, 'latency': 0, 'downloadThroughput': 0, 'uploadThroughput': 0},
+    }
+
+    def __init__(self, profile=EnvConf.RESOURCE_PROFILE, block_types=EnvConf.RESOURCE_BLOCK_TYPES,
+                 block_patterns=EnvConf.RESOURCE_BLOCK_PATTERNS, throttling=EnvConf.NETWORK_THROTTLING,
+                 record_usage=EnvConf.RESOURCE_USAGE):
+        if profile not in self.RUN_PROFILES:
+            raise KeyError("Unknown resource profile: {}".format(profile))
+        if throttling not in self.THROTTLING_PROFILES:
+            raise KeyError("Unknown network throttling profile: {}".format(throttling))
+        self.patterns_by_type = {}
+        for resource_type in list(self.RUN_PROFILES[profile]) + list(block_types):
+            if resource_type not in self.RESOURCE_TYPE_PATTERNS:
+                raise KeyError("Unknown resource type: {}".format(resource_type))
+            self.patterns_by_type[resource_type] = self._expand(self.RESOURCE_TYPE_PATTERNS[resource_type])
+        if block_patterns:
+            self.patterns_by_type['custom'] = list(block_patterns)
+        self.blocked_urls = [pattern for patterns in self.patterns_by_type.values() for pattern in patterns]
+        self.network_conditions = self.THROTTLING_PROFILES[throttling]
+        self.record_usage = record_usage
+
+    @staticmethod
+    def _expand(patterns):
+        # A file extension pattern would not match URLs with a query string
+        expanded = []
+        for pattern in patterns:
+            expanded.append(pattern)
+            if pattern.startswith('*.'):
+                expanded.append(pattern + '?*')
+        return expanded
+
+    @staticmethod
+    def of(driver):
+        return getattr(driver, 'resource_policy', None)
+
+    @property
+    def active(self):
+        return bool(self.blocked_urls or self.network_conditions or self.record_usage)
+
+    def configure_options(self, chrome_options):
+        if self.record_usage:
+            # Network events end up in the performance log, which is where the byte counts are read from
+            chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        return chrome_options
+
+    def apply(self, driver):
+        if not self.active:
+            return driver
+        driver.execute_cdp_cmd('Network.enable', {})
+        if self.blocked_urls:
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_urls})
+        if self.network_conditions:
+            driver.execute_cdp_cmd('Network.emulateNetworkConditions', self.network_conditions)
+        driver.resource_policy = self
+        return driver
+
+    def blocked_type(self, url):
+        for resource_type, patterns in self.patterns_by_type.items():
+            if any(fnmatch.fnmatchcase(url, pattern) for pattern in patterns):
+                return resource_type
+        return 'other'
+
+    @staticmethod
+    def network_events(driver):
+        """
+        Drain the performance log of the driver and return its Network.* events
+        """
+        try:
+            entries = driver.get_log('performance')
+        except WebDriverException:
+            return []
+        events = []
+        for entry in entries:
+            message = json.loads(entry['message'])['message']
+            if message['method'].startswith('Network.'):
+                events.append(message)
+        return events
+
+    def discard_usage(self, driver):
+        if self.record_usage:
+            self.network_events(driver)
+
+    def collect_usage(self, driver, known_sizes=None):
+        """
+        Count the requests and bytes of everything the driver loaded since the last call.
+        Blocked requests never download anything, so their bytes are estimated from sizes seen in earlier runs.
+        """
+        usage = ResourceUsage()
+        if not self.record_usage:
+            return usage
+        known_sizes = known_sizes if known_sizes is not None else {}
+        urls = {}
+        for event in self.network_events(driver):
+            params = event['params']
+            if event['method'] == 'Network.requestWillBeSent':
+                urls[params['requestId']] = params['request']['url']
+            elif event['method'] == 'Network.loadingFinished':
+                url = urls.get(params['requestId'])
+                usage.add_allowed(url, params.get('encodedDataLength', 0))
+            elif event['method'] == 'Network.loadingFailed' and params.get('blockedReason'):
+                url = urls.get(params['requestId'], '')
+                usage.add_blocked(url, self.blocked_type(url), known_sizes.get(url, 0))
+        return usage
+
+
+class ResourceUsage:
+    """
+    Requests and bytes of one test, split into allowed and blocked
+    """
+
+    def __init__(self):
+        self.allowed_requests = 0
+        self.allowed_bytes = 0
+        self.blocked_requests = 0
+        self.blocked_bytes = 0
+        self.blocked_by_type = {}
+        self.sizes = {}
+
+    def add_allowed(self, url, size):
+        self.allowed_requests += 1
+        self.allowed_bytes += int(size)
+        if url and size:
+            self.sizes[url] = int(size)
+
+    def add_blocked(self, url, resource_type, estimated_size):
+        self.blocked_requests += 1
+        self.blocked_bytes += estimated_size
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+
+    def to_dict(self):
+        return {'allowed_requests': self.allowed_requests, 'allowed_bytes': self.allowed_bytes,
+                'blocked_requests': self.blocked_requests, 'blocked_bytes': self.blocked_bytes,
+                'blocked_by_type': self.blocked_by_type}
+
+
+class ResourceSummary:
+    """
+    Aggregate resource usage across tests, and across xdist workers via merge(). The sizes of allowed
+    resources are kept in a catalogue file so that runs which block them can estimate the bytes saved.
+    """
+
+    def __init__(self, sizes_file=os.path.join(EnvConf.RESOURCE_DIR, 'resource_sizes.json')):
+        self.sizes_file = sizes_file
+        self.sizes = {}
+        self.totals = ResourceUsage().to_dict()
+        self.tests = 0
+
+    def load_sizes(self):
+        if os.path.exists(self.sizes_file):
+            with open(self.sizes_file) as sizes_file:
+                self.sizes.update(json.load(sizes_file))
+        return self.sizes
+
+    def save_sizes(self):
+        if not self.sizes:
+            return
+        os.makedirs(os.path.dirname(self.sizes_file) or '.', exist_ok=True)
+        with open(self.sizes_file, 'w') as sizes_file:
+            json.dump(self.sizes, sizes_file, indent=2, sort_keys=True)
+
+    def add(self, usage):
+        self.merge({'tests': 1, 'totals': usage.to_dict(), 'sizes': usage.sizes})
+
+    def merge(self, data):
+        self.tests += data['tests']
+        for key, value in data['totals'].items():
+            if key == 'blocked_by_type':
+                for resource_type, count in value.items():
+                    self.totals[key][resource_type] = self.totals[key].get(resource_type, 0) + count
+            else:
+                self.totals[key] += value
+        self.sizes.update(data['sizes'])
+
+    def to_dict(self):
+        return {'tests': self.tests, 'totals': self.totals, 'sizes': self.sizes}
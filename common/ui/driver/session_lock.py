@@ -0,0 +1,33 @@
+import threading
+
+
+class SessionLock:
+    """
+    Serialize the commands sent to one WebDriver session, so page reads can run on several threads.
+    The lock sits on the command executor, below driver.execute, and is therefore kept when a command
+    tracer is attached to or detached from the driver.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def of(driver):
+        return getattr(driver, 'session_lock', None)
+
+    @staticmethod
+    def attach(driver):
+        session_lock = SessionLock.of(driver)
+        if session_lock is not None:
+            return session_lock
+        session_lock = SessionLock()
+        executor = driver.command_executor
+        execute = executor.execute
+
+        def locked_execute(command, params):
+            with session_lock._lock:
+                return execute(command, params)
+
+        executor.execute = locked_execute
+        driver.session_lock = session_lock
+        return session_lock
@@ -0,0 +1,149 @@
+import argparse
+import gzip
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from common.ui.driver.fake_webdriver import FakeCommandExecutor
+
+
+class StandInGrid:
+    """
+    Local HTTP server speaking the WebDriver wire protocol under /wd/hub, every session backed by a
+    FakeCommandExecutor. webdriver.Remote talks to it like to a grid, so remote transports can be measured without
+    one: it counts the TCP connections and requests it receives and gzips responses when asked to.
+    """
+
+    PATH_PREFIX = '/wd/hub'
+
+    def __init__(self, documents=None, host='127.0.0.1', port=0):
+        """
+        :param documents: dict url -> html served by every session, see FakeCommandExecutor
+        :param port: 0 picks a free port
+        """
+        self.documents = dict(documents or {})
+        self.sessions = {}
+        self.connections = 0
+        self.requests = 0
+        self.compressed_responses = 0
+        self._lock = threading.Lock()
+        self._routes = StandInGrid.build_routes()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}{}'.format(host, port, StandInGrid.PATH_PREFIX)
+
+    @staticmethod
+    def build_routes():
+        """
+        (method, path regex, variable names, command) for every command RemoteConnection knows
+        """
+        routes = []
+        for command, (method, template) in RemoteConnection(StandInGrid.PATH_PREFIX)._commands.items():
+            names = re.findall(r'\$(\w+)', template)
+            pattern = re.compile('^' + re.sub(r'\\\$\w+', '([^/]+)', re.escape(template)) + '$')
+            routes.append((method, pattern, names, command))
+        return routes
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='stand-in-grid', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def handle(self, method, path, body):
+        """
+        :return: (http status, response dict)
+        """
+        path = path.split('?', 1)[0]
+        if path.startswith(StandInGrid.PATH_PREFIX):
+            path = path[len(StandInGrid.PATH_PREFIX):]
+        params = json.loads(body) if body else {}
+        matches = []
+        for route_method, pattern, names, command in self._routes:
+            match = pattern.match(path) if route_method == method else None
+            if match:
+                matches.append((command, dict(zip(names, match.groups()))))
+        if not matches:
+            return 404, {'status': 'unknown command', 'value': {'message': '{} {}'.format(method, path)}}
+        with self._lock:
+            if matches[0][0] == Command.NEW_SESSION:
+                executor = FakeCommandExecutor(self.documents)
+                response = executor.execute(Command.NEW_SESSION, params)
+                self.sessions[response['value']['sessionId']] = executor
+                return 200, response
+            session_id = matches[0][1].get('sessionId')
+            executor = self.sessions.get(session_id)
+            if executor is None:
+                return 404, {'status': 'invalid session id', 'value': {'message': 'No session {}'.format(session_id)}}
+            # Several commands share a path, take the one the fake driver implements
+            command, variables = next(((command, variables) for command, variables in matches
+                                       if command in executor.commands), matches[0])
+            params.update(variables)
+            response = executor.execute(command, params)
+            if command == Command.QUIT:
+                del self.sessions[session_id]
+            return 200, response
+
+    def _handler_class(self):
+        grid = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 keeps the connection open for the next request
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with grid._lock:
+                    grid.connections += 1
+
+            def _respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length).decode('utf-8') if length else ''
+                with grid._lock:
+                    grid.requests += 1
+                status, response = grid.handle(self.command, self.path, body)
+                payload = json.dumps(response).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json;charset=UTF-8')
+                if 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+                    payload = gzip.compress(payload)
+                    self.send_header('Content-Encoding', 'gzip')
+                    with grid._lock:
+                        grid.compressed_responses += 1
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = _respond
+            do_POST = _respond
+            do_DELETE = _respond
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve fake WebDriver sessions under /wd/hub')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=4444)
+    arguments = parser.parse_args()
+    stand_in_grid = StandInGrid(host=arguments.host, port=arguments.port)
+    print('Stand-in grid at {}'.format(stand_in_grid.url))
+    stand_in_grid.serve_forever()
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import re
+from urllib.error import URLError
+from urllib.parse import urlparse
+from urllib.request import urlopen
+
+from selenium.common.exceptions import WebDriverException
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+
+
+class StateSnapshots:
+    """
+    Named snapshots of the browser state (cookies, localStorage, sessionStorage and URL) reached by a setup flow.
+    Restoring one seeds the state on a light page of the app's origin, so the following driver.get(BASE_URL) starts
+    at that state without the UI clicks. Snapshots carry the app version (a hash of the bundles referenced by the
+    start page, or APP_VERSION) and are ignored once it changes.
+    """
+
+    CAPTURE_STORAGE_SCRIPT = """
+        function dump(storage) {
+            var data = {};
+            for (var i = 0; i < storage.length; i++) { data[storage.key(i)] = storage.getItem(storage.key(i)); }
+            return data;
+        }
+        return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+    """
+    RESTORE_STORAGE_SCRIPT = """
+        var state = arguments[0];
+        Object.keys(state.local).forEach(function (key) { window.localStorage.setItem(key, state.local[key]); });
+        Object.keys(state.session).forEach(function (key) { window.sessionStorage.setItem(key, state.session[key]); });
+    """
+    COOKIE_KEYS = ('name', 'value', 'path', 'domain', 'secure', 'httpOnly', 'expiry')
+    ASSET_PATTERN = re.compile(r'(?:src|href)=["\']([^"\']+\.(?:js|css)(?:\?[^"\']*)?)["\']')
+
+    def __init__(self, store_dir=EnvConf.STATE_SNAPSHOT_DIR, base_url=EnvConf.BASE_URL,
+                 seed_path=EnvConf.STATE_SEED_PATH, app_version=EnvConf.APP_VERSION, enabled=EnvConf.STATE_SNAPSHOTS):
+        self.store_dir = store_dir
+        self.base_url = base_url
+        self.seed_path = seed_path
+        self.enabled = enabled
+        self._app_version = app_version or None
+        self._app_version_resolved = bool(app_version)
+        self._snapshots = {}
+
+    def app_version(self):
+        """
+        Hash of the script and stylesheet URLs of the start page, which change with every build of the app.
+        None when the page cannot be fetched, which disables snapshots for the session.
+        """
+        if not self._app_version_resolved:
+            self._app_version_resolved = True
+            try:
+                with urlopen(self.base_url, timeout=10) as response:
+                    html = response.read().decode('utf-8', 'replace')
+            except (URLError, OSError, ValueError):
+                return None
+            assets = sorted(set(StateSnapshots.ASSET_PATTERN.findall(html)))
+            self._app_version = hashlib.sha1('\n'.join(assets or [html]).encode('utf-8')).hexdigest()[:12]
+        return self._app_version
+
+    def path(self, name):
+        return os.path.join(self.store_dir, re.sub(r'[^A-Za-z0-9_.-]+', '_', name) + '.json')
+
+    def load(self, name):
+        """
+        Return the snapshot stored under name if it was taken from the current app version, otherwise None
+        """
+        version = self.app_version()
+        if not self.enabled or version is None:
+            return None
+        snapshot = self._snapshots.get(name)
+        if snapshot is None:
+            try:
+                with open(self.path(name)) as snapshot_file:
+                    snapshot = json.load(snapshot_file)
+            except (OSError, ValueError):
+                return None
+        if snapshot.get('app_version') != version:
+            return None
+        self._snapshots[name] = snapshot
+        return snapshot
+
+    def capture(self, driver, name):
+        version = self.app_version()
+        if not self.enabled or version is None:
+            return None
+        snapshot = {
+            'app_version': version,
+            'url': driver.current_url,
+            'cookies': [{key: cookie[key] for key in StateSnapshots.COOKIE_KEYS if key in cookie}
+                        for cookie in driver.get_cookies()],
+            'storage': driver.execute_script(StateSnapshots.CAPTURE_STORAGE_SCRIPT),
+        }
+        os.makedirs(self.store_dir, exist_ok=True)
+        # xdist workers may capture the same name at the same time, the last complete file wins
+        tmp_path = '{}.{}.tmp'.format(self.path(name), os.getpid())
+        with open(tmp_path, 'w') as snapshot_file:
+            json.dump(snapshot, snapshot_file, indent=2)
+        os.replace(tmp_path, self.path(name))
+        self._snapshots[name] = snapshot
+        return snapshot
+
+    def restore(self, driver, name):
+        """
+        Seed the state of a snapshot into the driver
+        :return: URL the snapshot was taken at, or None when there is no valid snapshot
+        """
+        snapshot = self.load(name)
+        if snapshot is None:
+            return None
+        base_url = urlparse(self.base_url)
+        driver.get('{}://{}{}'.format(base_url.scheme, base_url.netloc, self.seed_path))
+        for cookie in snapshot['cookies']:
+            try:
+                driver.add_cookie(cookie)
+            except WebDriverException:
+                # Host-only cookies are reported with the domain they were set on, some drivers reject that
+                driver.add_cookie({key: value for key, value in cookie.items() if key != 'domain'})
+        driver.execute_script(StateSnapshots.RESTORE_STORAGE_SCRIPT, snapshot['storage'])
+        return snapshot['url']
+
+    def ensure(self, driver, name, setup_flow):
+        """
+        Bring the driver to a named state: restore the snapshot when there is a valid one, otherwise run the setup
+        flow through the UI and snapshot what it leaves behind
+        :param setup_flow: callable(driver) building the state
+        :return: URL of the state
+        """
+        url = self.restore(driver, name)
+        if url is not None:
+            return url
+        setup_flow(driver)
+        url = driver.current_url
+        self.capture(driver, name)
+        return url
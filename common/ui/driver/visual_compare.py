@@ -0,0 +1,216 @@
+import hashlib
+import io
+import json
+import os
+import re
+
+import numpy
+from PIL import Image
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.page_objects import scripts
+
+
+class VisualResult:
+    """
+    Outcome of one visual check
+    """
+
+    def __init__(self, name, matched, new_baseline=False, changed_tiles=0, total_tiles=0, diff_pixels=0,
+                 diff_ratio=0.0, diff_path=None, reason=None, missing_baseline=False):
+        self.name = name
+        self.matched = matched
+        self.new_baseline = new_baseline
+        self.missing_baseline = missing_baseline
+        self.changed_tiles = changed_tiles
+        self.total_tiles = total_tiles
+        self.diff_pixels = diff_pixels
+        self.diff_ratio = diff_ratio
+        self.diff_path = diff_path
+        self.reason = reason
+
+    def to_dict(self):
+        return {'name': self.name, 'matched': self.matched, 'new_baseline': self.new_baseline,
+                'missing_baseline': self.missing_baseline, 'changed_tiles': self.changed_tiles,
+                'total_tiles': self.total_tiles, 'diff_pixels': self.diff_pixels, 'diff_ratio': self.diff_ratio,
+                'diff': self.diff_path, 'reason': self.reason}
+
+    def describe(self):
+        if self.reason:
+            return '{}: {}'.format(self.name, self.reason)
+        return '{}: {} pixels differ ({:.4%}) in {} of {} tiles, see {}'.format(
+            self.name, self.diff_pixels, self.diff_ratio, self.changed_tiles, self.total_tiles, self.diff_path)
+
+
+class VisualComparer:
+    """
+    Compare viewport screenshots with named baselines. Every screenshot is cut into square tiles that are hashed;
+    the baseline keeps its tile hashes in a JSON sidecar next to an optimized PNG, so a screenshot whose tiles all
+    hash the same passes without decoding the baseline. Only the tiles whose hash changed are diffed, as one NumPy
+    operation over all of them. Elements matched by the ignore locators are painted over in both images before
+    hashing and diffing. Diff images are written only when a check fails.
+    """
+
+    MASK_COLOR = (255, 0, 255)
+    DIFF_COLOR = (255, 0, 0)
+
+    def __init__(self, baseline_dir=EnvConf.VISUAL_BASELINE_DIR, diff_dir=EnvConf.VISUAL_DIFF_DIR,
+                 tile_size=EnvConf.VISUAL_TILE_SIZE, pixel_tolerance=EnvConf.VISUAL_PIXEL_TOLERANCE,
+                 max_diff_ratio=EnvConf.VISUAL_MAX_DIFF_RATIO, update_baselines=EnvConf.VISUAL_UPDATE_BASELINES):
+        """
+        :param pixel_tolerance: largest channel difference still counted as the same pixel (anti-aliasing)
+        :param max_diff_ratio: share of differing pixels a screenshot may have and still match
+        :param update_baselines: record the new screenshots as baselines instead of comparing; without it a missing
+        baseline is reported as missing_baseline and never recorded silently
+        """
+        self.baseline_dir = baseline_dir
+        self.diff_dir = diff_dir
+        self.tile_size = tile_size
+        self.pixel_tolerance = pixel_tolerance
+        self.max_diff_ratio = max_diff_ratio
+        self.update_baselines = update_baselines
+
+    def check(self, driver, name, ignore=()):
+        """
+        Compare the current viewport of the driver with the baseline of the given name, or record the baseline
+        when update_baselines is set
+        :param name: baseline name, including whatever distinguishes the capabilities (e.g. desktop and mobile)
+        :param ignore: tuple selectors of elements whose area is not compared (dates, carousels, ads)
+        :return: VisualResult
+        """
+        rects = []
+        if ignore:
+            located = driver.execute_script(scripts.ELEMENT_RECTS, [list(locator) for locator in ignore])
+            ratio = located['ratio']
+            rects = [[int(value * ratio) for value in rect] for rect in located['rects']]
+        return self.compare(name, driver.get_screenshot_as_png(), rects)
+
+    def compare(self, name, png, ignore_rects=()):
+        """
+        :param png: screenshot bytes
+        :param ignore_rects: [x, y, width, height] areas of the screenshot in image pixels that are not compared
+        :return: VisualResult
+        """
+        pixels = self.decode(png)
+        self.mask(pixels, ignore_rects)
+        tiles = self.tiles(pixels)
+        hashes = self.hash_tiles(tiles)
+        if self.update_baselines:
+            self.save(name, pixels, hashes, ignore_rects)
+            return VisualResult(name, True, new_baseline=True, total_tiles=len(hashes))
+        baseline = self.load(name)
+        if baseline is None:
+            return VisualResult(name, False, missing_baseline=True, total_tiles=len(hashes),
+                                reason='no baseline in {}, record it with VISUAL_UPDATE_BASELINES=True'.format(
+                                    self.baseline_dir))
+
+        height, width = pixels.shape[:2]
+        if (baseline['width'], baseline['height']) != (width, height):
+            diff_path = self.write_diff(name, pixels, numpy.ones((height, width), dtype=bool))
+            return VisualResult(name, False, total_tiles=len(hashes), diff_path=diff_path,
+                                reason='size {}x{} differs from the baseline {}x{}'.format(
+                                    width, height, baseline['width'], baseline['height']))
+
+        if baseline['tile_size'] == self.tile_size:
+            changed = [index for index, (tile_hash, baseline_hash) in enumerate(zip(hashes, baseline['hashes']))
+                       if tile_hash != baseline_hash]
+        else:
+            changed = list(range(len(hashes)))
+        if not changed:
+            return VisualResult(name, True, total_tiles=len(hashes))
+
+        baseline_pixels = self.decode(self.read_png(name))
+        # An ignored element that moved is masked in both images
+        self.mask(pixels, baseline['ignore_rects'])
+        self.mask(baseline_pixels, ignore_rects)
+        tiles = self.tiles(pixels)
+        baseline_tiles = self.tiles(baseline_pixels)
+        shape = tiles.shape
+        tiles = tiles.reshape((-1,) + shape[2:])
+        baseline_tiles = baseline_tiles.reshape((-1,) + shape[2:])
+        delta = numpy.abs(tiles[changed].astype(numpy.int16) - baseline_tiles[changed].astype(numpy.int16))
+        differs = delta.max(axis=-1) > self.pixel_tolerance
+        diff_pixels = int(differs.sum())
+        diff_ratio = diff_pixels / float(width * height)
+        changed_tiles = int(differs.any(axis=(1, 2)).sum())
+        if diff_ratio <= self.max_diff_ratio:
+            return VisualResult(name, True, changed_tiles=changed_tiles, total_tiles=len(hashes),
+                                diff_pixels=diff_pixels, diff_ratio=diff_ratio)
+
+        diff_mask = numpy.zeros(shape[:4], dtype=bool)
+        diff_mask.reshape((-1,) + shape[2:4])[changed] = differs
+        diff_mask = diff_mask.transpose(0, 2, 1, 3).reshape(shape[0] * shape[2], shape[1] * shape[3])
+        diff_path = self.write_diff(name, pixels, diff_mask[:height, :width])
+        return VisualResult(name, False, changed_tiles=changed_tiles, total_tiles=len(hashes),
+                            diff_pixels=diff_pixels, diff_ratio=diff_ratio, diff_path=diff_path)
+
+    @staticmethod
+    def decode(png):
+        return numpy.array(Image.open(io.BytesIO(png)).convert('RGB'))
+
+    @staticmethod
+    def mask(pixels, rects):
+        height, width = pixels.shape[:2]
+        for x, y, rect_width, rect_height in rects:
+            left, top = max(int(x), 0), max(int(y), 0)
+            right, bottom = min(int(x + rect_width), width), min(int(y + rect_height), height)
+            if right > left and bottom > top:
+                pixels[top:bottom, left:right] = VisualComparer.MASK_COLOR
+
+    def tiles(self, pixels):
+        """
+        :return: contiguous array (rows, columns, tile_size, tile_size, 3), edge tiles padded with black
+        """
+        size = self.tile_size
+        height, width = pixels.shape[:2]
+        rows, columns = -(-height // size), -(-width // size)
+        padded = numpy.zeros((rows * size, columns * size, 3), dtype=numpy.uint8)
+        padded[:height, :width] = pixels
+        return numpy.ascontiguousarray(padded.reshape(rows, size, columns, size, 3).transpose(0, 2, 1, 3, 4))
+
+    @staticmethod
+    def hash_tiles(tiles):
+        flat = tiles.reshape(tiles.shape[0] * tiles.shape[1], -1)
+        return [hashlib.blake2b(tile.data, digest_size=8).hexdigest() for tile in flat]
+
+    def file_name(self, name):
+        return re.sub(r'[^A-Za-z0-9_.-]+', '_', name)
+
+    def baseline_path(self, name, extension):
+        return os.path.join(self.baseline_dir, '{}.{}'.format(self.file_name(name), extension))
+
+    def load(self, name):
+        try:
+            with open(self.baseline_path(name, 'json')) as baseline_file:
+                baseline = json.load(baseline_file)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self.baseline_path(name, 'png')):
+            return None
+        return baseline
+
+    def read_png(self, name):
+        with open(self.baseline_path(name, 'png'), 'rb') as png_file:
+            return png_file.read()
+
+    def save(self, name, pixels, hashes, ignore_rects):
+        os.makedirs(self.baseline_dir, exist_ok=True)
+        Image.fromarray(pixels).save(self.baseline_path(name, 'png'), format='PNG', optimize=True)
+        height, width = pixels.shape[:2]
+        with open(self.baseline_path(name, 'json'), 'w') as baseline_file:
+            json.dump({'width': width, 'height': height, 'tile_size': self.tile_size,
+                       'ignore_rects': [list(rect) for rect in ignore_rects], 'hashes': hashes}, baseline_file)
+
+    def write_diff(self, name, pixels, diff_mask):
+        """
+        Write the screenshot faded, with the differing pixels highlighted, and the screenshot itself
+        :return: path of the diff image
+        """
+        os.makedirs(self.diff_dir, exist_ok=True)
+        file_name = self.file_name(name)
+        Image.fromarray(pixels).save(os.path.join(self.diff_dir, file_name + '-actual.png'), format='PNG')
+        diff = (pixels // 3 + 170).astype(numpy.uint8)
+        diff[diff_mask] = VisualComparer.DIFF_COLOR
+        diff_path = os.path.join(self.diff_dir, file_name + '-diff.png')
+        Image.fromarray(diff).save(diff_path, format='PNG')
+        return diff_path
@@ -0,0 +1,220 @@
+import json
+import os
+import sqlite3
+import statistics
+import threading
+import time
+import uuid
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.page_objects import scripts
+
+
+class WebVitalsStore:
+    """
+    Time series of page metrics in SQLite, one row per metric of every collected page. xdist workers write to the
+    same file, SQLite serializes them.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS web_vitals (
+            recorded_at REAL NOT NULL, run_id TEXT NOT NULL, test_id TEXT NOT NULL, capability TEXT NOT NULL,
+            page TEXT NOT NULL, url TEXT NOT NULL, metric TEXT NOT NULL, value REAL NOT NULL);
+        CREATE INDEX IF NOT EXISTS web_vitals_series ON web_vitals (page, capability, metric, recorded_at);
+    """
+
+    def __init__(self, path=EnvConf.WEB_VITALS_DB_PATH):
+        self.path = path
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def connection(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._connection.executescript(WebVitalsStore.SCHEMA)
+        return self._connection
+
+    def add(self, run_id, sample):
+        rows = [(sample['recorded_at'], run_id, sample['test'], sample['capability'], sample['page'], sample['url'],
+                 metric, value) for metric, value in sample['metrics'].items()]
+        with self._lock:
+            connection = self.connection()
+            with connection:
+                connection.executemany('INSERT INTO web_vitals VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def history(self, page, capability, metric, exclude_run_id, limit):
+        """
+        :return: the latest values of a metric from other runs, newest first
+        """
+        with self._lock:
+            cursor = self.connection().execute(
+                'SELECT value FROM web_vitals WHERE page = ? AND capability = ? AND metric = ? AND run_id != ? '
+                'ORDER BY recorded_at DESC LIMIT ?', (page, capability, metric, exclude_run_id, limit))
+            return [row[0] for row in cursor.fetchall()]
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class WebVitals:
+    """
+    Collect Navigation Timing, paint and resource timing, long tasks, LCP, CLS and the JS heap size of every page a
+    driver leaves, in one script call per page, and store them with the test and capability. Collecting on leave
+    (the next navigation, the pool reset or the end of the test) lets LCP and CLS cover the whole visit.
+    check() compares the pages of a test with the budgets of PERFORMANCE_BUDGETS_PATH, regressions() with the
+    history of earlier runs.
+    """
+
+    # Commands that replace the current document
+    LEAVE_COMMANDS = (Command.GET, Command.REFRESH, Command.GO_BACK, Command.GO_FORWARD, Command.QUIT)
+
+    def __init__(self, store=None, budgets_path=EnvConf.PERFORMANCE_BUDGETS_PATH,
+                 regression_threshold=EnvConf.PERFORMANCE_REGRESSION_THRESHOLD,
+                 history_size=EnvConf.PERFORMANCE_HISTORY_SIZE, min_history=EnvConf.PERFORMANCE_MIN_HISTORY,
+                 base_url=EnvConf.BASE_URL):
+        """
+        :param regression_threshold: a budgeted metric regressed when it exceeds the median of its history by this
+                                     fraction, 0 disables the comparison
+        :param history_size: number of earlier values the median is taken over
+        :param min_history: number of earlier values needed before regressions are checked
+        """
+        self.store = store or WebVitalsStore()
+        self.budgets_path = budgets_path
+        self.regression_threshold = regression_threshold
+        self.history_size = history_size
+        self.min_history = min_history
+        self.base_url = base_url.rstrip('/')
+        # xdist workers of one run share its id, so they do not count each other as history
+        self.run_id = os.getenv('PYTEST_XDIST_TESTRUNUID') or uuid.uuid4().hex
+        self.samples = {}
+        self._budgets = None
+
+    def attach(self, driver, test_id, capability):
+        """
+        Attribute the pages the driver leaves from now on to the test, hooking the driver on first use
+        """
+        driver.web_vitals_test = (test_id, capability)
+        if getattr(driver, 'web_vitals_attached', False):
+            return
+        driver.web_vitals_attached = True
+        if hasattr(driver, 'execute_cdp_cmd'):
+            try:
+                driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': scripts.VITALS_OBSERVER})
+            except WebDriverException:
+                # Other drivers get the observer with the collection, LCP and CLS then only see buffered entries
+                pass
+        executor = driver.command_executor
+        execute = executor.execute
+
+        def collecting_execute(command, params):
+            if command in WebVitals.LEAVE_COMMANDS:
+                self.collect(driver)
+            return execute(command, params)
+
+        executor.execute = collecting_execute
+
+    def release(self, driver):
+        """
+        Collect the current page and stop attributing pages to the test, e.g. before the driver goes back to the pool
+        """
+        self.collect(driver)
+        driver.web_vitals_test = None
+
+    def collect(self, driver):
+        attribution = getattr(driver, 'web_vitals_test', None)
+        if attribution is None:
+            return None
+        try:
+            result = driver.execute_async_script(scripts.COLLECT_WEB_VITALS)
+        except WebDriverException:
+            return None
+        if not result:
+            return None
+        test_id, capability = attribution
+        metrics = {metric: float(value) for metric, value in result['metrics'].items() if value is not None}
+        return self.record(test_id, capability, result['url'], metrics)
+
+    def record(self, test_id, capability, url, metrics):
+        sample = {'test': test_id, 'capability': capability, 'page': self.page_of(url), 'url': url,
+                  'metrics': metrics, 'recorded_at': time.time()}
+        self.samples.setdefault(test_id, []).append(sample)
+        self.store.add(self.run_id, sample)
+        return sample
+
+    def page_of(self, url):
+        """
+        Page name of a URL: its path below BASE_URL ('/' for the start page), without query and fragment
+        """
+        path = urlparse(url).path.rstrip('/')
+        base_path = urlparse(self.base_url).path.rstrip('/')
+        if urlparse(url).netloc == urlparse(self.base_url).netloc and path.startswith(base_path):
+            path = path[len(base_path):]
+        return path or '/'
+
+    def budgets(self):
+        """
+        {page: {metric: limit}} from PERFORMANCE_BUDGETS_PATH, the page '*' applies to every page
+        """
+        if self._budgets is None:
+            try:
+                with open(self.budgets_path) as budgets_file:
+                    self._budgets = json.load(budgets_file)
+            except (OSError, ValueError):
+                self._budgets = {}
+        return self._budgets
+
+    def budget_for(self, page, overrides=None):
+        limits = dict(self.budgets().get('*', {}))
+        limits.update(self.budgets().get(page, {}))
+        limits.update(overrides or {})
+        return limits
+
+    def check(self, test_id, overrides=None):
+        """
+        :param overrides: {metric: limit} replacing the budgets of every page of the test
+        :return: list of budget violations, empty when the test's pages are within budget
+        """
+        violations = []
+        for sample in self.samples.get(test_id, []):
+            for metric, limit in sorted(self.budget_for(sample['page'], overrides).items()):
+                value = sample['metrics'].get(metric)
+                if value is not None and value > limit:
+                    violations.append('{} {}: {:.1f} over the budget of {}'.format(
+                        sample['page'], metric, value, limit))
+        return violations
+
+    def regressions(self, test_id, overrides=None):
+        """
+        :param overrides: {metric: limit} replacing the budgets of every page of the test
+        :return: list of budgeted metrics that are within budget but regressed from the history of earlier runs
+        """
+        regressions = []
+        if not self.regression_threshold:
+            return regressions
+        for sample in self.samples.get(test_id, []):
+            for metric, limit in sorted(self.budget_for(sample['page'], overrides).items()):
+                value = sample['metrics'].get(metric)
+                if value is None or value > limit:
+                    continue
+                history = self.store.history(sample['page'], sample['capability'], metric, self.run_id,
+                                             self.history_size)
+                if len(history) < self.min_history:
+                    continue
+                median = statistics.median(history)
+                if median > 0 and value > median * (1 + self.regression_threshold):
+                    regressions.append('{} {}: {:.1f} regressed more than {:.0%} from the median {:.1f} of the last '
+                                       '{} runs'.format(sample['page'], metric, value, self.regression_threshold,
+                                                        median, len(history)))
+        return regressions
+
+    def pop_samples(self, test_id):
+        return self.samples.pop(test_id, [])
@@ -0,0 +1,71 @@
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.page_objects import scripts
+
+
+class ActionResult:
+    """
+    Outcome of an in-page action with the time spent in each phase, in milliseconds
+    """
+
+    def __init__(self, data):
+        self.ok = data['ok']
+        self.reason = data['reason']
+        self.wait_ms = data['waitMs']
+        self.action_ms = data['actionMs']
+        self.post_ms = data['postMs']
+        self.total_ms = data['totalMs']
+
+    def __repr__(self):
+        return 'ActionResult(ok={}, reason={!r}, wait_ms={:.1f}, action_ms={:.1f}, post_ms={:.1f}, ' \
+               'total_ms={:.1f})'.format(self.ok, self.reason, self.wait_ms, self.action_ms, self.post_ms,
+                                         self.total_ms)
+
+
+class ActionExecutor:
+    """
+    Wait for an element, scroll it into view, click and/or type and check a post condition in one
+    execute_async_script call, instead of the find/is_displayed/is_enabled polling plus a separate command.
+    Clicks wait until no other element covers the element's center. Typing goes through the native value
+    setter and input events, so it works with React controlled inputs but does not send real key events.
+    """
+
+    CLICK = 'click'
+    TYPE = 'type'
+    CLEAR_AND_TYPE = 'clear_and_type'
+    CLICK_AND_TYPE = 'click_and_type'
+
+    def __init__(self, dom_wait):
+        """
+        :param dom_wait: DomWait of the page object, shares its driver, in-page poll interval and script timeout
+        """
+        self.dom_wait = dom_wait
+        self.driver = dom_wait.driver
+
+    def perform(self, action, tuple_selector, text=None, post_condition=None,
+                timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS, raise_on_failure=True):
+        """
+        Run an action atomically in the page
+        :param action: CLICK, TYPE, CLEAR_AND_TYPE or CLICK_AND_TYPE
+        :param tuple_selector: tuple selector (By.locator, locator_value)
+        :param text: text to type, None to only click with CLICK_AND_TYPE
+        :param post_condition: optional (DomWait condition, tuple_selector, text) that must hold after the action
+        :param timeout: budget for waiting, acting and the post condition together
+        :param raise_on_failure: raise TimeoutException/WebDriverException instead of returning a failed result
+        :return: ActionResult
+        """
+        post = None
+        if post_condition is not None:
+            condition, post_selector, post_text = post_condition
+            post = {'by': post_selector[0], 'value': post_selector[1], 'condition': condition, 'text': post_text}
+        self.dom_wait.ensure_script_timeout(timeout)
+        result = ActionResult(self.driver.execute_async_script(
+            scripts.PERFORM_ACTION, tuple_selector[0], tuple_selector[1], action, text, post, int(timeout * 1000),
+            self.dom_wait.in_page_poll_ms))
+        if not result.ok and raise_on_failure:
+            message = '{} on {} failed: {}'.format(action, tuple_selector, result.reason)
+            if result.reason.startswith('timeout'):
+                raise TimeoutException(message)
+            raise WebDriverException(message)
+        return result
@@ -0,0 +1,105 @@
+import json
+import math
+import os
+import threading
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.driver.command_tracer import CommandTracer
+
+
+class AdaptiveTimeouts:
+    """
+    Observed wait durations per page object method, condition and locator, kept across runs in a JSON file.
+    A wait asked for with the default timeout gets a high percentile of its history times a safety margin instead,
+    between a floor and a ceiling, so a broken page fails in seconds while waits that are slow but healthy keep
+    their headroom. A wait that times out records its timeout under the key's timeout entry, which widens the next
+    run's budget. Negative checks (is_element_visible() and friends) time out whenever the element is rightly absent,
+    so their timeouts are not recorded; their budget comes from the successful waits for the same condition and
+    locator in any page object method.
+    """
+
+    MAX_SAMPLES = 50
+    TIMED_OUT = ' (timed out)'
+
+    def __init__(self, path=EnvConf.WAIT_TIMINGS_PATH, enabled=EnvConf.ADAPTIVE_TIMEOUTS,
+                 percentile=EnvConf.ADAPTIVE_TIMEOUT_PERCENTILE, margin=EnvConf.ADAPTIVE_TIMEOUT_MARGIN,
+                 floor=EnvConf.ADAPTIVE_TIMEOUT_FLOOR_SECONDS, ceiling=EnvConf.ADAPTIVE_TIMEOUT_CEILING_SECONDS,
+                 min_samples=EnvConf.ADAPTIVE_TIMEOUT_MIN_SAMPLES, default_timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
+        self.path = path
+        self.enabled = enabled
+        self.percentile = percentile
+        self.margin = margin
+        self.floor = floor
+        self.ceiling = ceiling
+        self.min_samples = min_samples
+        self.default_timeout = default_timeout
+        self.samples = None
+        self.new_samples = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(condition, tuple_selector):
+        page_method = CommandTracer.find_callers()[0]
+        return '{} {}'.format(page_method, AdaptiveTimeouts.locator_key(condition, tuple_selector))
+
+    @staticmethod
+    def locator_key(condition, tuple_selector):
+        return '{} {}={}'.format(condition, tuple_selector[0], tuple_selector[1])
+
+    def load(self):
+        with self._lock:
+            if self.samples is None:
+                try:
+                    with open(self.path) as timings_file:
+                        self.samples = json.load(timings_file)
+                except (OSError, ValueError):
+                    self.samples = {}
+        return self.samples
+
+    def timeout_for(self, key, requested, locator_key=None):
+        """
+        :param requested: timeout asked for by the caller, only the default timeout is adapted
+        :param locator_key: for a negative check, derive the timeout from the successful waits of this locator_key
+        :return: (timeout to use, True when it was derived from the history)
+        """
+        if not self.enabled or requested != self.default_timeout:
+            return requested, False
+        stored = self.load()
+        if locator_key is None:
+            samples = stored.get(key, []) + stored.get(key + AdaptiveTimeouts.TIMED_OUT, [])
+        else:
+            suffix = ' ' + locator_key
+            samples = [sample for stored_key, stored_samples in stored.items() if stored_key.endswith(suffix)
+                       for sample in stored_samples]
+        if len(samples) < self.min_samples:
+            return requested, False
+        ordered = sorted(samples)
+        rank = max(int(math.ceil(self.percentile / 100.0 * len(ordered))) - 1, 0)
+        return min(max(ordered[rank] * self.margin, self.floor), self.ceiling), True
+
+    def record(self, key, duration, timed_out=False):
+        if not self.enabled:
+            return
+        if timed_out:
+            key += AdaptiveTimeouts.TIMED_OUT
+        with self._lock:
+            self.new_samples.setdefault(key, []).append(round(duration, 3))
+
+    def merge(self, new_samples):
+        with self._lock:
+            for key, samples in new_samples.items():
+                self.new_samples.setdefault(key, []).extend(samples)
+
+    def save(self):
+        samples = self.load()
+        with self._lock:
+            if not self.new_samples:
+                return
+            for key, new_samples in self.new_samples.items():
+                samples[key] = (samples.get(key, []) + new_samples)[-AdaptiveTimeouts.MAX_SAMPLES:]
+            self.new_samples = {}
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = '{}.{}.tmp'.format(self.path, os.getpid())
+        with open(tmp_path, 'w') as timings_file:
+            json.dump(samples, timings_file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
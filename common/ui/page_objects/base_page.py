@@ -1,18 +1,56 @@
+import asyncio
+import logging
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from urllib.parse import urlparse
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.select import By
 from selenium.webdriver.support.wait import WebDriverWait
 from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.driver.backends.base import DriverBackend
+from common.ui.driver.command_tracer import CommandTracer
+from common.ui.driver.session_lock import SessionLock
+from common.ui.page_objects import scripts
+from common.ui.page_objects.action_executor import ActionExecutor
+from common.ui.page_objects.adaptive_timeouts import AdaptiveTimeouts
+from common.ui.page_objects.dom_wait import DomWait
+from common.ui.page_objects.element_cache import ElementCache
+from common.ui.page_objects.page_readiness import PageReadiness
+from common.ui.page_objects.rendering_speed import RenderingSpeed
+
+LOGGER = logging.getLogger(__name__)
 
 
 class BasePage:
 
+    # Shared by every page object, threads only carry reads issued through submit()/gather()
+    _read_executor = None
+    _read_executor_lock = threading.Lock()
+    # Wait durations learned across runs, shared by every page object
+    wait_timings = AdaptiveTimeouts()
+
     def __init__(self, selenium_webdriver):
         self.driver = selenium_webdriver
+        self.element_cache = ElementCache(selenium_webdriver, EnvConf.ELEMENT_CACHE)
+        # Per thread, like the reads issued through gather()
+        self._negative_checks = threading.local()
+        # Drivers created outside create_driver (fake driver fixture, stand-in grid) have no backend and do not record
+        backend = DriverBackend.of(selenium_webdriver)
+        self._records_wait_timings = backend is not None and backend.records_wait_timings
+        self.dom_wait = DomWait(selenium_webdriver)
+        self.action_executor = ActionExecutor(self.dom_wait)
+        self.page_readiness = PageReadiness(selenium_webdriver, self.dom_wait)
+        self.page_readiness.install_tracker()
+        self.rendering_speed = RenderingSpeed(selenium_webdriver)
+        # Drivers without a new document hook get the rendering speed mode after every navigation instead
+        self._apply_rendering_speed = not self.rendering_speed.install()
+        if self._apply_rendering_speed:
+            self.rendering_speed.apply()
 
     def quit(self):
         self.driver.quit()
@@ -21,16 +59,36 @@ class BasePage:
         self.driver.maximize_window()
 
     def visit(self, location='', timeout=EnvConf.PAGE_LOAD_TIMEOUT_SECONDS):
+        self.element_cache.clear()
         self.driver.get(EnvConf.BASE_URL + location)
         self.driver.set_page_load_timeout(timeout)
+        self.settle()
 
     def navigate(self, url):
+        self.element_cache.clear()
         self.driver.get(url)
+        self.settle()
 
     def refresh_page(self):
+        self.element_cache.clear()
         self.driver.refresh()
+        self.settle()
+
+    def settle(self):
+        """
+        Give the app up to READY_TIMEOUT_SECONDS to become ready after a navigation. An app that never goes idle
+        (polling, animations driven by script) is not an error here, the element waits that follow still apply;
+        the timeout is logged as a warning (and recorded as a failed page_ready wait when commands are traced).
+        """
+        if self._apply_rendering_speed:
+            self.rendering_speed.apply()
+        try:
+            self.wait_for_page_ready(EnvConf.READY_TIMEOUT_SECONDS)
+        except TimeoutException as e:
+            LOGGER.warning('Continuing before the page is ready: %s', e.msg)
 
     def click_back_button(self):
+        self.element_cache.clear()
         self.driver.execute_script('window.history.back()')
 
     def delete_all_cookies(self, url):
@@ -94,13 +152,62 @@ class BasePage:
         return element_of_url
 
     # ==========================wait elements===============================================
-    def wait_for_page_ready(self, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
-        wait = WebDriverWait(self.driver, timeout)
-        wait.until(lambda driver: self.driver.execute_script("return document.readyState == 'complete'"))
+    def wait_for_page_ready(self, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS, network_idle_ms=None, dom_idle_ms=None):
+        """
+        Wait until the document is loaded and, with the idle readiness engine, the app stopped sending fetch/XHR
+        requests and mutating the DOM for the given idle windows
+        :param timeout:
+        :param network_idle_ms: defaults to READY_NETWORK_IDLE_MS
+        :param dom_idle_ms: defaults to READY_DOM_IDLE_MS
+        """
+        tracer = CommandTracer.of(self.driver)
+        if tracer is None:
+            return self.page_readiness.until_ready(timeout, network_idle_ms, dom_idle_ms)
+        with tracer.wait_span('page_ready', ('document', 'readyState')):
+            return self.page_readiness.until_ready(timeout, network_idle_ms, dom_idle_ms)
+
+    def wait_until(self, condition, tuple_selector, text=None, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
+        """
+        Wait for a DomWait condition (PRESENT, VISIBLE, INVISIBLE, CLICKABLE, TEXT, VALUE) on the selector.
+        The default timeout is replaced by the one learned for this wait when there is enough history.
+        Inside negative_check() a timeout is an expected answer and is not recorded.
+        """
+        key = BasePage.wait_timings.key(condition, tuple_selector)
+        negative_check = getattr(self._negative_checks, 'active', False)
+        locator_key = AdaptiveTimeouts.locator_key(condition, tuple_selector) if negative_check else None
+        timeout, adapted = BasePage.wait_timings.timeout_for(key, timeout, locator_key)
+        start = time.time()
+        try:
+            tracer = CommandTracer.of(self.driver)
+            if tracer is None:
+                result = self.dom_wait.until(condition, tuple_selector, text, timeout)
+            else:
+                with tracer.wait_span(condition, tuple_selector):
+                    result = self.dom_wait.until(condition, tuple_selector, text, timeout)
+        except TimeoutException as e:
+            if self._records_wait_timings and not negative_check:
+                BasePage.wait_timings.record(key, timeout, timed_out=True)
+            if adapted:
+                raise TimeoutException('{} (adaptive timeout {:.1f}s learned for {})'.format(e.msg, timeout, key))
+            raise
+        if self._records_wait_timings:
+            BasePage.wait_timings.record(key, time.time() - start)
+        return result
+
+    @contextmanager
+    def negative_check(self):
+        """
+        Mark the waits of a boolean check (is_element_visible(), check_displayed() ...), whose timeout is an answer
+        rather than a failure
+        """
+        self._negative_checks.active = True
+        try:
+            yield
+        finally:
+            self._negative_checks.active = False
 
     def wait_for_visibility_of_element(self, by, selector, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.visibility_of_element_located((by, selector)))
+        return self.wait_until(DomWait.VISIBLE, (by, selector), timeout=timeout)
 
     def wait_for_visibility_of_element_by_id(self, selector, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
         return self.wait_for_visibility_of_element(By.ID, selector, timeout)
@@ -112,14 +219,15 @@ class BasePage:
         return self.wait_for_visibility_of_element(By.XPATH, selector, timeout)
 
     def wait_for_text_to_be_present(self, by, selector, text, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.text_to_be_present_in_element((by, selector), text))
+        return self.wait_until(DomWait.TEXT, (by, selector), text, timeout)
 
     def wait_for_element_to_click(self, by, selector, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.element_to_be_clickable((by, selector)))
+        return self.wait_until(DomWait.CLICKABLE, (by, selector), timeout=timeout)
 
-    def click_and_type(self, selector_tuple, text=None):
+    def click_and_type(self, selector_tuple, text=None, in_page=EnvConf.IN_PAGE_ACTIONS):
+        if in_page:
+            post_condition = None if text is None else (DomWait.VALUE, selector_tuple, text)
+            return self.action_executor.perform(ActionExecutor.CLICK_AND_TYPE, selector_tuple, text, post_condition)
         elm = self.wait_for_element_to_be_clickable(selector_tuple)
         actions = ActionChains(self.driver)
         actions.click(elm)
@@ -147,7 +255,8 @@ class BasePage:
 
     def check_displayed(self, by, selector, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
         try:
-            self.wait_for_visibility_of_element(by, selector, timeout)
+            with self.negative_check():
+                self.wait_for_visibility_of_element(by, selector, timeout)
         except TimeoutException:
             return False
         return True
@@ -197,36 +306,31 @@ class BasePage:
         # ---- wait method ------------
 
     def wait_element_exist(self, tuple_selector, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.presence_of_element_located(tuple_selector))
+        return self.wait_until(DomWait.PRESENT, tuple_selector, timeout=timeout)
 
     def wait_for_visibility_of_element_located(self, tuple_selector, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.visibility_of_element_located(tuple_selector))
+        return self.wait_until(DomWait.VISIBLE, tuple_selector, timeout=timeout)
 
     def wait_for_invisibility_of_element_located(self, tuple_selector, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.invisibility_of_element_located(tuple_selector))
+        return self.wait_until(DomWait.INVISIBLE, tuple_selector, timeout=timeout)
 
     def wait_for_text_to_be_present_in_element(self, tuple_selector, text, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.text_to_be_present_in_element(tuple_selector, text))
+        return self.wait_until(DomWait.TEXT, tuple_selector, text, timeout)
 
     def wait_for_element_to_be_clickable(self, tuple_selector, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.element_to_be_clickable(tuple_selector))
+        return self.wait_until(DomWait.CLICKABLE, tuple_selector, timeout=timeout)
 
     def wait_for_text_to_be_present_in_value_of_element(self, tuple_selector, text,
                                                         timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
         """
         An expectation for checking if the given text is present in the element's
         """
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.text_to_be_present_in_element_value(tuple_selector, text))
+        return self.wait_until(DomWait.VALUE, tuple_selector, text, timeout)
 
     def is_text_present_in_element(self, tuple_selector, text, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
         try:
-            self.wait_for_text_to_be_present_in_element(tuple_selector, text, timeout)
+            with self.negative_check():
+                self.wait_for_text_to_be_present_in_element(tuple_selector, text, timeout)
             return True
         except TimeoutException:
             return False
@@ -236,11 +340,44 @@ class BasePage:
         Return result for checking if the given text is present in the element's
         """
         try:
-            self.wait_for_text_to_be_present_in_value_of_element(tuple_selector, text)
+            with self.negative_check():
+                self.wait_for_text_to_be_present_in_value_of_element(tuple_selector, text)
             return True
         except TimeoutException:
             return False
 
+    # ---- cached lookup method ------------
+    def find_cached_element(self, tuple_selector, level=ElementCache.VISIBLE, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
+        """
+        Return the element from the page object's cache, or wait for it and cache it
+        :param tuple_selector: tuple selector (By.locator, locator_value)
+        :param level: ElementCache.PRESENT, VISIBLE or CLICKABLE, the condition the element must satisfy
+        :param timeout:
+        :return:
+        """
+        element = self.element_cache.get(tuple_selector, level)
+        if element is None:
+            if level == ElementCache.CLICKABLE:
+                element = self.wait_for_element_to_be_clickable(tuple_selector, timeout)
+            elif level == ElementCache.VISIBLE:
+                element = self.wait_for_visibility_of_element_located(tuple_selector, timeout)
+            else:
+                element = self.wait_element_exist(tuple_selector, timeout)
+            self.element_cache.put(tuple_selector, element, level)
+        return element
+
+    def act_on_element(self, tuple_selector, action, level=ElementCache.VISIBLE,
+                       timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
+        """
+        Run action(element) on the cached element and retry once with a fresh lookup if the handle went stale
+        """
+        element = self.find_cached_element(tuple_selector, level, timeout)
+        try:
+            return action(element)
+        except StaleElementReferenceException:
+            self.element_cache.invalidate(tuple_selector)
+            return action(self.find_cached_element(tuple_selector, level, timeout))
+
     # ---- check method ------------
     def is_element_selected(self, tuple_selector, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
         element = self.wait_for_visibility_of_element_located(tuple_selector, timeout)
@@ -248,21 +385,24 @@ class BasePage:
 
     def is_element_visible(self, tuple_selector, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
         try:
-            self.wait_for_visibility_of_element_located(tuple_selector, timeout)
+            with self.negative_check():
+                self.wait_for_visibility_of_element_located(tuple_selector, timeout)
             return True
         except TimeoutException:
             return False
 
     def is_element_invisible(self, tuple_selector, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
         try:
-            self.wait_for_invisibility_of_element_located(tuple_selector, timeout)
+            with self.negative_check():
+                self.wait_for_invisibility_of_element_located(tuple_selector, timeout)
             return True
         except TimeoutException:
             return False
 
     def is_element_exist(self, tuple_selector, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
         try:
-            self.wait_element_exist(tuple_selector, timeout)
+            with self.negative_check():
+                self.wait_element_exist(tuple_selector, timeout)
             return True
         except TimeoutException:
             return False
@@ -294,28 +434,49 @@ class BasePage:
         element.click()
 
     def click_element(self, tuple_selector, move_to_element=False, move_to_element_by_script=False,
-                      timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS, by_script=False):
+                      timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS, by_script=False, in_page=EnvConf.IN_PAGE_ACTIONS):
+        if in_page:
+            # The in-page action scrolls the element into view itself
+            return self.action_executor.perform(ActionExecutor.CLICK, tuple_selector, timeout=timeout)
         if move_to_element:
             self.move_to_element(tuple_selector)
         if move_to_element_by_script:
             self.move_to_element(tuple_selector, by_script=True)
-        element = self.wait_for_element_to_be_clickable(tuple_selector, timeout)
-        if by_script:
-            self.driver.execute_script("arguments[0].click();", element)
-            self.driver.execute_script("return arguments[0].style", element)
-        else:
-            element.click()
-
-    def type_text(self, tuple_selector, value=None, tab=None, enter=None):
-        element = self.wait_for_visibility_of_element_located(tuple_selector)
-        if value:
-            element.send_keys(value)
-        if tab:
-            element.send_keys(Keys.TAB)
-        if enter:
-            element.send_keys(Keys.ENTER)
 
-    def clear_and_type_text(self, tuple_selector, value=None, tab=None, enter=None):
+        def click(element):
+            if by_script:
+                self.driver.execute_script("arguments[0].click();", element)
+            else:
+                element.click()
+
+        self.act_on_element(tuple_selector, click, ElementCache.CLICKABLE, timeout)
+
+    def type_text(self, tuple_selector, value=None, tab=None, enter=None, in_page=EnvConf.IN_PAGE_ACTIONS):
+        if in_page and value:
+            self.action_executor.perform(ActionExecutor.TYPE, tuple_selector, value,
+                                         (DomWait.VALUE, tuple_selector, value))
+            if not (tab or enter):
+                return
+            value = None
+
+        def type_keys(element):
+            if value:
+                element.send_keys(value)
+            if tab:
+                element.send_keys(Keys.TAB)
+            if enter:
+                element.send_keys(Keys.ENTER)
+
+        self.act_on_element(tuple_selector, type_keys)
+
+    def clear_and_type_text(self, tuple_selector, value=None, tab=None, enter=None, in_page=EnvConf.IN_PAGE_ACTIONS):
+        if in_page:
+            text = value if value and value != 'None' else ''
+            self.action_executor.perform(ActionExecutor.CLEAR_AND_TYPE, tuple_selector, text,
+                                         (DomWait.VALUE, tuple_selector, text))
+            if tab or enter:
+                self.type_text(tuple_selector, tab=tab, enter=enter, in_page=False)
+            return
         element = self.wait_for_visibility_of_element_located(tuple_selector)
         self.click_element(tuple_selector, move_to_element=True)
         element.clear()
@@ -331,12 +492,66 @@ class BasePage:
         element = self.wait_for_visibility_of_element_located(tuple_selector)
         if clear:
             element.clear()
-            time.sleep(2)
+            self.wait_for_value_of_element(element, '', tuple_selector=tuple_selector)
         else:
             for n in range(0, num):
                 element.send_keys(Keys.BACKSPACE)
                 time.sleep(0.1)
 
+    def clear_text(self, tuple_selector, strategy=EnvConf.CLEAR_TEXT_STRATEGY,
+                   timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
+        """
+        Empty an input and wait until its value is really empty
+        :param tuple_selector: tuple selector (By.locator, locator_value)
+        :param strategy: 'native' sets the value through the native setter and dispatches input/change events,
+                         'select_all' selects the whole text and deletes it in one action chain,
+                         'clear' uses WebElement.clear(), 'backspace' sends one BACKSPACE per character
+        :param timeout:
+        :return:
+        """
+
+        def clear(element):
+            if strategy == 'native':
+                self.driver.execute_script(scripts.SET_NATIVE_VALUE, element, '')
+            elif strategy == 'select_all':
+                select_key = self.get_select_all_modifier_key()
+                ActionChains(self.driver).click(element).key_down(select_key).send_keys('a').key_up(select_key)\
+                    .send_keys(Keys.DELETE).perform()
+            elif strategy == 'clear':
+                element.clear()
+            elif strategy == 'backspace':
+                self.delete_or_clear_text(tuple_selector, len(element.get_attribute('value') or ''))
+            else:
+                raise ValueError("Unsupported clear strategy: {}".format(strategy))
+            self.wait_for_value_of_element(element, '', timeout, tuple_selector)
+
+        self.act_on_element(tuple_selector, clear, timeout=timeout)
+
+    def get_select_all_modifier_key(self):
+        capabilities = self.driver.capabilities
+        platform = (capabilities.get('platformName') or capabilities.get('platform') or '').lower()
+        return Keys.COMMAND if 'mac' in platform else Keys.CONTROL
+
+    def wait_for_value_of_element(self, element, value, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS,
+                                  tuple_selector=None):
+        """
+        Wait until the value of the element is the given one, retrying while a re-render makes the element stale
+        :param tuple_selector: locator the element is looked up again by once it went stale
+        """
+        elements = [element]
+
+        def has_value(driver):
+            try:
+                return elements[0].get_attribute('value') == value
+            except StaleElementReferenceException:
+                if tuple_selector is not None:
+                    elements[0] = driver.find_element(*tuple_selector)
+                raise
+
+        wait = WebDriverWait(self.driver, timeout,
+                             ignored_exceptions=(StaleElementReferenceException, NoSuchElementException))
+        return wait.until(has_value)
+
     def drag_and_drop_between_two_elements(self, tuple_selector_source, tuple_selector_target):
         element_source = self.wait_for_visibility_of_element_located(tuple_selector_source)
         element_target = self.wait_for_visibility_of_element_located(tuple_selector_target)
@@ -355,43 +570,94 @@ class BasePage:
     def get_element_text(self, tuple_selector, move_to_element=False, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
         if move_to_element:
             self.move_to_element(tuple_selector)
-        element = self.wait_for_visibility_of_element_located(tuple_selector, timeout)
-
-        return element.text
+        return self.act_on_element(tuple_selector, lambda element: element.text, timeout=timeout)
 
     def get_moved_elements_text(self, tuple_selector, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
-        wait = WebDriverWait(self.driver, timeout)
-        elements = wait.until(EC.presence_of_all_elements_located(tuple_selector))
-        result = []
-        for e in elements:
-            actions = ActionChains(self.driver)
-            actions.move_to_element(e)
-            actions.perform()
-            result.append(e.text)
-        return result
+        elements_data = self.get_elements_data(tuple_selector, scroll_into_view=True, timeout=timeout)
+        return [data['text'] for data in elements_data]
 
     def get_text_of_elements(self, tuple_selector, move_to_element=False, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
-        wait = WebDriverWait(self.driver, timeout)
-        elements = wait.until(EC.presence_of_all_elements_located(tuple_selector))
-        if not move_to_element:
-            return self.get_text_list(elements)
-        text_list = []
-        for e in elements:
-            ActionChains(self.driver).move_to_element(e).perform()
-            text_list.append(str(e.text))
-        return text_list
+        elements_data = self.get_elements_data(tuple_selector, scroll_into_view=move_to_element, timeout=timeout)
+        return [data['text'] for data in elements_data]
 
     @staticmethod
     def get_text_list(list_data):
         """
         Get names of a list
-        :param list_data:
+        :param list_data: list of WebElement, read in a single script call
         :return:
         """
-        name_list = []
-        for item in list_data:
-            name_list.append(item.text)
-        return name_list
+        if not list_data:
+            return []
+        driver = list_data[0].parent
+        return [data['text'] for data in driver.execute_script(scripts.SNAPSHOT_ELEMENTS, list_data, [], False)]
+
+    def find_elements_data(self, tuple_selector, attributes=(), scroll_into_view=False):
+        """
+        Get text, visibility and the given attributes of every element matching the selector in one script call
+        :param tuple_selector: tuple selector (By.locator, locator_value)
+        :param attributes: names of attributes to read
+        :param scroll_into_view: scroll each element into view before reading it (lazily rendered content)
+        :return: list of dict {'text': str, 'visible': bool, 'attributes': {name: value}}, empty if nothing matches
+        """
+        return self.driver.execute_script(scripts.SNAPSHOT_ELEMENTS_BY_LOCATOR, tuple_selector[0], tuple_selector[1],
+                                          list(attributes), scroll_into_view)
+
+    def get_elements_data(self, tuple_selector, attributes=(), scroll_into_view=False,
+                          timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
+        """
+        Same as find_elements_data but wait until at least one element is present.
+        Every poll is a single script call that returns the data as soon as it is available.
+        """
+        wait = WebDriverWait(self.driver, timeout)
+        return wait.until(lambda driver: self.find_elements_data(tuple_selector, attributes, scroll_into_view))
+
+    def iter_elements_data(self, tuple_selector, chunk_size=EnvConf.STREAM_CHUNK_SIZE, attributes=(),
+                           key_attribute=None, container=None, next_page=None, settle_ms=EnvConf.STREAM_SETTLE_MS):
+        """
+        Stream the data of every element matching the selector in chunks, including the ones a virtualized or
+        lazily rendered list only creates once they are scrolled to. Each element is returned once, deduplicated
+        by its key in the page, and only one chunk is held in memory. Without a key_attribute the key is the text plus
+        its occurrence among the matches, which holds for lists that keep the entries they rendered; a virtualized
+        list that removes scrolled-out entries needs a key_attribute.
+        :param tuple_selector: tuple selector (By.locator, locator_value)
+        :param chunk_size: number of entries per chunk, the last one can be smaller
+        :param attributes: names of attributes to read
+        :param key_attribute: attribute that identifies an entry, its text and occurrence when None
+        :param container: tuple selector of the scrolled element, the scroll parent of the last match when None
+        :param next_page: tuple selector of a "next page" control clicked instead of scrolling
+        :param settle_ms: how long to wait for new entries to render after each scroll or page
+        :return: generator of lists of dict {'key': str, 'text': str, 'visible': bool, 'attributes': {name: value}}
+        """
+        stream_id = uuid.uuid4().hex
+        self.dom_wait.ensure_script_timeout(settle_ms / 1000.0)
+        chunk = []
+        empty_rounds = 0
+        try:
+            while empty_rounds < EnvConf.STREAM_MAX_EMPTY_ROUNDS:
+                result = self.driver.execute_async_script(
+                    scripts.STREAM_ELEMENTS, tuple_selector[0], tuple_selector[1], list(attributes), key_attribute,
+                    chunk_size, stream_id, list(container) if container else None,
+                    list(next_page) if next_page else None, settle_ms)
+                chunk.extend(result['entries'])
+                while len(chunk) >= chunk_size:
+                    yield chunk[:chunk_size]
+                    chunk = chunk[chunk_size:]
+                if result['done']:
+                    break
+                # A scroll or page that renders nothing new, the list may still be loading
+                empty_rounds = 0 if result['entries'] else empty_rounds + 1
+            if chunk:
+                yield chunk
+        finally:
+            self.driver.execute_script(scripts.END_STREAM, stream_id)
+
+    def count_elements(self, tuple_selector, key_attribute=None, container=None, next_page=None):
+        """
+        Count the elements matching the selector through iter_elements_data, scrolling through the whole list
+        """
+        return sum(len(chunk) for chunk in self.iter_elements_data(tuple_selector, key_attribute=key_attribute,
+                                                                   container=container, next_page=next_page))
 
     def get_attribute_of_element(self, tuple_selector, attribute, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS,
                                  move_to_element=False):
@@ -406,8 +672,8 @@ class BasePage:
         """
         if move_to_element:
             self.move_to_element(tuple_selector)
-        element = self.wait_element_exist(tuple_selector, timeout)
-        return element.get_attribute(attribute)
+        return self.act_on_element(tuple_selector, lambda element: element.get_attribute(attribute),
+                                   ElementCache.PRESENT, timeout)
 
     def get_value_of_css_property(self, tuple_selector, attribute_name, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS,
                                   move_to_element=False):
@@ -471,3 +737,43 @@ class BasePage:
 
     def switch_to_default_frame(self):
         self.driver.switch_to.default_content()
+
+    # ==========================concurrent reads===============================================
+    @classmethod
+    def read_executor(cls):
+        with cls._read_executor_lock:
+            if cls._read_executor is None:
+                cls._read_executor = ThreadPoolExecutor(max_workers=EnvConf.CONCURRENT_READ_WORKERS,
+                                                        thread_name_prefix='page-reads')
+            return cls._read_executor
+
+    def submit(self, read, *args, **kwargs):
+        """
+        Run a read or wait helper on a background thread and return its Future.
+        Commands of all threads go through one lock on the driver session, so what overlaps is the time spent
+        between polls and in Python, never two commands in the browser. An in-page wait (WAIT_ENGINE=event) is a
+        single command that holds the lock until it returns, so gathered in-page waits run one after another; only
+        reads and WAIT_ENGINE=poll waits gain from running together.
+        :param read: callable, usually a bound page object method, e.g. self.get_element_text
+        :param args: arguments of the read
+        :return: concurrent.futures.Future
+        """
+        SessionLock.attach(self.driver)
+        return BasePage.read_executor().submit(read, *args, **kwargs)
+
+    def gather(self, *reads, timeout=None):
+        """
+        Issue independent reads together and wait for all of them
+        :param reads: callables without arguments, e.g. self.get_created_lists or functools.partial(...)
+        :param timeout: seconds to wait for the whole group, None waits until every read has finished
+        :return: list of results in the order of reads, the first failed read raises its exception
+        """
+        futures = [self.submit(read) for read in reads]
+        wait(futures, timeout)
+        return [future.result(timeout=0) for future in futures]
+
+    async def gather_async(self, *reads):
+        """
+        asyncio variant of gather(): await page.gather_async(page.get_created_lists, page.get_number_of_unit)
+        """
+        return list(await asyncio.gather(*(asyncio.wrap_future(self.submit(read)) for read in reads)))
@@ -0,0 +1,84 @@
+import time
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.wait import WebDriverWait
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.page_objects import scripts
+
+
+class DomWait:
+    """
+    Wait for an element condition inside the page.
+    The condition is registered with execute_async_script and re-evaluated by a MutationObserver, so the wait
+    returns as soon as the DOM satisfies it instead of on the next WebDriverWait poll.
+    With engine='poll', or when the page unloads while waiting, it falls back to WebDriverWait polling.
+    """
+
+    PRESENT = 'present'
+    VISIBLE = 'visible'
+    INVISIBLE = 'invisible'
+    CLICKABLE = 'clickable'
+    TEXT = 'text'
+    VALUE = 'value'
+
+    EXPECTED_CONDITIONS = {
+        PRESENT: lambda tuple_selector, text: EC.presence_of_element_located(tuple_selector),
+        VISIBLE: lambda tuple_selector, text: EC.visibility_of_element_located(tuple_selector),
+        INVISIBLE: lambda tuple_selector, text: EC.invisibility_of_element_located(tuple_selector),
+        CLICKABLE: lambda tuple_selector, text: EC.element_to_be_clickable(tuple_selector),
+        TEXT: lambda tuple_selector, text: EC.text_to_be_present_in_element(tuple_selector, text),
+        VALUE: lambda tuple_selector, text: EC.text_to_be_present_in_element_value(tuple_selector, text),
+    }
+
+    # Extra seconds given to the driver script timeout so the in-page timer always fires first
+    SCRIPT_TIMEOUT_MARGIN_SECONDS = 5
+
+    def __init__(self, driver, engine=EnvConf.WAIT_ENGINE, poll_seconds=EnvConf.WAIT_POLL_SECONDS,
+                 in_page_poll_ms=EnvConf.WAIT_IN_PAGE_POLL_MS):
+        self.driver = driver
+        self.engine = engine
+        self.poll_seconds = poll_seconds
+        self.in_page_poll_ms = in_page_poll_ms
+
+    def until(self, condition, tuple_selector, text=None, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
+        """
+        Wait until the condition holds for the first element matching the selector
+        :param condition: one of PRESENT, VISIBLE, INVISIBLE, CLICKABLE, TEXT, VALUE
+        :param tuple_selector: tuple selector (By.locator, locator_value)
+        :param text: expected text for TEXT and VALUE
+        :param timeout:
+        :return: the element for PRESENT, VISIBLE and CLICKABLE, True otherwise, like the expected_conditions
+        :raise TimeoutException: when the condition is not met in time
+        """
+        deadline = time.time() + timeout
+        if self.engine == 'event':
+            try:
+                return self._until_in_page(condition, tuple_selector, text, timeout)
+            except JavascriptException:
+                # Page navigated or blocked the script, poll for the remaining time
+                pass
+        return self._until_polling(condition, tuple_selector, text, max(deadline - time.time(), 0))
+
+    def _until_in_page(self, condition, tuple_selector, text, timeout):
+        self.ensure_script_timeout(timeout)
+        result = self.driver.execute_async_script(scripts.WAIT_FOR_CONDITION, tuple_selector[0], tuple_selector[1],
+                                                  condition, text, int(timeout * 1000), self.in_page_poll_ms)
+        if not result:
+            raise TimeoutException('Condition {} not met for {} after {} seconds'.format(
+                condition, tuple_selector, timeout))
+        return result
+
+    def _until_polling(self, condition, tuple_selector, text, timeout):
+        wait = WebDriverWait(self.driver, timeout, poll_frequency=self.poll_seconds)
+        return wait.until(DomWait.EXPECTED_CONDITIONS[condition](tuple_selector, text))
+
+    def ensure_script_timeout(self, timeout):
+        # The session has one script timeout, kept on the driver so page objects sharing it (or the next test of a
+        # pooled driver) never lower it below what another one relies on
+        required = timeout + DomWait.SCRIPT_TIMEOUT_MARGIN_SECONDS
+        current = getattr(self.driver, 'script_timeout_seconds', None)
+        if current is None or current < required:
+            self.driver.set_script_timeout(required)
+            self.driver.script_timeout_seconds = required
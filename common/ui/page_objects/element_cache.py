@@ -0,0 +1,72 @@
+import threading
+
+from selenium.common.exceptions import WebDriverException
+
+from common.ui.page_objects import scripts
+
+
+class ElementCache:
+    """
+    Resolved element handles of one page object, keyed by tuple selector.
+    An entry is valid while the DOM generation counter kept by an injected MutationObserver is unchanged.
+    The generation is read by the lookup script itself, so a hit costs one script call instead of a find plus the
+    displayed/enabled checks of a wait, and a miss resolves the element in that same call.
+    A new document (navigation) resets the counter and drops every entry.
+    """
+
+    PRESENT = 0
+    VISIBLE = 1
+    CLICKABLE = 2
+
+    # checkCondition names of the levels
+    CONDITIONS = {PRESENT: 'present', VISIBLE: 'visible', CLICKABLE: 'clickable'}
+
+    def __init__(self, driver, enabled=True):
+        self.driver = driver
+        self.enabled = enabled
+        self._entries = {}
+        # The generation read last, per thread, so concurrent reads (BasePage.gather) do not tag each other's entries
+        self._reads = threading.local()
+
+    def get(self, tuple_selector, level):
+        """
+        Return the cached element for the selector when it was resolved at least at the given level
+        (PRESENT, VISIBLE or CLICKABLE) and the DOM did not change since, otherwise the element resolved by the same
+        script call, or None when no element satisfies the level yet
+        """
+        if not self.enabled:
+            return None
+        key = tuple(tuple_selector)
+        entry = self._entries.get(key)
+        cached_generation = entry[2] if entry is not None and entry[1] >= level else None
+        try:
+            result = self.driver.execute_script(scripts.LOOKUP_ELEMENT, tuple_selector[0], tuple_selector[1],
+                                                ElementCache.CONDITIONS[level], cached_generation)
+        except WebDriverException:
+            # Without a generation nothing can be validated, the wait that follows is not cached either
+            self.clear()
+            return None
+        generation = result['generation']
+        if generation == -1:
+            self.clear()
+            generation = 0
+        self._reads.generation = generation
+        if cached_generation is not None and generation == cached_generation:
+            return entry[0]
+        element = result['element']
+        if element is not None:
+            self._entries[key] = (element, level, generation)
+        return element
+
+    def put(self, tuple_selector, element, level):
+        # The generation read by the preceding get() is older than the lookup, which keeps the entry conservative
+        generation = getattr(self._reads, 'generation', None)
+        if self.enabled and generation is not None:
+            self._entries[tuple(tuple_selector)] = (element, level, generation)
+
+    def invalidate(self, tuple_selector):
+        self._entries.pop(tuple(tuple_selector), None)
+
+    def clear(self):
+        self._entries.clear()
+        self._reads.generation = None
@@ -1,3 +1,4 @@
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
 from common.ui.page_objects.base_page import BasePage
 from selenium.webdriver.common.by import By
 
@@ -14,9 +15,26 @@ class HomePage(BasePage):
         self.click_element(HomePage.COOKIES_ACCEPT_BTN)
         return self
 
+    def open_accepting_cookies(self):
+        self.visit()
+        return self.accept_cookie_warning()
+
+    def open_default_list(self):
+        return self.click_list(self.get_created_list_names()[0])
+
     def get_created_lists(self):
         return self.find_elements(HomePage.CREATED_LISTS)
 
+    def iter_created_list_names(self, chunk_size=EnvConf.STREAM_CHUNK_SIZE):
+        """
+        Stream the names of the created lists in chunks, for accounts with more lists than the page renders at once
+        """
+        for chunk in self.iter_elements_data(HomePage.CREATED_LISTS, chunk_size):
+            yield [data['text'] for data in chunk]
+
+    def get_created_list_names(self):
+        return [data['text'] for data in self.find_elements_data(HomePage.CREATED_LISTS)]
+
     def click_list(self, list_name):
         list_selector = HomePage.LIST_BY_TEXT
         self.click_element((list_selector[0], list_selector[1].format(list_name=list_name)))
@@ -27,3 +45,16 @@ class HomePage(BasePage):
 
     def get_list_unit_entries(self):
         return self.find_elements(HomePage.UNIT_ENTRY)
+
+    def iter_list_unit_entries(self, chunk_size=EnvConf.STREAM_CHUNK_SIZE):
+        """
+        Stream the unit entry names in chunks, scrolling the list so lazily rendered entries are included
+        """
+        for chunk in self.iter_elements_data(HomePage.UNIT_ENTRY, chunk_size):
+            yield [data['text'] for data in chunk]
+
+    def count_list_unit_entries(self):
+        """
+        Number of unit entries of the whole list, to verify get_number_of_unit against without holding the entries
+        """
+        return self.count_elements(HomePage.UNIT_ENTRY)
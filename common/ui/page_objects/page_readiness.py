@@ -0,0 +1,68 @@
+from selenium.common.exceptions import JavascriptException, TimeoutException, WebDriverException
+from selenium.webdriver.support.wait import WebDriverWait
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.page_objects import scripts
+
+
+class PageReadiness:
+    """
+    Decide when a single-page app is ready: the document is loaded, no fetch/XHR request has been in flight for a
+    network idle window and the DOM has not mutated for a DOM idle window. The request tracker is registered with
+    Page.addScriptToEvaluateOnNewDocument on Chrome so it also sees the requests the app sends while it boots;
+    other drivers get it injected by the wait itself. With engine='load' only document.readyState is checked.
+    """
+
+    IDLE = 'idle'
+    LOAD = 'load'
+
+    def __init__(self, driver, dom_wait, engine=EnvConf.READINESS_ENGINE,
+                 network_idle_ms=EnvConf.READY_NETWORK_IDLE_MS, dom_idle_ms=EnvConf.READY_DOM_IDLE_MS):
+        self.driver = driver
+        self.dom_wait = dom_wait
+        self.engine = engine
+        self.network_idle_ms = network_idle_ms
+        self.dom_idle_ms = dom_idle_ms
+
+    def install_tracker(self):
+        """
+        Register the request tracker for every document the driver loads from now on, once per driver
+        """
+        if getattr(self.driver, 'network_tracker_installed', False) or not hasattr(self.driver, 'execute_cdp_cmd'):
+            return
+        try:
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': scripts.NETWORK_TRACKER})
+        except WebDriverException:
+            # Not a Chromium based driver after all, the wait injects the tracker itself
+            pass
+        self.driver.network_tracker_installed = True
+
+    def until_ready(self, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS, network_idle_ms=None, dom_idle_ms=None):
+        """
+        Wait until the page is ready
+        :param timeout:
+        :param network_idle_ms: quiet period without fetch/XHR in flight, defaults to READY_NETWORK_IDLE_MS
+        :param dom_idle_ms: quiet period without DOM mutations, defaults to READY_DOM_IDLE_MS
+        :return: {'idle': True, 'waitMs': ..., 'inflight': 0} (or {'idle': True} for engine='load')
+        :raise TimeoutException: when the page is not ready in time
+        """
+        if self.engine == PageReadiness.IDLE:
+            network_idle_ms = self.network_idle_ms if network_idle_ms is None else network_idle_ms
+            dom_idle_ms = self.dom_idle_ms if dom_idle_ms is None else dom_idle_ms
+            try:
+                return self._until_idle(timeout, network_idle_ms, dom_idle_ms)
+            except JavascriptException:
+                # The document was replaced while waiting, fall back to the load state of the new one
+                pass
+        WebDriverWait(self.driver, timeout).until(
+            lambda driver: driver.execute_script("return document.readyState == 'complete'"))
+        return {'idle': True}
+
+    def _until_idle(self, timeout, network_idle_ms, dom_idle_ms):
+        self.dom_wait.ensure_script_timeout(timeout)
+        result = self.driver.execute_async_script(scripts.WAIT_FOR_IDLE, network_idle_ms, dom_idle_ms,
+                                                  int(timeout * 1000))
+        if not result['idle']:
+            raise TimeoutException('Page not idle after {} seconds, {} requests in flight'.format(
+                timeout, result['inflight']))
+        return result
@@ -0,0 +1,57 @@
+import json
+
+from selenium.common.exceptions import WebDriverException
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.page_objects import scripts
+
+
+class RenderingSpeed:
+    """
+    Rendering speed mode: no CSS transitions or animations, instant smooth scrolling and, with fast timers, shortened
+    page setTimeout delays, so visibility and clickability waits resolve as soon as the DOM is in place instead of
+    after a fade or slide. On Chrome it is registered with Page.addScriptToEvaluateOnNewDocument and covers every
+    document from its first script on; other drivers get it applied to the current document by the page objects.
+    """
+
+    def __init__(self, driver, enabled=EnvConf.FREEZE_ANIMATIONS, fast_timers=EnvConf.FAST_TIMERS,
+                 timer_factor=EnvConf.FAST_TIMER_FACTOR, timer_max_ms=EnvConf.FAST_TIMER_MAX_MS):
+        """
+        :param fast_timers: shorten setTimeout delays of the page, only safe for apps whose timers are UI delays
+        :param timer_factor: share of the delay a shortened timer waits
+        :param timer_max_ms: longer delays (polling, session timeouts) are kept as they are
+        """
+        self.driver = driver
+        self.enabled = enabled
+        self.config = {'fastTimers': fast_timers, 'timerFactor': timer_factor, 'timerMaxMs': timer_max_ms}
+
+    def install(self):
+        """
+        Register the mode for every document the driver loads from now on, once per driver
+        :return: True when every new document gets it, False when it has to be applied per document
+        """
+        if not self.enabled:
+            return True
+        if getattr(self.driver, 'rendering_speed_installed', None) is None:
+            installed = False
+            if hasattr(self.driver, 'execute_cdp_cmd'):
+                source = '{}({});'.format(scripts.FREEZE_RENDERING_FUNCTION.strip(), json.dumps(self.config))
+                try:
+                    self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': source})
+                    installed = True
+                except WebDriverException:
+                    pass
+            self.driver.rendering_speed_installed = installed
+        return self.driver.rendering_speed_installed
+
+    def apply(self):
+        """
+        Apply the mode to the current document, a no-op for documents that already have it
+        """
+        if not self.enabled:
+            return
+        try:
+            self.driver.execute_script(scripts.FREEZE_RENDERING, self.config)
+        except WebDriverException:
+            # The document is being replaced, the next navigation applies it again
+            pass
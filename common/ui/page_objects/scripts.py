@@ -0,0 +1,563 @@
+"""
+JavaScript snippets executed in the page by BasePage.
+Locators are passed as (by, value) using the Selenium By strings so one script call can resolve them in the page.
+"""
+
+# Timers of the wait scripts keep their real length when EnvConf.FREEZE_ANIMATIONS with FAST_TIMERS shortens the
+# page's timers
+NATIVE_TIMERS = """
+var setTimeout = window.__uiNativeSetTimeout || window.setTimeout;
+"""
+
+FIND_ELEMENTS_FUNCTION = """
+function findElements(by, value, root) {
+    root = root || document;
+    var nodes = [], i;
+    switch (by) {
+        case 'css selector':
+            return Array.prototype.slice.call(root.querySelectorAll(value));
+        case 'id':
+            return Array.prototype.slice.call(root.querySelectorAll('[id="' + value.replace(/"/g, '\\\\"') + '"]'));
+        case 'name':
+            return Array.prototype.slice.call(root.querySelectorAll('[name="' + value.replace(/"/g, '\\\\"') + '"]'));
+        case 'class name':
+            return Array.prototype.slice.call(root.getElementsByClassName(value));
+        case 'tag name':
+            return Array.prototype.slice.call(root.getElementsByTagName(value));
+        case 'xpath':
+            var snapshot = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (i = 0; i < snapshot.snapshotLength; i++) { nodes.push(snapshot.snapshotItem(i)); }
+            return nodes;
+        case 'link text':
+        case 'partial link text':
+            var links = root.getElementsByTagName('a');
+            for (i = 0; i < links.length; i++) {
+                var linkText = (links[i].innerText || links[i].textContent).trim();
+                if (by === 'link text' ? linkText === value : linkText.indexOf(value) !== -1) { nodes.push(links[i]); }
+            }
+            return nodes;
+    }
+    throw new Error('Unsupported locator strategy: ' + by);
+}
+"""
+
+# Opacity is not inherited, so a transparent ancestor hides the element while its own computed style says otherwise
+IS_VISIBLE_FUNCTION = """
+function isVisible(el) {
+    if (!el.isConnected) { return false; }
+    for (var node = el; node && node.nodeType === 1; node = node.parentElement) {
+        var style = window.getComputedStyle(node);
+        if (style.display === 'none' || style.visibility === 'hidden' || style.visibility === 'collapse'
+                || style.opacity === '0') { return false; }
+    }
+    return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+}
+"""
+
+SNAPSHOT_ELEMENT_FUNCTION = """
+function snapshotElement(el, attributes, scroll) {
+    if (scroll) { el.scrollIntoView(true); }
+    var visible = isVisible(el);
+    var data = {text: visible ? (el.innerText || '').trim() : '', visible: visible, attributes: {}};
+    for (var i = 0; i < attributes.length; i++) { data.attributes[attributes[i]] = el.getAttribute(attributes[i]); }
+    return data;
+}
+"""
+
+# arguments: by, value, attributes, scroll -> [{text, visible, attributes}]
+SNAPSHOT_ELEMENTS_BY_LOCATOR = FIND_ELEMENTS_FUNCTION + IS_VISIBLE_FUNCTION + SNAPSHOT_ELEMENT_FUNCTION + """
+var attributes = arguments[2] || [], scroll = arguments[3];
+return findElements(arguments[0], arguments[1]).map(function (el) { return snapshotElement(el, attributes, scroll); });
+"""
+
+# arguments: elements, attributes, scroll -> [{text, visible, attributes}]
+SNAPSHOT_ELEMENTS = IS_VISIBLE_FUNCTION + SNAPSHOT_ELEMENT_FUNCTION + """
+var attributes = arguments[1] || [], scroll = arguments[2];
+return arguments[0].map(function (el) { return snapshotElement(el, attributes, scroll); });
+"""
+
+# arguments: element, value -> new value
+# Uses the native value setter so React controlled inputs pick the change up from the input event
+SET_NATIVE_VALUE_FUNCTION = """
+function setNativeValue(el, value) {
+    var proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    return el.value;
+}
+"""
+
+SET_NATIVE_VALUE = SET_NATIVE_VALUE_FUNCTION + """
+return setNativeValue(arguments[0], arguments[1]);
+"""
+
+# -> DOM generation, or -1 when the observer had to be installed (new document)
+# The generation increases on every structural or visibility related mutation of the document
+DOM_GENERATION_FUNCTION = """
+function domGeneration() {
+    if (window.__uiDomGeneration === undefined) {
+        window.__uiDomGeneration = 0;
+        new MutationObserver(function () { window.__uiDomGeneration++; }).observe(document, {
+            childList: true, subtree: true, attributes: true,
+            attributeFilter: ['class', 'style', 'hidden', 'disabled']
+        });
+        return -1;
+    }
+    return window.__uiDomGeneration;
+}
+"""
+
+CHECK_CONDITION_FUNCTION = """
+function checkCondition(by, value, condition, text) {
+    var el = findElements(by, value)[0];
+    switch (condition) {
+        case 'present':
+            return el || null;
+        case 'visible':
+            return el && isVisible(el) ? el : null;
+        case 'invisible':
+            return !el || !isVisible(el);
+        case 'clickable':
+            return el && isVisible(el) && !el.disabled && el.getAttribute('aria-disabled') !== 'true'
+                && window.getComputedStyle(el).pointerEvents !== 'none' ? el : null;
+        case 'text':
+            return !!el && (el.innerText || '').indexOf(text) !== -1;
+        case 'value':
+            return !!el && el.value !== undefined && el.value !== null && String(el.value).indexOf(text) !== -1;
+    }
+    throw new Error('Unsupported wait condition: ' + condition);
+}
+"""
+
+# async arguments: by, value, condition, text, timeout_ms, poll_ms -> element/true when satisfied, null on timeout
+# Re-evaluates on every DOM mutation and input event; the interval catches pure CSS changes (transitions)
+WAIT_FOR_CONDITION = NATIVE_TIMERS + FIND_ELEMENTS_FUNCTION + IS_VISIBLE_FUNCTION + CHECK_CONDITION_FUNCTION + """
+var by = arguments[0], value = arguments[1], condition = arguments[2], text = arguments[3];
+var timeoutMs = arguments[4], pollMs = arguments[5], done = arguments[arguments.length - 1];
+var initial = checkCondition(by, value, condition, text);
+if (initial) { done(initial); return; }
+var finished = false, observer, timer, poller;
+function finish(result) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    if (poller) { clearInterval(poller); }
+    document.removeEventListener('input', evaluate, true);
+    done(result);
+}
+function evaluate() {
+    var result = checkCondition(by, value, condition, text);
+    if (result) { finish(result); }
+}
+observer = new MutationObserver(evaluate);
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+document.addEventListener('input', evaluate, true);
+poller = pollMs > 0 ? setInterval(evaluate, pollMs) : null;
+timer = setTimeout(function () { finish(null); }, timeoutMs);
+"""
+
+# arguments: by, value, condition, cached_generation -> {generation, element}
+# generation is -1 when the observer had to be installed (new document). When it equals cached_generation the cached
+# handle is still valid and nothing is looked up, otherwise element is the first match satisfying the condition
+# (present, visible or clickable) or null, so a cache miss needs no round trip besides the lookup itself
+LOOKUP_ELEMENT = FIND_ELEMENTS_FUNCTION + IS_VISIBLE_FUNCTION + CHECK_CONDITION_FUNCTION + DOM_GENERATION_FUNCTION + """
+var generation = domGeneration();
+if (generation !== -1 && generation === arguments[3]) { return {generation: generation, element: null}; }
+return {generation: generation, element: checkCondition(arguments[0], arguments[1], arguments[2], null)};
+"""
+
+IS_OBSCURED_FUNCTION = """
+function isObscured(el) {
+    var rect = el.getBoundingClientRect();
+    var top = document.elementFromPoint(rect.left + rect.width / 2, rect.top + rect.height / 2);
+    return !!top && top !== el && !el.contains(top) && !(el.control && el.control === top) &&
+        !(top.control && top.control === el);
+}
+"""
+
+# async arguments: by, value, action, text, post_condition, timeout_ms, poll_ms
+# action is click, type, clear_and_type or click_and_type; post_condition is null or {by, value, condition, text}
+# -> {ok, reason, waitMs, actionMs, postMs, totalMs}
+PERFORM_ACTION = (NATIVE_TIMERS + FIND_ELEMENTS_FUNCTION + IS_VISIBLE_FUNCTION + CHECK_CONDITION_FUNCTION +
+                  SET_NATIVE_VALUE_FUNCTION + IS_OBSCURED_FUNCTION + """
+var by = arguments[0], value = arguments[1], action = arguments[2], text = arguments[3], post = arguments[4];
+var timeoutMs = arguments[5], pollMs = arguments[6], done = arguments[arguments.length - 1];
+var clicks = action === 'click' || action === 'click_and_type';
+var start = performance.now(), phase = 'wait', lastReason = 'element not found';
+var result = {ok: false, reason: null, waitMs: 0, actionMs: 0, postMs: 0, totalMs: 0};
+var finished = false, observer, timer, poller;
+function finish(ok, reason) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    if (poller) { clearInterval(poller); }
+    document.removeEventListener('input', evaluate, true);
+    result.ok = ok;
+    result.reason = reason;
+    result.totalMs = performance.now() - start;
+    if (phase === 'post') { result.postMs = result.totalMs - result.waitMs - result.actionMs; }
+    done(result);
+}
+function act() {
+    var el = checkCondition(by, value, clicks ? 'clickable' : 'visible', null);
+    if (!el) {
+        lastReason = findElements(by, value).length ? 'element not ' + (clicks ? 'clickable' : 'visible') :
+            'element not found';
+        return false;
+    }
+    el.scrollIntoView({block: 'center'});
+    if (clicks && isObscured(el)) { lastReason = 'element obscured by another element'; return false; }
+    result.waitMs = performance.now() - start;
+    if (clicks) { el.click(); }
+    // click_and_type without text only clicks, typing nothing would still fire input and change events
+    if (action !== 'click' && text !== null && text !== undefined) {
+        el.focus();
+        setNativeValue(el, (action === 'clear_and_type' ? '' : el.value) + text);
+    }
+    result.actionMs = performance.now() - start - result.waitMs;
+    phase = 'post';
+    return true;
+}
+function evaluate() {
+    try {
+        if (phase === 'wait' && !act()) { return; }
+        if (!post || checkCondition(post.by, post.value, post.condition, post.text)) { finish(true, null); }
+    } catch (e) {
+        finish(false, phase + ' failed: ' + e.message);
+    }
+}
+observer = new MutationObserver(evaluate);
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+document.addEventListener('input', evaluate, true);
+poller = pollMs > 0 ? setInterval(evaluate, pollMs) : null;
+timer = setTimeout(function () {
+    finish(false, 'timeout: ' + (phase === 'wait' ? lastReason : 'post condition ' + post.condition + ' not met'));
+}, timeoutMs);
+evaluate();
+""")
+
+# Counts fetch/XHR requests in flight in window.__uiNetwork. Installed before the app's own scripts through
+# Page.addScriptToEvaluateOnNewDocument where the driver supports it, otherwise late by WAIT_FOR_IDLE itself
+NETWORK_TRACKER = """
+(function () {
+    if (window.__uiNetwork) { return; }
+    // Injected after the app booted, the last fetch/XHR the browser already finished is the last change
+    var origin = performance.timeOrigin || performance.timing.navigationStart, lastChange = origin;
+    performance.getEntriesByType('resource').forEach(function (entry) {
+        if (entry.initiatorType === 'fetch' || entry.initiatorType === 'xmlhttprequest') {
+            lastChange = Math.max(lastChange, origin + entry.responseEnd);
+        }
+    });
+    var network = window.__uiNetwork = {inflight: 0, lastChange: lastChange};
+    function started() { network.inflight++; network.lastChange = Date.now(); }
+    function ended() { network.inflight = Math.max(network.inflight - 1, 0); network.lastChange = Date.now(); }
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            started();
+            return fetch.apply(this, arguments).then(function (response) { ended(); return response; },
+                function (error) { ended(); throw error; });
+        };
+    }
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        started();
+        this.addEventListener('loadend', ended);
+        return send.apply(this, arguments);
+    };
+})();
+"""
+
+# async arguments: network_idle_ms, dom_idle_ms, timeout_ms
+# -> {idle, waitMs, inflight} once the document is loaded, no fetch/XHR has been in flight for network_idle_ms
+# and the DOM has not mutated for dom_idle_ms; idle is false when timeout_ms passes first
+WAIT_FOR_IDLE = NATIVE_TIMERS + NETWORK_TRACKER + """
+var networkIdleMs = arguments[0], domIdleMs = arguments[1], timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+var start = Date.now(), lastMutation = start, network = window.__uiNetwork, poller, timer;
+var observer = new MutationObserver(function () { lastMutation = Date.now(); });
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+function finish(idle) {
+    observer.disconnect();
+    clearInterval(poller);
+    clearTimeout(timer);
+    done({idle: idle, waitMs: Date.now() - start, inflight: network.inflight});
+}
+function evaluate() {
+    var now = Date.now();
+    if (document.readyState === 'complete' && network.inflight === 0 && now - network.lastChange >= networkIdleMs &&
+            now - lastMutation >= domIdleMs) {
+        finish(true);
+    }
+}
+poller = setInterval(evaluate, Math.max(Math.min(networkIdleMs, domIdleMs) / 4, 10));
+timer = setTimeout(function () { finish(false); }, timeoutMs);
+"""
+
+# arguments: [[by, value], ...] -> {ratio, rects: [[x, y, width, height], ...]}, viewport rects in CSS pixels of every
+# visible element matching one of the locators, ratio is the devicePixelRatio of the screenshot
+ELEMENT_RECTS = FIND_ELEMENTS_FUNCTION + IS_VISIBLE_FUNCTION + """
+var rects = [];
+arguments[0].forEach(function (locator) {
+    findElements(locator[0], locator[1]).filter(isVisible).forEach(function (el) {
+        var rect = el.getBoundingClientRect();
+        rects.push([rect.left, rect.top, rect.width, rect.height]);
+    });
+});
+return {ratio: window.devicePixelRatio || 1, rects: rects};
+"""
+
+# async arguments: by, value, attributes, key_attribute, chunk_size, stream_id, container, next_page, settle_ms
+# -> {entries: [{key, text, visible, attributes}], done}. Returns up to chunk_size matching elements whose key
+# (key_attribute, or the text) the stream has not returned yet. When none are left it scrolls the container (the
+# locator, or the scroll parent of the last match) by one height, or clicks the next_page locator, and waits up to
+# settle_ms for new matches to render; done is true once the container cannot move any further.
+STREAM_ELEMENTS = NATIVE_TIMERS + FIND_ELEMENTS_FUNCTION + IS_VISIBLE_FUNCTION + SNAPSHOT_ELEMENT_FUNCTION + """
+var by = arguments[0], value = arguments[1], attributes = arguments[2] || [], keyAttribute = arguments[3];
+var chunkSize = arguments[4], streamId = arguments[5], container = arguments[6], nextPage = arguments[7];
+var settleMs = arguments[8], done = arguments[arguments.length - 1];
+window.__uiStreams = window.__uiStreams || {};
+var seen = window.__uiStreams[streamId] = window.__uiStreams[streamId] || {};
+// Without a key attribute an entry is its text plus its occurrence among the matches, so repeated and empty names
+// are all returned
+function keyOf(el, occurrences) {
+    if (keyAttribute) { return el.getAttribute(keyAttribute); }
+    var text = (el.innerText || el.textContent || '').trim();
+    occurrences[text] = (occurrences[text] || 0) + 1;
+    return text + '#' + occurrences[text];
+}
+function collect() {
+    var entries = [], elements = findElements(by, value), occurrences = {};
+    for (var i = 0; i < elements.length && entries.length < chunkSize; i++) {
+        var key = keyOf(elements[i], occurrences);
+        if (key === null || Object.prototype.hasOwnProperty.call(seen, key)) { continue; }
+        seen[key] = true;
+        var data = snapshotElement(elements[i], attributes, false);
+        data.key = key;
+        entries.push(data);
+    }
+    return {entries: entries, last: elements[elements.length - 1]};
+}
+function scrollParent(el) {
+    for (var node = el && el.parentElement; node; node = node.parentElement) {
+        var overflow = window.getComputedStyle(node).overflowY;
+        if ((overflow === 'auto' || overflow === 'scroll') && node.scrollHeight > node.clientHeight) { return node; }
+    }
+    return document.scrollingElement || document.documentElement;
+}
+function advance(last) {
+    if (nextPage) {
+        var button = findElements(nextPage[0], nextPage[1]).filter(isVisible)[0];
+        if (!button || button.disabled || button.getAttribute('aria-disabled') === 'true') { return false; }
+        button.click();
+        return true;
+    }
+    var scroller = container ? findElements(container[0], container[1])[0] : scrollParent(last);
+    if (!scroller) { return false; }
+    var before = scroller.scrollTop;
+    scroller.scrollTop = before + Math.max(scroller.clientHeight, 1);
+    return scroller.scrollTop !== before;
+}
+var current = collect();
+if (current.entries.length || !advance(current.last)) {
+    done({entries: current.entries, done: !current.entries.length});
+} else {
+    var observer, timer;
+    var finish = function (entries) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done({entries: entries, done: false});
+    };
+    observer = new MutationObserver(function () {
+        var rendered = collect();
+        if (rendered.entries.length) { finish(rendered.entries); }
+    });
+    observer.observe(document, {childList: true, subtree: true, characterData: true});
+    timer = setTimeout(function () { finish(collect().entries); }, settleMs);
+}
+"""
+
+# arguments: stream_id, forgets the keys a STREAM_ELEMENTS stream has returned
+END_STREAM = 'if (window.__uiStreams) { delete window.__uiStreams[arguments[0]]; }'
+
+# async arguments: [by, value] of the checkbox labels, names, settle_ms, timeout_ms
+# -> {selected: [names], alreadySelected: [names], notFound: [names]}. Waits until a label with each name is rendered,
+# or the DOM has been quiet for settle_ms with no fetch/XHR in flight, or timeout_ms passes, then clicks the checkbox
+# of every matching label that is not checked yet, all in one go. The quiet window starts right away, so a search
+# without any match ends after settle_ms too.
+SELECT_CHECKBOXES_BY_LABEL = NATIVE_TIMERS + FIND_ELEMENTS_FUNCTION + IS_VISIBLE_FUNCTION + """
+var labelLocator = arguments[0], names = arguments[1], settleMs = arguments[2], timeoutMs = arguments[3];
+var done = arguments[arguments.length - 1];
+var observer, settleTimer, timer, finished = false;
+function checkboxOf(label) {
+    var input = label.htmlFor ? document.getElementById(label.htmlFor) : null;
+    for (var node = label.previousElementSibling; !input && node; node = node.previousElementSibling) {
+        if (node.tagName === 'INPUT') { input = node; }
+    }
+    return input;
+}
+function match() {
+    var byName = {};
+    findElements(labelLocator[0], labelLocator[1]).filter(isVisible).forEach(function (label) {
+        var text = (label.innerText || label.textContent || '').trim();
+        if (names.indexOf(text) !== -1 && !byName[text]) { byName[text] = checkboxOf(label); }
+    });
+    return byName;
+}
+function finish() {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(settleTimer);
+    clearTimeout(timer);
+    var byName = match(), result = {selected: [], alreadySelected: [], notFound: []};
+    names.forEach(function (name) {
+        var checkbox = byName[name];
+        if (!checkbox) {
+            result.notFound.push(name);
+        } else if (checkbox.checked) {
+            result.alreadySelected.push(name);
+        } else {
+            checkbox.click();
+            result.selected.push(name);
+        }
+    });
+    done(result);
+}
+function settled() {
+    // The search request may still be on its way while the DOM is quiet
+    var network = window.__uiNetwork;
+    if (network && network.inflight > 0) {
+        settleTimer = setTimeout(settled, settleMs);
+    } else {
+        finish();
+    }
+}
+function evaluate() {
+    if (Object.keys(match()).length === names.length) {
+        finish();
+    } else {
+        clearTimeout(settleTimer);
+        settleTimer = setTimeout(settled, settleMs);
+    }
+}
+observer = new MutationObserver(evaluate);
+observer.observe(document, {childList: true, subtree: true, characterData: true});
+timer = setTimeout(finish, timeoutMs);
+evaluate();
+"""
+
+# Registered for every new document where possible; records LCP, CLS and long tasks in window.__uiVitals
+VITALS_OBSERVER = """
+(function () {
+    if (window.__uiVitals || typeof PerformanceObserver === 'undefined') { return; }
+    var vitals = window.__uiVitals = {lcp: null, cls: 0, longTasks: 0, longTaskMs: 0};
+    function observe(type, record) {
+        try {
+            new PerformanceObserver(function (list) { list.getEntries().forEach(record); })
+                .observe({type: type, buffered: true});
+        } catch (e) {}
+    }
+    observe('largest-contentful-paint', function (entry) { vitals.lcp = entry.startTime; });
+    observe('layout-shift', function (entry) { if (!entry.hadRecentInput) { vitals.cls += entry.value; } });
+    observe('longtask', function (entry) { vitals.longTasks++; vitals.longTaskMs += entry.duration; });
+})();
+"""
+
+# async, no arguments -> {url, metrics} of the current document once, null for a document already collected or not
+# loaded over http(s). Navigation Timing, paint and resource timing, the observed web vitals and the JS heap size.
+COLLECT_WEB_VITALS = VITALS_OBSERVER + """
+var done = arguments[arguments.length - 1];
+if (window.__uiVitalsCollected || !/^https?:$/.test(window.location.protocol)) {
+    done(null);
+} else {
+    // Buffered observer entries are delivered in a task of their own
+    setTimeout(function () {
+        var navigation = performance.getEntriesByType('navigation')[0] || {}, paints = {}, transfer = 0, slowest = 0;
+        performance.getEntriesByType('paint').forEach(function (entry) { paints[entry.name] = entry.startTime; });
+        var resources = performance.getEntriesByType('resource');
+        resources.forEach(function (entry) {
+            transfer += entry.transferSize || 0;
+            slowest = Math.max(slowest, entry.duration);
+        });
+        var vitals = window.__uiVitals || {}, memory = performance.memory;
+        window.__uiVitalsCollected = true;
+        done({url: window.location.href, metrics: {
+            ttfb_ms: navigation.responseStart, dom_content_loaded_ms: navigation.domContentLoadedEventEnd,
+            load_ms: navigation.loadEventEnd, fcp_ms: paints['first-contentful-paint'], lcp_ms: vitals.lcp,
+            cls: vitals.cls, long_tasks: vitals.longTasks, long_task_ms: vitals.longTaskMs,
+            resources: resources.length, transfer_bytes: transfer, slowest_resource_ms: slowest,
+            js_heap_bytes: memory ? memory.usedJSHeapSize : null
+        }});
+    }, 0);
+}
+"""
+
+# Function of {fastTimers, timerFactor, timerMaxMs}: CSS transitions and animations end right away (their end events
+# still fire), smooth scrolling becomes instant, Web Animations get the same short duration, and with fastTimers the
+# page's setTimeout delays up to timerMaxMs run at timerFactor of their length. Idempotent per document.
+FREEZE_RENDERING_FUNCTION = """
+(function (config) {
+    if (window.__uiRenderingFrozen) { return; }
+    window.__uiRenderingFrozen = true;
+    var css = '*, *::before, *::after { transition-duration: 0.01ms !important; transition-delay: 0s !important; ' +
+        'animation-duration: 0.01ms !important; animation-delay: 0s !important; ' +
+        'animation-iteration-count: 1 !important; scroll-behavior: auto !important; }';
+    function addStyle() {
+        var parent = document.head || document.documentElement;
+        if (!parent) { return false; }
+        var style = document.createElement('style');
+        style.setAttribute('data-ui-freeze', '');
+        style.textContent = css;
+        parent.appendChild(style);
+        return true;
+    }
+    if (!addStyle()) {
+        new MutationObserver(function (mutations, observer) {
+            if (addStyle()) { observer.disconnect(); }
+        }).observe(document, {childList: true});
+    }
+    function instant(options) {
+        if (options && typeof options === 'object' && options.behavior === 'smooth') {
+            options = Object.assign({}, options, {behavior: 'auto'});
+        }
+        return options;
+    }
+    [window, Element.prototype].forEach(function (target) {
+        ['scroll', 'scrollTo', 'scrollBy'].forEach(function (name) {
+            var original = target[name];
+            if (!original) { return; }
+            target[name] = function (options) {
+                return original.apply(this, [instant(options)].concat(Array.prototype.slice.call(arguments, 1)));
+            };
+        });
+    });
+    var scrollIntoView = Element.prototype.scrollIntoView;
+    Element.prototype.scrollIntoView = function (options) { return scrollIntoView.call(this, instant(options)); };
+    if (Element.prototype.animate) {
+        var animate = Element.prototype.animate;
+        Element.prototype.animate = function (keyframes, options) {
+            if (typeof options === 'number') {
+                options = 0.01;
+            } else if (options) {
+                options = Object.assign({}, options, {duration: 0.01, delay: 0, iterations: 1});
+            }
+            return animate.call(this, keyframes, options);
+        };
+    }
+    if (config.fastTimers) {
+        var setTimeoutNative = window.__uiNativeSetTimeout = window.setTimeout;
+        window.setTimeout = function (handler, delay) {
+            var args = Array.prototype.slice.call(arguments);
+            if (delay > 0 && delay <= config.timerMaxMs) { args[1] = delay * config.timerFactor; }
+            return setTimeoutNative.apply(window, args);
+        };
+    }
+})
+"""
+
+# arguments: {fastTimers, timerFactor, timerMaxMs}, freezes rendering in the current document
+FREEZE_RENDERING = FREEZE_RENDERING_FUNCTION.strip() + '(arguments[0]);'
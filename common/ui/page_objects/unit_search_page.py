@@ -1,3 +1,7 @@
+import os
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.page_objects import scripts
 from common.ui.page_objects.base_page import BasePage
 from selenium.webdriver.common.by import By
 
@@ -7,6 +11,7 @@ class UnitSearchPage(BasePage):
     UNIT_SEARCH_INPUT = (By.ID, 'select-organizations-input')
     UNIT_SELECT_CHECKBOX = (By.XPATH, '//label[contains(@for, "select-organizations-checkbox")]'
                                       '[text()="{unit_name}"]//preceding-sibling::input')
+    UNIT_SELECT_LABELS = (By.CSS_SELECTOR, 'label[for*="select-organizations-checkbox"]')
     ADDED_SEARCH_LIST_ITEMS = (By.CSS_SELECTOR, 'table td p[class^="MainText"]')
 
     def enter_unit_search(self, search_text):
@@ -15,8 +20,7 @@ class UnitSearchPage(BasePage):
 
     def clear_unit_search_text(self):
         self.click_element(UnitSearchPage.UNIT_SEARCH_INPUT)
-        current_search_txt = self.get_attribute_of_element(UnitSearchPage.UNIT_SEARCH_INPUT, 'value')
-        self.delete_or_clear_text(UnitSearchPage.UNIT_SEARCH_INPUT, len(current_search_txt), clear=False)
+        self.clear_text(UnitSearchPage.UNIT_SEARCH_INPUT)
         return self
 
     def select_search_unit(self, unit_name):
@@ -24,9 +28,61 @@ class UnitSearchPage(BasePage):
         self.click_element((select_unit_selector[0], select_unit_selector[1].format(unit_name=unit_name)))
         return self
 
+    def select_search_units(self, unit_names, prefix_length=EnvConf.UNIT_SEARCH_PREFIX_LENGTH,
+                            settle_ms=EnvConf.SEARCH_RESULTS_SETTLE_MS, timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
+        """
+        Add many units with one search per shared name prefix instead of one search per unit. The checkboxes of
+        every unit in a result set are ticked in one script call, units the prefix search did not show are searched
+        by their full name, and the added units are read once at the end.
+        :param unit_names: names of the units to add
+        :param prefix_length: names starting with the same characters are searched together
+        :param settle_ms: how long the result set must stay unchanged before the units it lacks are given up
+        :param timeout:
+        :return: names that are not in the added units afterwards, empty when every unit was added
+        """
+        unit_names = list(dict.fromkeys(unit_names))
+        not_found = []
+        for search_text, names in UnitSearchPage.group_by_search_prefix(unit_names, prefix_length):
+            not_found.extend(self.select_in_search_results(search_text, names, settle_ms, timeout)['notFound'])
+        for unit_name in not_found:
+            # Result sets can be capped, the full name narrows them down to this unit
+            self.select_in_search_results(unit_name, [unit_name], settle_ms, timeout)
+        self.clear_unit_search_text()
+        added_units = set(self.get_added_search_lists())
+        return [unit_name for unit_name in unit_names if unit_name not in added_units]
+
+    def select_in_search_results(self, search_text, unit_names, settle_ms=EnvConf.SEARCH_RESULTS_SETTLE_MS,
+                                 timeout=EnvConf.SELENIUM_TIMEOUT_SECONDS):
+        """
+        Search and tick the checkbox of every given unit in the results that is not ticked yet
+        :return: dict {'selected': [names], 'alreadySelected': [names], 'notFound': [names]}
+        """
+        self.clear_text(UnitSearchPage.UNIT_SEARCH_INPUT)
+        self.enter_unit_search(search_text)
+        self.dom_wait.ensure_script_timeout(timeout)
+        return self.driver.execute_async_script(scripts.SELECT_CHECKBOXES_BY_LABEL,
+                                                list(UnitSearchPage.UNIT_SELECT_LABELS), unit_names, settle_ms,
+                                                int(timeout * 1000))
+
+    @staticmethod
+    def group_by_search_prefix(unit_names, prefix_length=EnvConf.UNIT_SEARCH_PREFIX_LENGTH):
+        """
+        Group names sharing their first prefix_length characters (case insensitive), each group is searched with
+        the longest prefix all its names share, a name with no other names sharing its prefix is searched by itself
+        :return: list of (search_text, [names]) in order of the sorted names
+        """
+        groups = {}
+        for unit_name in sorted(unit_names, key=str.lower):
+            groups.setdefault(unit_name[:prefix_length].lower(), []).append(unit_name)
+        search_groups = []
+        for names in groups.values():
+            common_prefix = os.path.commonprefix([name.lower() for name in names])
+            search_groups.append((names[0][:len(common_prefix)], names))
+        return search_groups
+
     def get_added_search_lists(self):
         added_lists = []
-        list_items = self.find_elements(UnitSearchPage.ADDED_SEARCH_LIST_ITEMS)
+        list_items = self.find_elements_data(UnitSearchPage.ADDED_SEARCH_LIST_ITEMS)
         for list_item in list_items:
-            added_lists.append(list_item.text.split(". ")[1])
+            added_lists.append(list_item['text'].split(". ")[1])
         return added_lists
@@ -8,3 +8,7 @@ class DataHelper:
             return False
         else:
             raise ValueError
+
+    @staticmethod
+    def str_to_list(string, separator=','):
+        return [item.strip() for item in string.split(separator) if item.strip()]
@@ -0,0 +1,107 @@
+import json
+import os
+import statistics
+import subprocess
+import time
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.driver.command_tracer import CommandTracer
+
+
+class BenchmarkRecorder:
+    """
+    Time an operation cold (first call on a freshly loaded page) and warm (repeated calls on the same page),
+    count its WebDriver round trips, store the result under the current commit and compare it with the baseline.
+    Results live in <BENCHMARK_DIR>/<commit>/<name>.json and the baseline in <BENCHMARK_DIR>/baseline/<name>.json.
+    """
+
+    def __init__(self, driver, result_dir=EnvConf.BENCHMARK_DIR, rounds=EnvConf.BENCHMARK_ROUNDS,
+                 threshold=EnvConf.BENCHMARK_REGRESSION_THRESHOLD, save_baseline=EnvConf.BENCHMARK_SAVE_BASELINE):
+        self.driver = driver
+        self.result_dir = result_dir
+        self.rounds = rounds
+        self.threshold = threshold
+        self.save_baseline = save_baseline
+        self.tracer = CommandTracer.of(driver)
+        self._attached = self.tracer is None
+        if self._attached:
+            self.tracer = CommandTracer()
+            self.tracer.attach(driver)
+
+    def close(self):
+        if self._attached:
+            CommandTracer.detach(self.driver)
+
+    def measure(self, name, operation, page_factory=None, reset=None, rounds=None):
+        """
+        :param name: benchmark name, used as result file name
+        :param operation: callable(page) that is timed
+        :param page_factory: callable() loading the page and returning the page object, run once before the cold call
+        :param reset: callable(page) run untimed after every call to restore the state the operation expects
+        :param rounds: number of warm calls, BENCHMARK_ROUNDS by default
+        :return: result dict
+        """
+        page = page_factory() if page_factory else None
+        self.tracer.drain()
+        cold_ms, cold_round_trips = self._time(operation, page, reset)
+        warm = [self._time(operation, page, reset) for _ in range(rounds or self.rounds)]
+        result = {
+            'name': name,
+            'commit': self.commit(),
+            'cold_ms': cold_ms,
+            'cold_round_trips': cold_round_trips,
+            'warm_ms': statistics.median([duration for duration, _ in warm]),
+            'warm_min_ms': min(duration for duration, _ in warm),
+            'warm_round_trips': statistics.median([round_trips for _, round_trips in warm]),
+            'rounds': len(warm),
+        }
+        self._write(os.path.join(self.result_dir, result['commit'], name + '.json'), result)
+        if self.save_baseline:
+            self._write(os.path.join(self.result_dir, 'baseline', name + '.json'), result)
+        return result
+
+    def regressions(self, result):
+        """
+        Compare a result with its baseline
+        :return: list of regression messages, empty when there is no baseline or nothing regressed
+        """
+        try:
+            with open(os.path.join(self.result_dir, 'baseline', result['name'] + '.json')) as baseline_file:
+                baseline = json.load(baseline_file)
+        except OSError:
+            return []
+        messages = []
+        # The fastest warm call is the least noisy timing, the single cold call and the median are only recorded
+        limit = baseline['warm_min_ms'] * (1 + self.threshold)
+        if result['warm_min_ms'] > limit:
+            messages.append('{} warm_min_ms: {:.1f} ms > {:.1f} ms (baseline {} + {:.0%})'.format(
+                result['name'], result['warm_min_ms'], limit, baseline['commit'], self.threshold))
+        for key in ('cold_round_trips', 'warm_round_trips'):
+            if result[key] > baseline[key]:
+                messages.append('{} {}: {} > {} (baseline {})'.format(
+                    result['name'], key, result[key], baseline[key], baseline['commit']))
+        return messages
+
+    @staticmethod
+    def commit():
+        try:
+            return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                           stderr=subprocess.DEVNULL).decode().strip()
+        except (OSError, subprocess.CalledProcessError):
+            return 'unknown'
+
+    def _time(self, operation, page, reset):
+        start = time.time()
+        operation(page)
+        duration = (time.time() - start) * 1000
+        round_trips = len([record for record in self.tracer.drain() if not record['wait']])
+        if reset:
+            reset(page)
+            self.tracer.drain()
+        return duration, round_trips
+
+    @staticmethod
+    def _write(path, result):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as result_file:
+            json.dump(result, result_file, indent=2)
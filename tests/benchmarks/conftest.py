@@ -0,0 +1,48 @@
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from common.ui.config.desired_caps import CHROME_LINUX
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.page_objects.base_page import BasePage
+from tests.benchmarks.benchmark_recorder import BenchmarkRecorder
+
+SITE_DIR = os.path.join(os.path.dirname(__file__), 'site')
+
+
+class QuietRequestHandler(SimpleHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope='session')
+def local_app_url():
+    # Serve the static copy of the unitlists app, one server per xdist worker
+    handler = functools.partial(QuietRequestHandler, directory=SITE_DIR)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:{}/'.format(server.server_port)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def local_app(monkeypatch, local_app_url):
+    monkeypatch.setattr(EnvConf, 'BASE_URL', local_app_url)
+    # Waits against the local copy would be learned as timings of the real app
+    monkeypatch.setattr(BasePage.wait_timings, 'enabled', False)
+    return local_app_url
+
+
+@pytest.fixture
+def bench(web_driver):
+    driver = web_driver(CHROME_LINUX['isMobile'], CHROME_LINUX['platformName'], CHROME_LINUX['browserName'],
+                        CHROME_LINUX['deviceName'])
+    recorder = BenchmarkRecorder(driver)
+    yield recorder
+    recorder.close()
@@ -0,0 +1,91 @@
+import allure
+import pytest
+from hamcrest import assert_that, empty
+from selenium.webdriver.common.by import By
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.page_objects import scripts
+from common.ui.page_objects.home_page import HomePage
+from common.ui.page_objects.unit_search_page import UnitSearchPage
+
+pytestmark = [pytest.mark.benchmark, allure.parent_suite('Benchmarks'), allure.suite('UnitLists'),
+              allure.sub_suite('BasePage primitives')]
+
+MISSING_ELEMENT = (By.ID, 'does-not-exist')
+
+
+def open_home_page(driver, location=''):
+    driver.get(EnvConf.BASE_URL + location)
+    return HomePage(driver).accept_cookie_warning()
+
+
+def open_unit_search_page(driver, search_text=None):
+    home_page = open_home_page(driver)
+    home_page.click_list(home_page.get_created_list_names()[0])
+    unit_search_page = UnitSearchPage(driver)
+    if search_text:
+        unit_search_page.enter_unit_search(search_text)
+    return unit_search_page
+
+
+def set_search_text(page, text):
+    element = page.driver.find_element(*UnitSearchPage.UNIT_SEARCH_INPUT)
+    page.driver.execute_script(scripts.SET_NATIVE_VALUE, element, text)
+
+
+@allure.title('Benchmark find element')
+def test_find_element(bench):
+    result = bench.measure('find_element', lambda page: page.wait_element_exist(HomePage.NUMBER_OF_UNIT),
+                           lambda: open_home_page(bench.driver))
+    assert_that(bench.regressions(result), empty())
+
+
+@allure.title('Benchmark click element')
+def test_click_element(bench):
+    checkbox_selector = UnitSearchPage.UNIT_SELECT_CHECKBOX
+    checkbox = (checkbox_selector[0], checkbox_selector[1].format(unit_name='Gotland'))
+    # Clicking again unchecks the unit, so every round clicks an unchecked checkbox
+    result = bench.measure('click_element', lambda page: page.click_element(checkbox),
+                           lambda: open_unit_search_page(bench.driver, 'Gotland'),
+                           reset=lambda page: page.click_element(checkbox))
+    assert_that(bench.regressions(result), empty())
+
+
+@allure.title('Benchmark type text')
+def test_type_text(bench):
+    result = bench.measure('type_text', lambda page: page.type_text(UnitSearchPage.UNIT_SEARCH_INPUT, 'Gotland'),
+                           lambda: open_unit_search_page(bench.driver),
+                           reset=lambda page: set_search_text(page, ''))
+    assert_that(bench.regressions(result), empty())
+
+
+@allure.title('Benchmark clear text')
+def test_clear_text(bench):
+    result = bench.measure('clear_text', lambda page: page.clear_unit_search_text(),
+                           lambda: open_unit_search_page(bench.driver, 'Västra Götaland'),
+                           reset=lambda page: set_search_text(page, 'Västra Götaland'))
+    assert_that(bench.regressions(result), empty())
+
+
+@pytest.mark.parametrize('units', [1, 500])
+@allure.title('Benchmark batched text of elements')
+def test_text_of_elements(bench, units):
+    result = bench.measure('text_of_elements_{}'.format(units),
+                           lambda page: page.get_text_of_elements(HomePage.UNIT_ENTRY),
+                           lambda: open_home_page(bench.driver, '?units={}'.format(units)))
+    assert_that(bench.regressions(result), empty())
+
+
+@allure.title('Benchmark successful wait')
+def test_wait_success(bench):
+    result = bench.measure('wait_success',
+                           lambda page: page.wait_for_visibility_of_element_located(HomePage.UNIT_ENTRY),
+                           lambda: open_home_page(bench.driver))
+    assert_that(bench.regressions(result), empty())
+
+
+@allure.title('Benchmark timed out wait')
+def test_wait_timeout(bench):
+    result = bench.measure('wait_timeout', lambda page: page.is_element_visible(MISSING_ELEMENT, timeout=1),
+                           lambda: open_home_page(bench.driver), rounds=3)
+    assert_that(bench.regressions(result), empty())
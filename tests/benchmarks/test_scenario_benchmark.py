@@ -0,0 +1,48 @@
+import allure
+import pytest
+from hamcrest import assert_that, empty, equal_to
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.page_objects.home_page import HomePage
+from common.ui.page_objects.unit_search_page import UnitSearchPage
+
+pytestmark = [pytest.mark.benchmark, allure.parent_suite('Benchmarks'), allure.suite('UnitLists'),
+              allure.sub_suite('Scenarios')]
+
+
+def existing_list_added_default(driver):
+    # Same steps as tests/ui/test_default_list.py
+    driver.get(EnvConf.BASE_URL)
+    home_page = HomePage(driver)
+    home_page.accept_cookie_warning()
+    created_lists = home_page.get_created_lists()
+    number_of_unit = home_page.get_number_of_unit()
+    list_unit_entries = home_page.get_list_unit_entries()
+    return len(created_lists), number_of_unit, len(list_unit_entries)
+
+
+def search_unit(driver, unit_name):
+    # Same steps as tests/ui/test_search_unit.py
+    driver.get(EnvConf.BASE_URL)
+    home_page = HomePage(driver)
+    unit_search_page = UnitSearchPage(driver)
+    home_page.accept_cookie_warning()
+    home_page.click_list(home_page.get_created_list_names()[0])
+    unit_search_page.enter_unit_search(unit_name)\
+        .select_search_unit(unit_name)\
+        .clear_unit_search_text()
+    return unit_search_page.get_added_search_lists()
+
+
+@allure.title('Benchmark scenario: existing list added by default')
+def test_existing_list_added_default_benchmark(bench):
+    result = bench.measure('scenario_existing_list_added_default',
+                           lambda page: assert_that(existing_list_added_default(bench.driver), equal_to((1, 1, 1))))
+    assert_that(bench.regressions(result), empty())
+
+
+@allure.title('Benchmark scenario: search unit')
+def test_search_unit_benchmark(bench):
+    result = bench.measure('scenario_search_unit',
+                           lambda page: assert_that('Gotland' in search_unit(bench.driver, 'Gotland'), equal_to(True)))
+    assert_that(bench.regressions(result), empty())
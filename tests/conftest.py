@@ -1,99 +1,283 @@
+import json
+import os
+import time
+import warnings
+
 import allure
 from allure import attachment_type
 import pytest
-from appium import webdriver as appium_webdriver
-from selenium import webdriver
-from selenium.common.exceptions import WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from common.ui.config.desired_caps import SAUCE_LABS_RDC_CHROME_EMULATION_MAPPING
 from common.ui.config.env_conf import EnvironmentConfig as EnvConf
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-
-
-def create_local_driver(is_mobile, browser_name, device_name):
-    if browser_name.lower() == 'chrome' or EnvConf.MOBILE_EMULATION:
-        chrome_options = ChromeOptions()
-        if is_mobile and EnvConf.MOBILE_EMULATION:
-            # Device name should be "Pixel 2", "Nexus 5", "iPhoneX", "iPad Mini" ...
-            device_name_emulation = SAUCE_LABS_RDC_CHROME_EMULATION_MAPPING[device_name]
-            chrome_options.add_experimental_option("mobileEmulation", {"deviceName": device_name_emulation})
-        if EnvConf.HEADLESS:
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("user-agent=Zenfolio Automation Testing Head-less Chrome Instance")
-            if not is_mobile:
-                chrome_options.add_argument("--window-size=1920x1080")
-        browser = webdriver.Chrome(executable_path=ChromeDriverManager().install(), options=chrome_options)
-    elif browser_name.lower() == 'firefox':
-        firefox_options = FirefoxOptions()
-        if EnvConf.HEADLESS:
-            firefox_options.headless = True
-        browser = webdriver.Firefox(executable_path=GeckoDriverManager().install(), options=firefox_options)
-    elif browser_name.lower() == 'edge':
-        browser = webdriver.Edge()
-    else:
-        raise KeyError("The inputted browser is not supported")
+from common.ui.driver.backends import DriverBackends
+from common.ui.driver.backends.base import DriverBackend
+from common.ui.driver.command_tracer import CommandTracer, TraceSummary, write_trace_file
+from common.ui.driver.driver_pool import DriverPool
+from common.ui.driver.failure_artifacts import ArtifactCollector
+from common.ui.driver.remote_transport import CommandLatency
+from common.ui.driver.duration_scheduler import DurationScheduling, DurationStore, capability_id
+from common.ui.driver.resource_policy import ResourcePolicy, ResourceSummary
+from common.ui.driver.state_snapshot import StateSnapshots
+from common.ui.driver.web_vitals import WebVitals
+from common.ui.page_objects.base_page import BasePage
+
+DRIVER_BACKENDS = DriverBackends()
+TRACE_SUMMARY = TraceSummary()
+RESOURCE_SUMMARY = ResourceSummary()
+TEST_DURATIONS = DurationStore()
+FAILURE_ARTIFACTS = ArtifactCollector()
+STATE_SNAPSHOTS = StateSnapshots()
+WEB_VITALS = WebVitals()
+REMOTE_LATENCY = CommandLatency()
+
+
+def create_driver(is_mobile, platform, browser_name, device_name, test_name=None):
+    start = time.time()
+    # Only the backend that is actually used gets imported, on its first driver
+    backend = DRIVER_BACKENDS.backend_for(is_mobile, browser_name)
+    browser = backend.start(is_mobile, platform, browser_name, device_name, test_name)
+    browser.driver_backend = backend
+
+    if EnvConf.TRACE_COMMANDS:
+        tracer = CommandTracer()
+        tracer.record_startup(time.time() - start)
+        tracer.attach(browser)
+
+    browser.set_page_load_timeout(EnvConf.PAGE_LOAD_TIMEOUT_SECONDS)
+    if not is_mobile:
+        browser.maximize_window()
+
     return browser
 
 
+def is_poolable(is_mobile, browser_name):
+    return EnvConf.DRIVER_POOL and DRIVER_BACKENDS.backend_for(is_mobile, browser_name).poolable
+
+
+@pytest.fixture(scope='session')
+def driver_pool():
+    # Session scope is per process, so every xdist worker owns its own pool
+    pool = DriverPool(create_driver)
+    yield pool
+    pool.close_all()
+
+
 @pytest.fixture(scope='function')
-def web_driver(request):
+def web_driver(request, driver_pool):
     driver_lst = []
-    rdc_user = EnvConf.SAUCE_LABS_RDC_USER
-    rdc_key = EnvConf.SAUCE_LABS_RDC_KEY
 
     def _web_driver(is_mobile=False, platform=EnvConf.PLATFORM, browser_name=EnvConf.BROWSER_NAME, device_name=None):
         test_name = request.node.name
 
-        if EnvConf.GRID:
-            if is_mobile and EnvConf.SAUCE_LABS:
-                caps = {'browserName': browser_name, 'platformName': platform, 'deviceName': device_name,
-                        'deviceOrientation': 'portrait', 'phoneOnly': False, 'tabletOnly': False,
-                        'privateDevicesOnly': False, 'name': test_name, 'build': EnvConf.BUILD_TAG
-                        }
-                grid_url = \
-                    "https://{}:{}@ondemand.us-west-1.saucelabs.com:443/wd/hub".format(rdc_user, rdc_key)
-                browser = appium_webdriver.Remote(grid_url, desired_capabilities=caps)
-            elif not is_mobile:
-                browser = create_local_driver(is_mobile, browser_name, device_name)
-            else:
-                grid_url = 'http://{host}:{port}/wd/hub'.format(host=EnvConf.GRID_HOST, port=EnvConf.GRID_PORT)
-                caps = {
-                    'platform': platform,
-                    'browserName': browser_name
-                }
-                browser = webdriver.Remote(grid_url, desired_capabilities=caps)
-
-            # This is specifically for SauceLabs plugin. In case test fails after selenium session creation
-            # having this here will help track it down. creates one file per test non ideal but xdist is awful
-            if browser:
-                print("SauceOnDemandSessionID={} job-name={}\n".format(browser.session_id, test_name))
-            else:
-                raise WebDriverException("Never created!")
-            driver_lst.append(browser)
+        if is_poolable(is_mobile, browser_name):
+            browser = driver_pool.acquire(is_mobile, platform, browser_name, device_name)
         else:
-            browser = create_local_driver(is_mobile, browser_name, device_name)
-            driver_lst.append(browser)
-
-        browser.set_page_load_timeout(EnvConf.PAGE_LOAD_TIMEOUT_SECONDS)
-        if not is_mobile:
-            browser.maximize_window()
+            browser = create_driver(is_mobile, platform, browser_name, device_name, test_name)
+        resource_policy = ResourcePolicy.of(browser)
+        if resource_policy is not None:
+            # Drop the traffic of the previous test or of the pool reset
+            resource_policy.discard_usage(browser)
+        if EnvConf.WEB_VITALS:
+            WEB_VITALS.attach(browser, request.node.nodeid, capability_id(
+                {'browserName': browser_name, 'platformName': platform, 'deviceName': device_name or ''}))
+        driver_lst.append(browser)
 
         return browser
 
     yield _web_driver
     # Teardown starts here
     if driver_lst:
-        if getattr(driver_lst[0], "battery_info", None):
-            # Only run these code if the test is run on Sauce Labs.
-            # report results
-            # use the test result to send the pass/fail status to Sauce Labs
-            sauce_result = "failed" if request.node.rep_call.failed else "passed"
-            driver_lst[0].execute_script("sauce:job-result={}".format(sauce_result))
-        if request.node.rep_call.failed:
-            allure.attach(driver_lst[0].get_screenshot_as_png(), 'fail_screenshot', attachment_type=attachment_type.PNG)
-        driver_lst[0].quit()
+        failed = request.node.rep_call.failed
+        for browser in driver_lst:
+            DriverBackend.of(browser).report_result(browser, failed)
+            if EnvConf.WEB_VITALS:
+                WEB_VITALS.release(browser)
+        web_vitals = WEB_VITALS.pop_samples(request.node.nodeid)
+        if web_vitals:
+            allure.attach(json.dumps(web_vitals, indent=2), 'web_vitals', attachment_type=attachment_type.JSON)
+        if failed:
+            # The screenshot is attached right away, compressing and writing the artifacts run in the background
+            artifacts = FAILURE_ARTIFACTS.capture(driver_lst[0], request.node.nodeid)
+            if artifacts.screenshot:
+                allure.attach(artifacts.screenshot, 'fail_screenshot', attachment_type=attachment_type.PNG)
+            artifact_dir = FAILURE_ARTIFACTS.submit(artifacts)
+            allure.attach(json.dumps(artifacts.summary(artifact_dir), indent=2), 'failure_artifacts',
+                          attachment_type=attachment_type.JSON)
+        for browser in driver_lst:
+            resource_policy = ResourcePolicy.of(browser)
+            if resource_policy is not None and resource_policy.record_usage:
+                usage = resource_policy.collect_usage(browser, RESOURCE_SUMMARY.sizes)
+                RESOURCE_SUMMARY.add(usage)
+                request.node.user_properties.append(('resource_usage', usage.to_dict()))
+                allure.attach(json.dumps(usage.to_dict(), indent=2), 'resource_usage',
+                              attachment_type=attachment_type.JSON)
+            # The trace ends with the test, the pool reset or quit that follows is not part of it
+            tracer = CommandTracer.of(browser)
+            if tracer is not None:
+                records = tracer.drain()
+                TRACE_SUMMARY.add(records)
+                trace = write_trace_file(records, request.node.nodeid)
+                allure.attach(trace, 'webdriver_trace', attachment_type=attachment_type.TEXT)
+            if driver_pool.owns(browser):
+                driver_pool.release(browser, failed)
+            else:
+                browser.quit()
+
+
+@pytest.fixture
+def app_state():
+    """
+    Start a test at a named state: app_state(driver, name, setup_flow) restores the snapshot taken after setup_flow
+    in an earlier test, or runs setup_flow(driver) and snapshots it. Returns the URL of the state.
+    """
+    return STATE_SNAPSHOTS.ensure
+
+
+@pytest.fixture
+def visual_check():
+    """
+    Compare the viewport with a named baseline: visual_check(driver, name, ignore=()) returns a VisualResult and
+    attaches the diff image to the report when it does not match. A test without a baseline is skipped unless
+    VISUAL_UPDATE_BASELINES records it.
+    """
+    # NumPy and Pillow are only imported by the tests that take screenshots
+    from common.ui.driver.visual_compare import VisualComparer
+    comparer = VisualComparer()
+
+    def _visual_check(driver, name, ignore=()):
+        result = comparer.check(driver, name, ignore)
+        if result.missing_baseline:
+            pytest.skip(result.describe())
+        if result.diff_path:
+            allure.attach.file(result.diff_path, name + '_diff', attachment_type=attachment_type.PNG)
+        return result
+
+    return _visual_check
+
+
+@pytest.fixture
+def performance_budget(request):
+    """
+    Fail the test when a page it visited is over budget: performance_budget(driver) collects the current page and
+    checks every page of the test against PERFORMANCE_BUDGETS_PATH and a performance_budget marker
+    (@pytest.mark.performance_budget(lcp_ms=2500)). Regressions from the history of earlier runs are attached and
+    warned about, and only fail the test with PERFORMANCE_FAIL_ON_REGRESSION.
+    """
+    marker = request.node.get_closest_marker('performance_budget')
+    overrides = dict(marker.kwargs) if marker else {}
+
+    def _performance_budget(*drivers):
+        for driver in drivers:
+            WEB_VITALS.collect(driver)
+        violations = WEB_VITALS.check(request.node.nodeid, overrides)
+        regressions = WEB_VITALS.regressions(request.node.nodeid, overrides)
+        if regressions:
+            allure.attach('\n'.join(regressions), 'performance_regressions', attachment_type=attachment_type.TEXT)
+            if EnvConf.PERFORMANCE_FAIL_ON_REGRESSION:
+                violations += regressions
+            else:
+                warnings.warn('Performance regressed:\n' + '\n'.join(regressions))
+        assert not violations, 'Performance budget exceeded:\n' + '\n'.join(violations)
+
+    return _performance_budget
+
+
+def pytest_configure(config):
+    # Driver binaries and the profile template are prepared by the backend on its first driver, in the worker
+    if EnvConf.RESOURCE_USAGE:
+        RESOURCE_SUMMARY.load_sizes()
+    if not hasattr(config, 'workerinput'):
+        TEST_DURATIONS.load()
+
+
+def pytest_make_parametrize_id(config, val, argname):
+    # Name the capability tuple in the test id, the duration scheduler groups tests by it
+    if argname == 'designed_caps':
+        return capability_id(val)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if EnvConf.DURATION_SCHEDULING and config.getoption('dist') == 'load':
+        return DurationScheduling(config, log, TEST_DURATIONS)
+
+
+def pytest_runtest_logreport(report):
+    # Reports of xdist workers are replayed on the controller, so durations are only recorded there
+    if not os.getenv('PYTEST_XDIST_WORKER'):
+        TEST_DURATIONS.add(report.nodeid, report.duration)
+
+
+def pytest_sessionfinish(session):
+    FAILURE_ARTIFACTS.close()
+    WEB_VITALS.store.close()
+    for backend in DRIVER_BACKENDS.loaded():
+        backend.session_finish()
+        command_latency = backend.command_latency()
+        if command_latency is not None:
+            REMOTE_LATENCY.merge(command_latency.to_dict())
+    worker_output = getattr(session.config, 'workeroutput', None)
+    if worker_output is not None:
+        worker_output['trace_summary'] = TRACE_SUMMARY.to_dict()
+        worker_output['resource_summary'] = RESOURCE_SUMMARY.to_dict()
+        worker_output['wait_timings'] = BasePage.wait_timings.new_samples
+        worker_output['remote_latency'] = REMOTE_LATENCY.to_dict()
+        worker_output['artifact_errors'] = FAILURE_ARTIFACTS.errors
+        return
+    if EnvConf.RESOURCE_USAGE:
+        RESOURCE_SUMMARY.save_sizes()
+    if session.exitstatus != pytest.ExitCode.INTERRUPTED:
+        TEST_DURATIONS.save()
+        BasePage.wait_timings.save()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    # Runs on the xdist controller when a worker finishes
+    worker_output = getattr(node, 'workeroutput', {})
+    trace_summary = worker_output.get('trace_summary')
+    if trace_summary:
+        TRACE_SUMMARY.merge(trace_summary)
+    resource_summary = worker_output.get('resource_summary')
+    if resource_summary:
+        RESOURCE_SUMMARY.merge(resource_summary)
+    wait_timings = worker_output.get('wait_timings')
+    if wait_timings:
+        BasePage.wait_timings.merge(wait_timings)
+    remote_latency = worker_output.get('remote_latency')
+    if remote_latency:
+        REMOTE_LATENCY.merge(remote_latency)
+    artifact_errors = worker_output.get('artifact_errors')
+    if artifact_errors:
+        FAILURE_ARTIFACTS.merge_errors(artifact_errors)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if FAILURE_ARTIFACTS.errors:
+        terminalreporter.write_sep('=', 'failure artifacts not written', yellow=True)
+        for error in FAILURE_ARTIFACTS.errors:
+            terminalreporter.write_line(error)
+    if RESOURCE_SUMMARY.tests:
+        totals = RESOURCE_SUMMARY.totals
+        terminalreporter.write_sep('=', 'network resources')
+        terminalreporter.write_line('allowed: {} requests, {:.1f} KB'.format(
+            totals['allowed_requests'], totals['allowed_bytes'] / 1024.0))
+        terminalreporter.write_line('blocked: {} requests, ~{:.1f} KB ({})'.format(
+            totals['blocked_requests'], totals['blocked_bytes'] / 1024.0,
+            ', '.join('{}: {}'.format(name, count) for name, count in sorted(totals['blocked_by_type'].items()))))
+    if REMOTE_LATENCY.total_commands:
+        terminalreporter.write_sep('=', 'remote commands')
+        for command, stats in REMOTE_LATENCY.slowest():
+            terminalreporter.write_line('{:>10.1f} ms  {:>5} calls  {:>8.1f} ms mean  {:>8.1f} ms max  {}'.format(
+                stats['total_ms'], stats['count'], stats['total_ms'] / stats['count'], stats['max_ms'], command))
+        terminalreporter.write_line('total: {} commands, {:.1f} ms, {} connections opened'.format(
+            REMOTE_LATENCY.total_commands, REMOTE_LATENCY.total_ms, REMOTE_LATENCY.connections))
+    if not EnvConf.TRACE_COMMANDS or not TRACE_SUMMARY.methods:
+        return
+    terminalreporter.write_sep('=', 'slowest page object methods')
+    for name, stats in TRACE_SUMMARY.slowest():
+        terminalreporter.write_line('{:>10.1f} ms  {:>5} commands  {:>10.1f} ms waiting  {}'.format(
+            stats['total_ms'], stats['commands'], stats['wait_ms'], name))
+    terminalreporter.write_line('total wait time: {:.1f} ms, total commands: {}'.format(
+        TRACE_SUMMARY.total_wait_ms, TRACE_SUMMARY.total_commands))
 
 
 @pytest.hookimpl(hookwrapper=True, tryfirst=True)
@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.page_objects.unit_search_page import UnitSearchPage
+
+PAGES_DIR = os.path.join(os.path.dirname(__file__), 'pages')
+UNIT_SEARCH_URL = EnvConf.BASE_URL + '/unit-search'
+
+
+def read_page(name):
+    with open(os.path.join(PAGES_DIR, name), encoding='utf-8') as page_file:
+        return page_file.read()
+
+
+def sync_added_units(document, element):
+    """
+    Click handler of the unit search page: like the app, list a unit when its checkbox is ticked and drop it when
+    the checkbox is cleared
+    """
+    table = document.find('id', 'added-units')[0]
+    added = {document.text(item).split('. ', 1)[1]: next(item.iterancestors('tr'))
+             for item in document.find(*UnitSearchPage.ADDED_SEARCH_LIST_ITEMS)}
+    for label in document.find(*UnitSearchPage.UNIT_SELECT_LABELS):
+        unit_name = document.text(label)
+        checked = document.is_selected(document.find('id', label.get('for'))[0])
+        if checked and unit_name not in added:
+            added[unit_name] = None
+            document.append_html(table, '<tr><td><p class="MainText-sc-7u8i9o">{}. {}</p></td></tr>'.format(
+                len(added), unit_name))
+        elif not checked and unit_name in added:
+            document.remove(added.pop(unit_name))
+
+
+@pytest.fixture
+def fake_driver():
+    pytest.importorskip('lxml')
+    from common.ui.driver.fake_webdriver import FakeWebDriver
+    driver = FakeWebDriver(documents={
+        EnvConf.BASE_URL: read_page('home.html'),
+        UNIT_SEARCH_URL: read_page('unit_search.html'),
+    }, click_handlers={UNIT_SEARCH_URL: sync_added_units})
+    yield driver
+    driver.quit()
+
+
+@pytest.fixture
+def unit_search_url():
+    return UNIT_SEARCH_URL
+
+
+@pytest.fixture
+def stand_in_grid():
+    pytest.importorskip('lxml')
+    from common.ui.driver.stand_in_grid import StandInGrid
+    grid = StandInGrid(documents={
+        EnvConf.BASE_URL: read_page('home.html'),
+        UNIT_SEARCH_URL: read_page('unit_search.html'),
+    }).start()
+    yield grid
+    grid.stop()
@@ -0,0 +1,41 @@
+import allure
+import pytest
+from hamcrest import assert_that, equal_to
+
+from common.ui.page_objects.adaptive_timeouts import AdaptiveTimeouts
+
+pytestmark = [pytest.mark.page_objects, allure.parent_suite('Page Object Suite'), allure.suite('UnitLists'),
+              allure.sub_suite('Adaptive Timeouts')]
+
+LOCATOR_KEY = AdaptiveTimeouts.locator_key('visible', ('css selector', '#cookie-dialog'))
+
+
+def adaptive_timeouts(tmp_path, samples):
+    timeouts = AdaptiveTimeouts(str(tmp_path / 'wait_timings.json'), enabled=True, percentile=100, margin=2.0,
+                                floor=1, ceiling=30, min_samples=3, default_timeout=30)
+    timeouts.samples = samples
+    return timeouts
+
+
+@allure.title('Verify that a timed out wait widens the budget of its own key')
+def test_timed_out_wait_widens_budget(tmp_path):
+    key = 'HomePage.accept_cookie_warning ' + LOCATOR_KEY
+    timeouts = adaptive_timeouts(tmp_path, {key: [0.5, 0.5]})
+
+    timeouts.record(key, 4, timed_out=True)
+    timeouts.save()
+
+    assert_that(timeouts.timeout_for(key, 30), equal_to((8, True)), 'Verify the timeout is part of the history')
+
+
+@allure.title('Verify that a negative check is budgeted from the successful waits for its locator')
+def test_negative_check_uses_success_history(tmp_path):
+    timeouts = adaptive_timeouts(tmp_path, {
+        'HomePage.accept_cookie_warning ' + LOCATOR_KEY: [0.5, 1.5],
+        'HomePage.accept_cookie_warning ' + LOCATOR_KEY + AdaptiveTimeouts.TIMED_OUT: [30],
+        'HomePage.is_cookie_warning_shown ' + LOCATOR_KEY: [1.0],
+        'HomePage.accept_cookie_warning visible css selector=#other': [20, 20, 20],
+    })
+
+    assert_that(timeouts.timeout_for('HomePage.is_cookie_warning_shown ' + LOCATOR_KEY, 30, LOCATOR_KEY),
+                equal_to((3.0, True)), 'Verify only successes of the same locator are used')
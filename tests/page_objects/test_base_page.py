@@ -0,0 +1,83 @@
+import time
+
+import allure
+import pytest
+from hamcrest import assert_that, equal_to, less_than
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+from common.ui.page_objects.base_page import BasePage
+from common.ui.page_objects.dom_wait import DomWait
+
+pytestmark = [pytest.mark.page_objects, allure.parent_suite('Page Object Suite'), allure.suite('UnitLists'),
+              allure.sub_suite('Base Page')]
+
+
+@allure.title('Verify that an element inside a transparent or hidden ancestor is not visible')
+def test_hidden_ancestor(fake_driver):
+    fake_driver.load_html('<div style="opacity: 0"><p id="faded">Faded</p></div>'
+                          '<div style="display: none"><p id="collapsed">Collapsed</p></div><p id="shown">Shown</p>')
+    page = BasePage(fake_driver)
+
+    assert_that(page.is_element_visible((By.ID, 'faded'), 0.2), equal_to(False), 'Verify transparent ancestor')
+    assert_that(page.is_element_visible((By.ID, 'collapsed'), 0.2), equal_to(False), 'Verify hidden ancestor')
+    assert_that(page.is_element_visible((By.ID, 'shown'), 0.2), equal_to(True), 'Verify shown element')
+
+
+@pytest.mark.parametrize('html', ['<button id="target" aria-disabled="true">Add</button>',
+                                  '<div style="pointer-events: none"><button id="target">Add</button></div>'])
+@allure.title('Verify that an element not accepting pointer input is not clickable')
+def test_not_clickable(fake_driver, html):
+    fake_driver.load_html(html)
+    page = BasePage(fake_driver)
+
+    with pytest.raises(TimeoutException):
+        page.wait_for_element_to_be_clickable((By.ID, 'target'), 0.2)
+
+
+@allure.title('Verify that an in-page click and type without text only clicks')
+def test_click_and_type_without_text(fake_driver):
+    fake_driver.load_html('<input id="target" type="checkbox">')
+    page = BasePage(fake_driver)
+
+    page.click_and_type((By.ID, 'target'), in_page=True)
+
+    assert_that(fake_driver.find_element(By.ID, 'target').is_selected(), equal_to(True),
+                'Verify the checkbox is clicked')
+    node = fake_driver.command_executor.document.find(By.ID, 'target')[0]
+    assert_that(node.get('value'), equal_to(None), 'Verify no value is typed')
+
+
+@allure.title('Verify that a page object sharing the driver does not lower the script timeout')
+def test_shared_script_timeout(fake_driver):
+    DomWait(fake_driver).ensure_script_timeout(30)
+    DomWait(fake_driver).ensure_script_timeout(1)
+
+    assert_that(fake_driver.command_executor.timeouts['script'], equal_to(35000), 'Verify the longest timeout is kept')
+
+
+@allure.title('Verify that polling reads issued together overlap')
+def test_gathered_polling_reads_overlap(fake_driver):
+    fake_driver.load_html('<p id="shown">Shown</p>')
+    page = BasePage(fake_driver)
+    page.dom_wait.engine = 'poll'
+
+    start = time.time()
+    results = page.gather(lambda: page.is_element_exist((By.ID, 'first'), 1),
+                          lambda: page.is_element_exist((By.ID, 'second'), 1))
+
+    assert_that(results, equal_to([False, False]), 'Verify both reads timed out')
+    assert_that(time.time() - start, less_than(1.8), 'Verify the reads waited at the same time')
+
+
+@allure.title('Verify that a value wait follows an element replaced by a re-render')
+def test_value_wait_after_rerender(fake_driver):
+    fake_driver.load_html('<form id="form"><input id="target" value="Gotland"></form>')
+    page = BasePage(fake_driver)
+    element = fake_driver.find_element(By.ID, 'target')
+    document = fake_driver.command_executor.document
+    document.remove(document.find(By.ID, 'target')[0])
+    document.append_html(document.find(By.ID, 'form')[0], '<input id="target" value="">')
+
+    assert_that(page.wait_for_value_of_element(element, '', 1, (By.ID, 'target')), equal_to(True),
+                'Verify the value is read from the new element')
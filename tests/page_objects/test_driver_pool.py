@@ -0,0 +1,20 @@
+import allure
+import pytest
+from hamcrest import assert_that, equal_to
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.driver.driver_pool import DriverPool
+
+pytestmark = [pytest.mark.page_objects, allure.parent_suite('Page Object Suite'), allure.suite('UnitLists'),
+              allure.sub_suite('Driver Pool')]
+
+
+@allure.title('Verify that a reset clears the app origin when the test ended on another origin')
+def test_reset_clears_app_origin(fake_driver):
+    fake_driver.load_html('<p>Consent</p>', 'https://consent.example/')
+    pool = DriverPool(lambda *capabilities: fake_driver)
+    pool.reset(fake_driver)
+
+    assert_that(fake_driver.command_executor.history[-2:], equal_to(['https://consent.example/', EnvConf.BASE_URL]),
+                'Verify the app origin is loaded to clear it')
+    assert_that(fake_driver.current_url, equal_to(DriverPool.BLANK_PAGE), 'Verify the reset ends on a blank page')
@@ -0,0 +1,79 @@
+import allure
+import pytest
+from hamcrest import assert_that, equal_to
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.page_objects.home_page import HomePage
+
+pytestmark = [pytest.mark.page_objects, allure.parent_suite('Page Object Suite'), allure.suite('UnitLists'),
+              allure.sub_suite('Home Page')]
+
+
+@allure.title('Verify that the default list and its unit count are parsed')
+def test_default_list_parsed(fake_driver):
+    fake_driver.get(EnvConf.BASE_URL)
+    home_page = HomePage(fake_driver).accept_cookie_warning()
+
+    assert_that(home_page.get_created_list_names(), equal_to(['Min lista']), 'Verify created list names')
+    assert_that(len(home_page.get_created_lists()), equal_to(1), 'Verify number of created lists')
+    assert_that(home_page.get_number_of_unit(), equal_to(1), 'Verify number of unit parsed from the count text')
+    assert_that(len(home_page.get_list_unit_entries()), equal_to(1), 'Verify number of unit entries')
+
+
+@allure.title('Verify that unit entry texts are read in one batch')
+def test_unit_entry_texts(fake_driver):
+    fake_driver.get(EnvConf.BASE_URL)
+    home_page = HomePage(fake_driver)
+
+    assert_that(home_page.get_text_of_elements(HomePage.UNIT_ENTRY), equal_to(['Stockholm']),
+                'Verify unit entry texts')
+
+
+@allure.title('Verify that independent reads issued together return in order')
+def test_gather_reads(fake_driver):
+    fake_driver.get(EnvConf.BASE_URL)
+    home_page = HomePage(fake_driver)
+
+    list_names, number_of_unit, unit_entries = home_page.gather(
+        home_page.get_created_list_names, home_page.get_number_of_unit, home_page.get_list_unit_entries)
+
+    assert_that(list_names, equal_to(['Min lista']), 'Verify created list names')
+    assert_that(number_of_unit, equal_to(1), 'Verify number of unit')
+    assert_that(len(unit_entries), equal_to(1), 'Verify number of unit entries')
+
+
+@allure.title('Verify that the streamed unit entry total matches the unit count')
+def test_streamed_unit_count(fake_driver):
+    fake_driver.get(EnvConf.BASE_URL)
+    home_page = HomePage(fake_driver)
+
+    assert_that(list(home_page.iter_list_unit_entries()), equal_to([['Stockholm']]), 'Verify streamed entries')
+    assert_that(home_page.count_list_unit_entries(), equal_to(home_page.get_number_of_unit()),
+                'Verify streamed total against the unit count')
+
+
+@allure.title('Verify that a large list is streamed in fixed-size chunks, every entry once')
+def test_streamed_chunks(fake_driver):
+    names = ['Enhet {}'.format(index) for index in list(range(25)) + [3, 7]] + ['', '']
+    entries = ''.join('<li class="unitlistsstyles__UnitEntry-sc-1a2s3d">{}</li>'.format(name) for name in names)
+    fake_driver.load_html('<ul>{}</ul>'.format(entries))
+    home_page = HomePage(fake_driver)
+
+    chunks = list(home_page.iter_list_unit_entries(chunk_size=10))
+
+    assert_that([len(chunk) for chunk in chunks], equal_to([10, 10, 9]), 'Verify chunk sizes')
+    assert_that(sum(chunks, []), equal_to(names), 'Verify repeated and empty names are streamed once each, in order')
+
+
+@allure.title('Verify that a cached element lookup costs one script call')
+def test_cached_lookup_round_trips(fake_driver):
+    fake_driver.get(EnvConf.BASE_URL)
+    home_page = HomePage(fake_driver)
+    calls = []
+    execute = fake_driver.execute
+    fake_driver.execute = lambda command, params=None: calls.append(command) or execute(command, params)
+
+    first = home_page.find_cached_element(HomePage.UNIT_ENTRY)
+    assert_that(len(calls), equal_to(1), 'Verify a miss resolves the element in the lookup call')
+    assert_that(home_page.find_cached_element(HomePage.UNIT_ENTRY), equal_to(first), 'Verify the cached element')
+    assert_that(len(calls), equal_to(2), 'Verify a hit costs one call')
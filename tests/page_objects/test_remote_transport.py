@@ -0,0 +1,59 @@
+import allure
+import pytest
+from hamcrest import assert_that, equal_to, greater_than, has_item
+from selenium import webdriver
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.driver.remote_transport import RemoteTransport
+from common.ui.page_objects.home_page import HomePage
+
+pytestmark = [pytest.mark.page_objects, allure.parent_suite('Page Object Suite'), allure.suite('UnitLists'),
+              allure.sub_suite('Remote Transport')]
+
+
+def read_home_page(driver):
+    driver.get(EnvConf.BASE_URL)
+    home_page = HomePage(driver).accept_cookie_warning()
+    return home_page.get_created_list_names(), home_page.get_number_of_unit()
+
+
+@allure.title('Verify that pooled remote commands share one connection')
+def test_pooled_commands(stand_in_grid):
+    transport = RemoteTransport(compress=True)
+    driver = webdriver.Remote(transport.command_executor(stand_in_grid.url), desired_capabilities={})
+    try:
+        assert_that(read_home_page(driver), equal_to((['Min lista'], 1)), 'Verify the page is parsed remotely')
+    finally:
+        driver.quit()
+
+    assert_that(stand_in_grid.connections, equal_to(1), 'Verify every command reused the connection')
+    assert_that(transport.latency.connections, equal_to(1), 'Verify the transport counted the connection')
+    assert_that(list(transport.latency.commands), has_item(Command.GET), 'Verify command latencies are recorded')
+    assert_that(stand_in_grid.compressed_responses, greater_than(0), 'Verify responses are compressed')
+
+
+@allure.title('Verify that a second driver reuses the connections of the first')
+def test_pool_shared_between_drivers(stand_in_grid):
+    transport = RemoteTransport()
+    for _ in range(2):
+        driver = webdriver.Remote(transport.command_executor(stand_in_grid.url), desired_capabilities={})
+        read_home_page(driver)
+        driver.quit()
+
+    assert_that(stand_in_grid.connections, equal_to(1), 'Verify the new session reused the connection')
+
+
+@allure.title('Verify that unpooled remote commands connect per command')
+def test_unpooled_commands(stand_in_grid):
+    # The socket default timeout of unpooled connections is not accepted by urllib3 2
+    RemoteConnection.set_timeout(EnvConf.REMOTE_CONNECT_TIMEOUT_SECONDS)
+    try:
+        driver = webdriver.Remote(stand_in_grid.url, desired_capabilities={})
+        read_home_page(driver)
+        driver.quit()
+    finally:
+        RemoteConnection.reset_timeout()
+
+    assert_that(stand_in_grid.connections, greater_than(1), 'Verify commands opened their own connections')
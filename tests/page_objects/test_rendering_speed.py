@@ -0,0 +1,58 @@
+import allure
+import pytest
+from hamcrest import assert_that, contains_string, equal_to
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.page_objects.rendering_speed import RenderingSpeed
+
+pytestmark = [pytest.mark.page_objects, allure.parent_suite('Page Object Suite'), allure.suite('UnitLists'),
+              allure.sub_suite('Rendering Speed')]
+
+
+class CdpDriver:
+    """
+    Records the DevTools commands a Chromium driver would receive
+    """
+
+    def __init__(self):
+        self.cdp_commands = []
+        self.scripts = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp_commands.append((cmd, params))
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+
+
+@allure.title('Verify that Chrome registers the rendering speed mode once for every new document')
+def test_install_on_new_documents():
+    driver = CdpDriver()
+
+    first = RenderingSpeed(driver, enabled=True, fast_timers=True).install()
+    second = RenderingSpeed(driver, enabled=True, fast_timers=True).install()
+
+    assert_that(first and second, equal_to(True), 'Verify the mode covers new documents')
+    assert_that(len(driver.cdp_commands), equal_to(1), 'Verify it is registered once per driver')
+    assert_that(driver.cdp_commands[0][1]['source'], contains_string('"fastTimers": true'),
+                'Verify the options are part of the registered script')
+
+
+@allure.title('Verify that drivers without a new document hook get the mode per document')
+def test_apply_per_document(fake_driver):
+    fake_driver.get(EnvConf.BASE_URL)
+    rendering_speed = RenderingSpeed(fake_driver, enabled=True)
+
+    assert_that(rendering_speed.install(), equal_to(False), 'Verify the mode must be applied per document')
+    rendering_speed.apply()
+
+
+@allure.title('Verify that nothing is sent while the mode is off')
+def test_disabled():
+    driver = CdpDriver()
+    rendering_speed = RenderingSpeed(driver, enabled=False)
+
+    rendering_speed.install()
+    rendering_speed.apply()
+
+    assert_that((driver.cdp_commands, driver.scripts), equal_to(([], [])), 'Verify no command is sent')
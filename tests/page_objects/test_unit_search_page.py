@@ -0,0 +1,72 @@
+import allure
+import pytest
+from hamcrest import assert_that, equal_to
+
+from common.ui.page_objects.unit_search_page import UnitSearchPage
+
+pytestmark = [pytest.mark.page_objects, allure.parent_suite('Page Object Suite'), allure.suite('UnitLists'),
+              allure.sub_suite('Unit Search Page')]
+
+
+@allure.title('Verify that added units are parsed without their position')
+def test_added_search_lists_parsed(fake_driver, unit_search_url):
+    fake_driver.get(unit_search_url)
+    unit_search_page = UnitSearchPage(fake_driver)
+
+    assert_that(unit_search_page.get_added_search_lists(), equal_to(['Stockholm', 'Västra Götaland']),
+                'Verify added units')
+
+
+@allure.title('Verify that selecting a unit ticks its checkbox')
+def test_select_search_unit(fake_driver, unit_search_url):
+    fake_driver.get(unit_search_url)
+    unit_search_page = UnitSearchPage(fake_driver)
+    checkbox_selector = UnitSearchPage.UNIT_SELECT_CHECKBOX
+    gotland_checkbox = (checkbox_selector[0], checkbox_selector[1].format(unit_name='Gotland'))
+
+    unit_search_page.select_search_unit('Gotland')
+
+    assert_that(unit_search_page.is_element_selected(gotland_checkbox), equal_to(True), 'Verify unit is selected')
+
+
+@allure.title('Verify that search text is typed and cleared')
+def test_enter_and_clear_unit_search(fake_driver, unit_search_url):
+    fake_driver.get(unit_search_url)
+    unit_search_page = UnitSearchPage(fake_driver)
+
+    unit_search_page.enter_unit_search('land')
+    typed_text = unit_search_page.get_attribute_of_element(UnitSearchPage.UNIT_SEARCH_INPUT, 'value')
+    unit_search_page.clear_unit_search_text()
+    cleared_text = unit_search_page.get_attribute_of_element(UnitSearchPage.UNIT_SEARCH_INPUT, 'value')
+
+    assert_that(typed_text, equal_to('Gotland'), 'Verify search text is appended')
+    assert_that(cleared_text, equal_to(''), 'Verify search text is cleared')
+
+
+@allure.title('Verify that units sharing a name prefix are searched together')
+def test_group_by_search_prefix():
+    groups = UnitSearchPage.group_by_search_prefix(
+        ['Gotland', 'Stockholm', 'Göteborg', 'Gotlands kommun', 'Solna', 'Sollentuna'], prefix_length=3)
+
+    assert_that(groups, equal_to([('Gotland', ['Gotland', 'Gotlands kommun']), ('Göteborg', ['Göteborg']),
+                                  ('Sol', ['Sollentuna', 'Solna']), ('Stockholm', ['Stockholm'])]),
+                'Verify search texts and their units')
+
+
+@allure.title('Verify that batch selection ticks every unit once and reports the units not added')
+def test_select_search_units(fake_driver, unit_search_url):
+    fake_driver.get(unit_search_url)
+    unit_search_page = UnitSearchPage(fake_driver)
+    checkbox_selector = UnitSearchPage.UNIT_SELECT_CHECKBOX
+
+    missing = unit_search_page.select_search_units(['Gotland', 'Västra Götaland', 'Stockholm', 'Uppsala'])
+
+    assert_that(unit_search_page.is_element_selected(
+        (checkbox_selector[0], checkbox_selector[1].format(unit_name='Gotland'))), equal_to(True),
+        'Verify unit is selected')
+    assert_that(unit_search_page.is_element_selected(
+        (checkbox_selector[0], checkbox_selector[1].format(unit_name='Västra Götaland'))), equal_to(True),
+        'Verify already selected unit is kept')
+    assert_that(unit_search_page.get_added_search_lists(), equal_to(['Stockholm', 'Västra Götaland', 'Gotland']),
+                'Verify the ticked unit is added')
+    assert_that(missing, equal_to(['Uppsala']), 'Verify only the unit not in the search results is reported')
@@ -0,0 +1,120 @@
+import io
+
+import allure
+import pytest
+from hamcrest import assert_that, equal_to, greater_than, none, not_none
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.page_objects.home_page import HomePage
+
+numpy = pytest.importorskip('numpy')
+Image = pytest.importorskip('PIL.Image')
+
+pytestmark = [pytest.mark.page_objects, allure.parent_suite('Page Object Suite'), allure.suite('UnitLists'),
+              allure.sub_suite('Visual Compare')]
+
+
+def to_png(pixels):
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def create_comparer(tmp_path, update_baselines):
+    from common.ui.driver.visual_compare import VisualComparer
+    return VisualComparer(str(tmp_path / 'baselines'), str(tmp_path / 'diffs'), tile_size=32, pixel_tolerance=16,
+                          max_diff_ratio=0.001, update_baselines=update_baselines)
+
+
+@pytest.fixture
+def comparer(tmp_path):
+    return create_comparer(tmp_path, update_baselines=False)
+
+
+@pytest.fixture
+def recorder(tmp_path):
+    return create_comparer(tmp_path, update_baselines=True)
+
+
+@pytest.fixture
+def screenshot():
+    pixels = numpy.zeros((200, 300, 3), dtype=numpy.uint8)
+    pixels[:, :, 0] = numpy.arange(300) % 256
+    pixels[:, :, 1] = (numpy.arange(200) % 256)[:, None]
+    return pixels
+
+
+@allure.title('Verify that a missing baseline is reported and not recorded')
+def test_missing_baseline(comparer, screenshot):
+    first = comparer.compare('page', to_png(screenshot))
+    second = comparer.compare('page', to_png(screenshot))
+
+    assert_that(first.matched, equal_to(False), 'Verify the check does not pass without a baseline')
+    assert_that(first.missing_baseline, equal_to(True), 'Verify the baseline is reported missing')
+    assert_that(second.missing_baseline, equal_to(True), 'Verify the baseline was not recorded')
+
+
+@allure.title('Verify that a recorded baseline matches an identical screenshot')
+def test_baseline_recorded_and_matched(comparer, recorder, screenshot):
+    first = recorder.compare('page', to_png(screenshot))
+    second = comparer.compare('page', to_png(screenshot))
+
+    assert_that(first.new_baseline, equal_to(True), 'Verify the baseline is recorded')
+    assert_that(second.matched, equal_to(True), 'Verify the identical screenshot matches')
+    assert_that(second.changed_tiles, equal_to(0), 'Verify no tile is diffed')
+    assert_that(second.diff_path, none(), 'Verify no diff image is written')
+
+
+@allure.title('Verify that a changed region fails the check and only its tiles differ')
+def test_changed_region_mismatch(comparer, recorder, screenshot):
+    recorder.compare('page', to_png(screenshot))
+    screenshot[10:40, 10:40] = 255
+
+    result = comparer.compare('page', to_png(screenshot))
+
+    assert_that(result.matched, equal_to(False), 'Verify the changed screenshot does not match')
+    assert_that(result.changed_tiles, equal_to(4), 'Verify only the tiles under the change differ')
+    assert_that(result.diff_pixels, greater_than(0), 'Verify differing pixels are counted')
+    assert_that(result.diff_path, not_none(), 'Verify the diff image is written')
+
+
+@allure.title('Verify that differences within the pixel tolerance match')
+def test_small_differences_tolerated(comparer, recorder, screenshot):
+    recorder.compare('page', to_png(screenshot))
+    screenshot[:, :, 2] += 8
+
+    result = comparer.compare('page', to_png(screenshot))
+
+    assert_that(result.matched, equal_to(True), 'Verify anti-aliasing noise matches')
+    assert_that(result.diff_pixels, equal_to(0), 'Verify no pixel counts as different')
+
+
+@allure.title('Verify that changes inside an ignored area match')
+def test_ignored_area(comparer, recorder, screenshot):
+    recorder.compare('page', to_png(screenshot), [[100, 50, 60, 60]])
+    screenshot[60:100, 110:150] = 255
+
+    result = comparer.compare('page', to_png(screenshot), [[100, 50, 60, 60]])
+
+    assert_that(result.matched, equal_to(True), 'Verify the masked change is ignored')
+
+
+@allure.title('Verify that a screenshot of another size does not match')
+def test_size_mismatch(comparer, recorder, screenshot):
+    recorder.compare('page', to_png(screenshot))
+
+    result = comparer.compare('page', to_png(screenshot[:100]))
+
+    assert_that(result.matched, equal_to(False), 'Verify the smaller screenshot does not match')
+    assert_that(result.diff_path, not_none(), 'Verify the diff image is written')
+
+
+@allure.title('Verify that a driver screenshot is checked with its ignore locators')
+def test_check_driver_screenshot(fake_driver, comparer, recorder):
+    fake_driver.get(EnvConf.BASE_URL)
+
+    first = recorder.check(fake_driver, 'home_page', ignore=[HomePage.UNIT_ENTRY])
+    second = comparer.check(fake_driver, 'home_page', ignore=[HomePage.UNIT_ENTRY])
+
+    assert_that(first.new_baseline, equal_to(True), 'Verify the baseline is recorded')
+    assert_that(second.matched, equal_to(True), 'Verify the same screenshot matches')
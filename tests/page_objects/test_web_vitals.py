@@ -0,0 +1,65 @@
+import allure
+import pytest
+from hamcrest import assert_that, contains_string, equal_to, has_length
+
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.driver.web_vitals import WebVitals, WebVitalsStore
+
+pytestmark = [pytest.mark.page_objects, allure.parent_suite('Page Object Suite'), allure.suite('UnitLists'),
+              allure.sub_suite('Web Vitals')]
+
+
+@pytest.fixture
+def budgets_path(tmp_path):
+    path = tmp_path / 'budgets.json'
+    path.write_text('{"*": {"lcp_ms": 4000}, "/": {"lcp_ms": 2500}}')
+    return str(path)
+
+
+@pytest.fixture
+def web_vitals(tmp_path, budgets_path):
+    vitals = WebVitals(WebVitalsStore(str(tmp_path / 'vitals.sqlite')), budgets_path, regression_threshold=0.5,
+                       history_size=10, min_history=3)
+    yield vitals
+    vitals.store.close()
+
+
+@allure.title('Verify that the page a driver leaves is collected once and stored')
+def test_collect_on_navigation(fake_driver, unit_search_url, web_vitals):
+    fake_driver.get(EnvConf.BASE_URL)
+    web_vitals.attach(fake_driver, 'test_collect', 'Chrome-LINUX-Ubuntu')
+
+    fake_driver.get(unit_search_url)
+    web_vitals.release(fake_driver)
+    fake_driver.get(EnvConf.BASE_URL)
+
+    samples = web_vitals.pop_samples('test_collect')
+    assert_that([sample['page'] for sample in samples], equal_to(['/', '/unit-search']), 'Verify collected pages')
+    assert_that(web_vitals.store.history('/', 'Chrome-LINUX-Ubuntu', 'load_ms', 'other run', 10), equal_to([0.0]),
+                'Verify metrics are stored')
+
+
+@allure.title('Verify that a page over its budget is reported')
+def test_budget_exceeded(web_vitals):
+    web_vitals.record('test_budget', 'Chrome', EnvConf.BASE_URL, {'lcp_ms': 3000.0})
+    web_vitals.record('test_budget', 'Chrome', EnvConf.BASE_URL + '/unit-search', {'lcp_ms': 3000.0})
+
+    violations = web_vitals.check('test_budget')
+
+    assert_that(violations, has_length(1), 'Verify only the start page is over budget')
+    assert_that(violations[0], contains_string('/ lcp_ms: 3000.0 over the budget of 2500'), 'Verify the message')
+    assert_that(web_vitals.check('test_budget', {'lcp_ms': 5000}), equal_to([]), 'Verify marker limits apply')
+
+
+@allure.title('Verify that a budgeted metric regressed from earlier runs is reported')
+def test_budget_regression(web_vitals):
+    for value in (1000.0, 1100.0, 900.0):
+        web_vitals.store.add('earlier run', {'recorded_at': value, 'test': 'test_regression', 'capability': 'Chrome',
+                                             'page': '/', 'url': EnvConf.BASE_URL, 'metrics': {'lcp_ms': value}})
+    web_vitals.record('test_regression', 'Chrome', EnvConf.BASE_URL, {'lcp_ms': 2000.0})
+
+    regressions = web_vitals.regressions('test_regression')
+
+    assert_that(web_vitals.check('test_regression'), equal_to([]), 'Verify the regression is not a budget violation')
+    assert_that(regressions, has_length(1), 'Verify the regression is reported')
+    assert_that(regressions[0], contains_string('regressed more than 50% from the median 1000.0'), 'Verify message')
@@ -34,3 +34,5 @@ def test_existing_list_added_default(web_driver, designed_caps):
     assert_that(len(actual_created_lists), equal_to(1), 'Verify number of created lists by default')
     assert_that(actual_number_of_unit, equal_to(1), 'Verify number of unit count by default')
     assert_that(len(list_unit_entries), equal_to(1), 'Verify number of unit entry by default')
+    assert_that(home_page.count_list_unit_entries(), equal_to(actual_number_of_unit),
+                'Verify unit count against the streamed unit entries')
@@ -0,0 +1,27 @@
+import allure
+import pytest
+
+from common.ui.config.desired_caps import CHROME_LINUX
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.page_objects.home_page import HomePage
+
+pytestmark = [pytest.mark.performance_budget, allure.parent_suite('UI Suite'), allure.suite('UnitLists'),
+              allure.sub_suite('Performance Budget')]
+
+
+@pytest.mark.parametrize('designed_caps', [
+    pytest.param(CHROME_LINUX, marks=pytest.mark.desktop),
+])
+@allure.title('Verify that the home page is within its performance budget')
+def test_home_page_budget(web_driver, performance_budget, designed_caps):
+    # ARRANGE
+    is_mobile_view = designed_caps['isMobile']
+    driver = web_driver(is_mobile_view, designed_caps['platformName'], designed_caps['browserName'],
+                        designed_caps['deviceName'])
+
+    # ACT #
+    driver.get(EnvConf.BASE_URL)
+    HomePage(driver).accept_cookie_warning()
+
+    # ASSERT #
+    performance_budget(driver)
@@ -3,7 +3,7 @@ import pytest
 from hamcrest import assert_that, equal_to
 
 from common.ui.config.desired_caps import CHROME_ANDROID_GALAXY_S9, CHROME_LINUX
-from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.driver.duration_scheduler import capability_id
 from common.ui.page_objects.home_page import HomePage
 from common.ui.page_objects.unit_search_page import UnitSearchPage
 
@@ -18,7 +18,7 @@ pytestmark = [pytest.mark.full_regression, pytest.mark.frontend_regression,
 ])
 @pytest.mark.parametrize('unit_name', ['Gotland'])
 @allure.title('Verify that search units')
-def test_search_unit(web_driver, designed_caps, unit_name):
+def test_search_unit(web_driver, app_state, designed_caps, unit_name):
     # ARRANGE
     # Get driver
     is_mobile_view = designed_caps['isMobile']
@@ -26,18 +26,14 @@ def test_search_unit(web_driver, designed_caps, unit_name):
                         designed_caps['deviceName'])
     # Create a new nz photographer
 
+    # Start at the default list, opened through the UI only when there is no snapshot of it yet
+    default_list_url = app_state(driver, 'default_list_opened-' + capability_id(designed_caps),
+                                 lambda browser: HomePage(browser).open_accepting_cookies().open_default_list())
+
     # ACT #
-    driver.get(EnvConf.BASE_URL)
-    home_page = HomePage(driver)
+    driver.get(default_list_url)
     unit_search_page = UnitSearchPage(driver)
 
-    home_page.accept_cookie_warning()
-
-    # click default created list
-    default_lists = home_page.get_created_lists()
-    default_list_name = default_lists[0].text
-    home_page.click_list(default_list_name)
-
     unit_search_page.enter_unit_search(unit_name)\
         .select_search_unit(unit_name)\
         .clear_unit_search_text()
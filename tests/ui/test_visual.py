@@ -0,0 +1,61 @@
+import allure
+import pytest
+from hamcrest import assert_that, equal_to
+
+from common.ui.config.desired_caps import CHROME_ANDROID_GALAXY_S9, CHROME_LINUX
+from common.ui.config.env_conf import EnvironmentConfig as EnvConf
+from common.ui.driver.duration_scheduler import capability_id
+from common.ui.page_objects.home_page import HomePage
+from common.ui.page_objects.unit_search_page import UnitSearchPage
+
+pytestmark = [pytest.mark.full_regression, pytest.mark.frontend_regression, pytest.mark.visual,
+              allure.parent_suite('UI Suite'), allure.suite('UnitLists'), allure.sub_suite('Visual')]
+
+
+@pytest.mark.parametrize('designed_caps', [
+    pytest.param(CHROME_LINUX, marks=pytest.mark.desktop),
+    pytest.param(CHROME_ANDROID_GALAXY_S9, marks=pytest.mark.mobile)
+])
+@allure.title('Verify that the home page looks like its baseline')
+def test_home_page_visual(web_driver, app_state, visual_check, designed_caps):
+    # ARRANGE
+    is_mobile_view = designed_caps['isMobile']
+    driver = web_driver(is_mobile_view, designed_caps['platformName'], designed_caps['browserName'],
+                        designed_caps['deviceName'])
+
+    app_state(driver, 'cookies_accepted-' + capability_id(designed_caps),
+              lambda browser: HomePage(browser).open_accepting_cookies())
+
+    # ACT #
+    driver.get(EnvConf.BASE_URL)
+    HomePage(driver).wait_for_page_ready()
+    result = visual_check(driver, 'home_page-' + capability_id(designed_caps))
+
+    # ASSERT #
+    assert_that(result.matched, equal_to(True), result.describe())
+
+
+@pytest.mark.parametrize('designed_caps', [
+    pytest.param(CHROME_LINUX, marks=pytest.mark.desktop),
+    pytest.param(CHROME_ANDROID_GALAXY_S9, marks=pytest.mark.mobile)
+])
+@allure.title('Verify that the unit search page looks like its baseline')
+def test_unit_search_page_visual(web_driver, app_state, visual_check, designed_caps):
+    # ARRANGE
+    is_mobile_view = designed_caps['isMobile']
+    driver = web_driver(is_mobile_view, designed_caps['platformName'], designed_caps['browserName'],
+                        designed_caps['deviceName'])
+
+    default_list_url = app_state(driver, 'default_list_opened-' + capability_id(designed_caps),
+                                 lambda browser: HomePage(browser).open_accepting_cookies().open_default_list())
+
+    # ACT #
+    driver.get(default_list_url)
+    unit_search_page = UnitSearchPage(driver)
+    unit_search_page.wait_for_page_ready()
+    # The added units depend on what earlier tests left in the list
+    result = visual_check(driver, 'unit_search_page-' + capability_id(designed_caps),
+                          ignore=[UnitSearchPage.ADDED_SEARCH_LIST_ITEMS])
+
+    # ASSERT #
+    assert_that(result.matched, equal_to(True), result.describe())